@@ -0,0 +1,72 @@
+"""Benchmarks for RoomSync.
+
+Run them from the Django project directory, e.g.::
+
+    python -m benchmarks.bench_booking_queries
+
+Each benchmark works on a throwaway test database and throwaway file
+caches, never on the development or production data.
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import django
+
+_original_db_name = None
+_cache_override = None
+_cache_dir = None
+
+
+def setup():
+    """Configure Django and switch the default connection to a fresh test database"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'room_booking_system.settings')
+    django.setup()
+
+    global _original_db_name, _cache_override, _cache_dir
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import override_settings, setup_test_environment
+    setup_test_environment()  # in-memory email backend, among others
+    # Same backends, but file caches (the sessions cache) move to a
+    # temporary directory, so clearing them logs nobody out
+    _cache_dir = tempfile.mkdtemp(prefix='roomsync-bench-')
+    _cache_override = override_settings(CACHES={
+        alias: {**config, 'LOCATION': os.path.join(_cache_dir, alias)}
+        if config['BACKEND'].endswith('FileBasedCache') else config
+        for alias, config in settings.CACHES.items()
+    })
+    _cache_override.enable()
+    _original_db_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+
+def teardown():
+    from django.db import connection
+    from django.test.utils import teardown_test_environment
+    connection.creation.destroy_test_db(_original_db_name, verbosity=0)
+    _cache_override.disable()
+    shutil.rmtree(_cache_dir, ignore_errors=True)
+    teardown_test_environment()
+
+
+def timed(func, repeat):
+    """Run func() `repeat` times and return per-call latencies in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {
+        'mean_ms': round(sum(samples) / len(samples), 3),
+        'p50_ms': round(pick(0.50), 3),
+        'p95_ms': round(pick(0.95), 3),
+        'p99_ms': round(pick(0.99), 3),
+    }
@@ -0,0 +1,67 @@
+"""Auth-check throughput: database sessions vs the cached session path.
+
+    python -m benchmarks.bench_auth_check --requests 2000
+
+Logs one user in and calls ``GET /api/auth/check/`` through the test
+client in three configurations:
+
+* ``db``: database sessions and a users_user query on every request
+  (the behaviour before the session cache);
+* ``cached_db``: cached sessions and the cached request user;
+* ``cached_db_lite``: the same with ``?lite=1``.
+
+Reports requests per second, queries per request and latency for each.
+Every configuration gets a fresh client, since the middleware is loaded
+per handler.
+"""
+import argparse
+import json
+
+from benchmarks import setup, summarize, teardown, timed
+
+CONFIGURATIONS = [
+    ('db', {'SESSION_ENGINE': 'django.contrib.sessions.backends.db', 'AUTH_USER_CACHE_SECONDS': 0}, ''),
+    ('cached_db', {'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db'}, ''),
+    ('cached_db_lite', {'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db'}, '?lite=1'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from django.conf import settings
+        from django.core.cache import caches
+        from django.db import connection
+        from django.test import Client, override_settings
+        from room_booking_system.middleware import query_stats
+        from users.models import User
+
+        user = User.objects.create_user('bench-auth', 'bench-auth@example.com', 'pw', role='faculty')
+        results = {'vendor': connection.vendor, 'requests': args.requests}
+        for name, overrides, query in CONFIGURATIONS:
+            with override_settings(**overrides):
+                caches[settings.SESSION_CACHE_ALIAS].clear()
+                client = Client()
+                client.force_login(user)
+                path = f'/api/auth/check/{query}'
+                assert client.get(path).json()['authenticated']  # warm up
+
+                with query_stats() as stats:
+                    samples = timed(lambda: client.get(path), args.requests)
+                results[name] = {
+                    'per_second': round(len(samples) / (sum(samples) / 1000), 1),
+                    'queries_per_request': round(stats.count / args.requests, 2),
+                    **summarize(samples),
+                }
+        results['speedup'] = round(results['cached_db']['per_second'] / results['db']['per_second'], 2)
+        print(json.dumps(results, indent=2))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Throughput of concurrent booking creation through bookings.services.
+
+    python -m benchmarks.bench_booking_create --threads 8 --per-thread 200
+
+Every thread books hourly slots across a handful of rooms, so threads
+contend for the same room/day locks. Prints created/rejected counts,
+bookings per second, and the number of double bookings found (always 0).
+"""
+import argparse
+import json
+import random
+import threading
+import time as clock
+from datetime import date, time
+
+from benchmarks import setup, teardown
+
+ROOMS = 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--per-thread', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from django.core.exceptions import ValidationError
+        from django.db import connection
+        from bookings.models import Booking
+        from bookings.services import create_booking
+        from rooms.models import Block, Room
+        from users.models import User
+
+        block = Block.objects.create(name='Bench')
+        rooms = [
+            Room.objects.create(block=block, room_number=f'B-{n:03d}', room_type='Classroom', capacity=40)
+            for n in range(ROOMS)
+        ]
+        users = [
+            User.objects.create(username=f'bench{n}', email=f'bench{n}@example.com', role='faculty')
+            for n in range(args.threads)
+        ]
+
+        created, rejected = [], []
+        barrier = threading.Barrier(args.threads + 1)
+
+        def worker(user, seed):
+            rng = random.Random(seed)
+            barrier.wait()
+            for _ in range(args.per_thread):
+                hour = rng.randrange(8, 18)
+                day = date(2030, 1, rng.randrange(1, 29))
+                try:
+                    create_booking(user, rng.choice(rooms), day, time(hour), time(hour + 1))
+                    created.append(1)
+                except ValidationError:
+                    rejected.append(1)
+            connection.close()
+
+        threads = [threading.Thread(target=worker, args=(user, n)) for n, user in enumerate(users)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = clock.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = clock.perf_counter() - started
+
+        double_bookings = 0
+        for room in rooms:
+            seen = set()
+            for day, start in Booking.objects.filter(room=room, status='approved').values_list('date', 'start_time'):
+                if (day, start) in seen:
+                    double_bookings += 1
+                seen.add((day, start))
+
+        attempts = args.threads * args.per_thread
+        print(json.dumps({
+            'vendor': connection.vendor,
+            'threads': args.threads,
+            'attempts': attempts,
+            'created': len(created),
+            'rejected': len(rejected),
+            'seconds': round(elapsed, 3),
+            'attempts_per_second': round(attempts / elapsed, 1),
+            'double_bookings': double_bookings,
+        }))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Latency of the booking conflict check and list queries at growing table sizes.
+
+    python -m benchmarks.bench_booking_queries --sizes 10000 100000 1000000
+    python -m benchmarks.bench_booking_queries --without-indexes
+
+Prints one JSON object per table size.
+"""
+import argparse
+import json
+import random
+from datetime import date, time, timedelta
+
+from benchmarks import setup, summarize, teardown, timed
+
+ROOMS = 500
+SLOTS_PER_DAY = 6
+BATCH_SIZE = 10000
+
+
+def seed(target, rooms, user, start_day):
+    """Grow the bookings table to `target` rows with non-overlapping hourly slots"""
+    from bookings.models import Booking
+
+    existing = Booking.objects.count()
+    rng = random.Random(existing)
+    batch = []
+    for n in range(existing, target):
+        day, rest = divmod(n, len(rooms) * SLOTS_PER_DAY)
+        room_index, slot = divmod(rest, SLOTS_PER_DAY)
+        status = rng.choices(['approved', 'pending', 'cancelled'], weights=[85, 10, 5])[0]
+        batch.append(Booking(
+            room=rooms[room_index],
+            user=user,
+            date=start_day + timedelta(days=day),
+            start_time=time(9 + slot),
+            end_time=time(10 + slot),
+            status=status,
+        ))
+        if len(batch) >= BATCH_SIZE:
+            Booking.objects.bulk_create(batch)
+            batch = []
+    Booking.objects.bulk_create(batch)
+
+
+def drop_indexes():
+    from django.db import connection
+    from bookings.models import Booking
+
+    with connection.schema_editor() as editor:
+        for index in Booking._meta.indexes:
+            if index.name != 'booking_updated_at_idx':
+                editor.remove_index(Booking, index)
+
+
+def measure(rooms, start_day, days, repeat):
+    from bookings.models import Booking
+
+    rng = random.Random(0)
+
+    def conflict_check():
+        slot = rng.randrange(SLOTS_PER_DAY)
+        Booking.objects.filter(
+            room=rng.choice(rooms),
+            date=start_day + timedelta(days=rng.randrange(days)),
+            start_time__lt=time(10 + slot, 30),
+            end_time__gt=time(9 + slot, 30),
+            status='approved',
+        ).exists()
+
+    def list_page():
+        first = start_day + timedelta(days=rng.randrange(days))
+        list(
+            Booking.objects.filter(date__gte=first, date__lte=first + timedelta(days=120))
+            .select_related('room__block', 'user', 'approved_by')
+            .order_by('date', 'start_time', 'id')[:100]
+        )
+
+    def list_by_created():
+        list(Booking.objects.select_related('room', 'user', 'approved_by').order_by('-created_at')[:100])
+
+    return {
+        'conflict_check': summarize(timed(conflict_check, repeat)),
+        'list_page': summarize(timed(list_page, repeat)),
+        'list_by_created_at': summarize(timed(list_by_created, repeat)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**4, 10**5, 10**6])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--without-indexes', action='store_true', help='drop the booking query indexes first')
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from rooms.models import Block, Room
+        from users.models import User
+
+        if args.without_indexes:
+            drop_indexes()
+
+        block = Block.objects.create(name='Bench')
+        Room.objects.bulk_create([
+            Room(block=block, room_number=f'B-{n:04d}', room_type='Classroom', capacity=40)
+            for n in range(ROOMS)
+        ])
+        rooms = list(Room.objects.all())
+        user = User.objects.create_user(username='bench', email='bench@example.com', password='bench', role='admin')
+        start_day = date(2020, 1, 1)
+
+        for size in sorted(args.sizes):
+            seed(size, rooms, user, start_day)
+            days = max(1, size // (ROOMS * SLOTS_PER_DAY))
+            result = {'bookings': size, 'indexes': not args.without_indexes}
+            result.update(measure(rooms, start_day, days, args.repeat))
+            print(json.dumps(result))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
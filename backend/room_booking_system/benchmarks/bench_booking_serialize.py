@@ -0,0 +1,73 @@
+"""Rows per second of BookingSerializer vs the values() fast path.
+
+    python -m benchmarks.bench_booking_serialize --rows 2000
+
+Both paths fetch the same rows (all fields, with room/user/approver
+joins) and render them to JSON bytes; the outputs are checked to be
+identical before timing.
+"""
+import argparse
+import json
+import random
+from datetime import date, time, timedelta
+
+from benchmarks import setup, summarize, teardown, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from django.db import connection
+        from rest_framework.renderers import JSONRenderer
+        from bookings.fastpath import booking_columns, booking_rows
+        from bookings.models import Booking
+        from bookings.serializers import BookingSerializer
+        from rooms.models import Block, Room
+        from users.models import User
+
+        block = Block.objects.create(name='Bench')
+        rooms = [
+            Room.objects.create(block=block, room_number=f'B-{n:03d}', room_type='Classroom',
+                                capacity=40, features=['Projector', 'Whiteboard'], equipment=['PC'])
+            for n in range(80)
+        ]
+        users = [
+            User.objects.create(username=f'bench{n}', email=f'bench{n}@example.com', role='faculty',
+                                first_name='Bench', last_name=str(n))
+            for n in range(50)
+        ]
+        rng = random.Random(0)
+        Booking.objects.bulk_create([
+            Booking(room=rng.choice(rooms), user=rng.choice(users), date=date(2030, 1, 1) + timedelta(days=n % 30),
+                    start_time=time(8 + n % 10), end_time=time(9 + n % 10), purpose='Lecture',
+                    approved_by=users[0] if n % 2 else None)
+            for n in range(args.rows)
+        ])
+        queryset = Booking.objects.order_by('date', 'start_time', 'id')
+        renderer = JSONRenderer()
+
+        def serializer_path():
+            return renderer.render(BookingSerializer(BookingSerializer.optimize_queryset(queryset), many=True).data)
+
+        def fast_path():
+            return renderer.render(booking_rows(queryset.values(*booking_columns())))
+
+        assert serializer_path() == fast_path()
+
+        result = {'vendor': connection.vendor, 'rows': args.rows}
+        for name, func in [('serializer', serializer_path), ('fast_path', fast_path)]:
+            stats = summarize(timed(func, args.repeat))
+            stats['rows_per_second'] = round(args.rows / (stats['p50_ms'] / 1000))
+            result[name] = stats
+        print(json.dumps(result))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
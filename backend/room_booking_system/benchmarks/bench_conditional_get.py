@@ -0,0 +1,78 @@
+"""Steady-state polling cost with and without conditional GET.
+
+    python -m benchmarks.bench_conditional_get --rooms 500 --bookings 20000
+
+Times repeated polls of the room list and the booking list the way the
+dashboard polls them: once unconditionally (full body every time), and
+once replaying the ETag in If-None-Match (304 while nothing changes).
+Prints latency and bytes transferred per poll.
+"""
+import argparse
+import json
+import random
+from datetime import time, timedelta
+
+from benchmarks import setup, summarize, teardown, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rooms', type=int, default=500)
+    parser.add_argument('--bookings', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from django.db import connection
+        from django.test import Client
+        from django.utils import timezone
+        from bookings.models import Booking
+        from rooms.models import Block, Room
+        from users.models import User
+
+        block = Block.objects.create(name='Bench')
+        Room.objects.bulk_create([
+            Room(block=block, room_number=f'B-{n:04d}', room_type='Classroom', capacity=40, features=['Projector'])
+            for n in range(args.rooms)
+        ])
+        rooms = list(Room.objects.all())
+        user = User.objects.create(username='bench', email='bench@example.com', role='faculty')
+
+        rng = random.Random(0)
+        today = timezone.now().date()
+        Booking.objects.bulk_create([
+            Booking(room=rng.choice(rooms), user=user, date=today + timedelta(days=rng.randrange(-30, 90)),
+                    start_time=time(hour), end_time=time(hour + 1), status='approved')
+            for hour in (rng.randrange(8, 18) for _ in range(args.bookings))
+        ], batch_size=10000)
+
+        client = Client()
+        results = {'vendor': connection.vendor, 'rooms': args.rooms, 'bookings': args.bookings}
+        for name, url in [('room_list', '/api/rooms/'), ('booking_list', '/api/bookings/')]:
+            first = client.get(url)
+            etag = first['ETag']
+            sizes = {}
+
+            def full():
+                sizes['full'] = len(client.get(url).content)
+
+            def conditional():
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                assert response.status_code == 304
+                sizes['conditional'] = len(response.content)
+
+            full_ms = summarize(timed(full, args.repeat))
+            conditional_ms = summarize(timed(conditional, args.repeat))
+            results[name] = {
+                'full': {**full_ms, 'bytes': sizes['full']},
+                'conditional': {**conditional_ms, 'bytes': sizes['conditional']},
+            }
+
+        print(json.dumps(results))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
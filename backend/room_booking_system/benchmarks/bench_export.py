@@ -0,0 +1,66 @@
+"""Throughput and peak memory of the streaming booking export.
+
+    python -m benchmarks.bench_export --bookings 50000
+
+Seeds `bookings` approved bookings, then streams /api/bookings/export/
+as CSV and XLSX through the Django test client, discarding each chunk.
+Peak Python memory (tracemalloc) is reported per format and should stay
+flat as --bookings grows.
+"""
+import argparse
+import json
+import time as clock
+import tracemalloc
+from datetime import date, time, timedelta
+
+from benchmarks import setup, teardown
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bookings', type=int, default=50000)
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from django.db import connection
+        from django.test import Client
+        from bookings.models import Booking
+        from rooms.models import Block, Room
+        from users.models import User
+
+        block = Block.objects.create(name='Bench')
+        rooms = Room.objects.bulk_create([
+            Room(block=block, room_number=f'B-{n:03d}', room_type='Classroom', capacity=40) for n in range(100)
+        ])
+        admin = User.objects.create(username='bench', email='bench@example.com', role='admin')
+        Booking.objects.bulk_create([
+            Booking(room=rooms[n % 100], user=admin, date=date(2030, 1, 1) + timedelta(days=n // 800),
+                    start_time=time(8 + n % 8), end_time=time(9 + n % 8), purpose=f'Lecture {n}')
+            for n in range(args.bookings)
+        ], batch_size=10000)
+
+        client = Client()
+        client.force_login(admin)
+        results = {'vendor': connection.vendor, 'bookings': args.bookings}
+        for fmt in ('csv', 'xlsx'):
+            tracemalloc.start()
+            started = clock.perf_counter()
+            response = client.get('/api/bookings/export/', {'format': fmt})
+            size = sum(len(chunk) for chunk in response.streaming_content)
+            elapsed = clock.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[fmt] = {
+                'seconds': round(elapsed, 3),
+                'rows_per_second': round(args.bookings / elapsed),
+                'bytes': size,
+                'peak_mib': round(peak / 2 ** 20, 2),
+            }
+        print(json.dumps(results))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Latency of /api/rooms/free-slots/ on a campus-sized catalog.
+
+    python -m benchmarks.bench_free_slots --rooms 500 --days 14
+
+Seeds `rooms` rooms with hourly approved bookings (about 70% of the
+09:00-17:00 window taken) over the horizon, then times two requests
+through the Django test client: a typical search that fills its limit
+on the first day, and one whose duration fits nowhere, so every room
+and day of the horizon is scanned.
+"""
+import argparse
+import json
+import random
+from datetime import date, time, timedelta
+
+from benchmarks import setup, summarize, teardown, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rooms', type=int, default=500)
+    parser.add_argument('--days', type=int, default=14)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from django.db import connection
+        from django.test import Client
+        from bookings.models import Booking
+        from rooms.models import Block, Room
+        from users.models import User
+
+        block = Block.objects.create(name='Bench')
+        Room.objects.bulk_create([
+            Room(block=block, room_number=f'B-{n:04d}', room_type='Classroom',
+                 capacity=20 + n % 100, features=['Projector', 'AC'] if n % 2 else ['AC'])
+            for n in range(args.rooms)
+        ])
+        rooms = list(Room.objects.all())
+        user = User.objects.create(username='bench', email='bench@example.com', role='faculty')
+
+        rng = random.Random(0)
+        first_day = date(2030, 1, 7)
+        Booking.objects.bulk_create([
+            Booking(room=room, user=user, date=first_day + timedelta(days=d),
+                    start_time=time(hour), end_time=time(hour + 1), status='approved')
+            for room in rooms
+            for d in range(args.days)
+            for hour in range(9, 17)
+            if rng.random() < 0.7
+        ], batch_size=10000)
+
+        client = Client()
+        base = {
+            'from': first_day.isoformat(),
+            'to': (first_day + timedelta(days=args.days - 1)).isoformat(),
+            'window': '09:00-17:00',
+            'min_capacity': 40,
+            'features': 'Projector',
+        }
+
+        def typical():
+            assert client.get('/api/rooms/free-slots/', {**base, 'duration': 60}).status_code == 200
+
+        def exhaustive():
+            assert client.get('/api/rooms/free-slots/', {**base, 'duration': 8 * 60}).status_code == 200
+
+        typical(), exhaustive()  # warm up
+        print(json.dumps({
+            'vendor': connection.vendor,
+            'rooms': args.rooms,
+            'days': args.days,
+            'bookings': Booking.objects.count(),
+            'typical': summarize(timed(typical, args.repeat)),
+            'exhaustive': summarize(timed(exhaustive, args.repeat)),
+        }))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Room catalog import: batched upserts vs one update_or_create per room.
+
+    python -m benchmarks.bench_import_rooms --rooms 50000
+
+Writes a CSV of `rooms` rooms over 20 blocks and imports it three times
+through rooms.catalog: into an empty catalog, unchanged, and with every
+tenth room changed. Reports time and queries per run, then repeats
+the initial import under tracemalloc for its peak Python memory, which
+should stay flat as --rooms grows. The old
+import_rooms.py approach (update_or_create per row) is timed on the
+first `--baseline` rows for comparison.
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time as clock
+import tracemalloc
+
+from benchmarks import setup, teardown
+
+
+def write_csv(path, rooms, bump=None):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['room_number', 'block', 'room_type', 'capacity', 'features', 'is_active'])
+        for n in range(rooms):
+            capacity = 30 + n % 50 + (5 if bump and n % bump == 0 else 0)
+            writer.writerow([f'C-{n:06d}', f'Block {n % 20}', ('Classroom', 'Lab')[n % 2], capacity,
+                             'Projector;AC' if n % 3 else 'Whiteboard', 'true'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rooms', type=int, default=50000)
+    parser.add_argument('--baseline', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from django.db import connection
+        from room_booking_system.middleware import query_stats
+        from rooms.catalog import CatalogImport, read_rows
+        from rooms.models import Block, Room
+
+        results = {'vendor': connection.vendor, 'rooms': args.rooms}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'rooms.csv')
+            for name, bump in [('initial', None), ('unchanged', None), ('tenth_changed', 10)]:
+                write_csv(path, args.rooms, bump)
+                started = clock.perf_counter()
+                with query_stats() as stats:
+                    report = CatalogImport().run(read_rows(path))
+                elapsed = clock.perf_counter() - started
+                results[name] = {
+                    'seconds': round(elapsed, 3),
+                    'queries': stats.count,
+                    **{key: value for key, value in report.items() if value},
+                }
+
+            Room.objects.all().delete()
+            tracemalloc.start()
+            CatalogImport().run(read_rows(path))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results['initial']['peak_mib'] = round(peak / 2 ** 20, 2)
+
+        Room.objects.all().delete()
+        rows = list(range(args.baseline))
+        started = clock.perf_counter()
+        with query_stats() as stats:
+            for n in rows:
+                block, _ = Block.objects.get_or_create(name=f'Block {n % 20}')
+                Room.objects.update_or_create(room_number=f'C-{n:06d}', block=block, defaults={
+                    'room_type': ('Classroom', 'Lab')[n % 2], 'capacity': 30 + n % 50,
+                    'features': ['Projector', 'AC'] if n % 3 else ['Whiteboard'], 'is_active': True,
+                })
+        elapsed = clock.perf_counter() - started
+        results['update_or_create'] = {
+            'rows': args.baseline,
+            'seconds': round(elapsed, 3),
+            'queries': stats.count,
+            'rows_per_second': round(args.baseline / elapsed),
+        }
+        results['initial']['rows_per_second'] = round(args.rooms / results['initial']['seconds'])
+        print(json.dumps(results))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
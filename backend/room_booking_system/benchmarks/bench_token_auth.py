@@ -0,0 +1,67 @@
+"""Kiosk reads: session cookie vs signed access token.
+
+    python -m benchmarks.bench_token_auth --requests 1000
+
+Seeds a campus with ``benchmarks.datagen`` and requests
+``GET /api/bookings/by_date/`` as one faculty user, first with a
+database-backed session (the only option before signed tokens), then
+with a cached_db session, then with ``Authorization: Bearer``. Reports
+requests per second, queries per request and latency for each.
+"""
+import argparse
+import json
+
+from benchmarks import setup, summarize, teardown, timed
+from benchmarks.datagen import PASSWORD, generate, usernames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--bookings', type=int, default=5000)
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from django.conf import settings
+        from django.core.cache import caches
+        from django.db import connection
+        from django.test import Client, override_settings
+        from room_booking_system.middleware import query_stats
+
+        dataset = generate(rooms=100, users=50, bookings=args.bookings)
+        username = usernames(50)[1][0]
+        path = '/api/bookings/by_date/'
+        results = {'vendor': connection.vendor, 'dataset': dataset, 'requests': args.requests}
+
+        def run(name, client, **headers):
+            assert client.get(path, **headers).status_code == 200  # warm up
+            with query_stats() as stats:
+                samples = timed(lambda: client.get(path, **headers), args.requests)
+            results[name] = {
+                'per_second': round(len(samples) / (sum(samples) / 1000), 1),
+                'queries_per_request': round(stats.count / args.requests, 2),
+                **summarize(samples),
+            }
+
+        for name, engine, user_cache_seconds in [
+            ('db_session', 'django.contrib.sessions.backends.db', 0),
+            ('cached_db_session', 'django.contrib.sessions.backends.cached_db', settings.AUTH_USER_CACHE_SECONDS),
+        ]:
+            with override_settings(SESSION_ENGINE=engine, AUTH_USER_CACHE_SECONDS=user_cache_seconds):
+                caches[settings.SESSION_CACHE_ALIAS].clear()
+                client = Client()
+                assert client.login(username=username, password=PASSWORD)
+                run(name, client)
+
+        client = Client()
+        response = client.post('/api/auth/login/', {'username': username, 'password': PASSWORD, 'tokens': True})
+        run('access_token', client, HTTP_AUTHORIZATION=f"Bearer {response.json()['access_token']}")
+
+        print(json.dumps(results, indent=2))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
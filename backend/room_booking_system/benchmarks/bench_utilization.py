@@ -0,0 +1,84 @@
+"""Year-long utilization report: rollup table vs scanning bookings.
+
+    python -m benchmarks.bench_utilization --rooms 100 --days 365
+
+Seeds `rooms` rooms with hourly approved bookings over `days` days,
+fills the rollups with rebuild(), then times /api/reports/utilization/
+for the whole range against the old approach of reading every booking
+of the range and summing minutes per room in Python.
+"""
+import argparse
+import json
+import random
+from datetime import date, time, timedelta
+
+from benchmarks import setup, summarize, teardown, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rooms', type=int, default=100)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from django.db import connection
+        from django.test import Client
+        from bookings.models import Booking
+        from reports.models import BookingDailyRollup, minutes_between
+        from rooms.models import Block, Room
+        from users.models import User
+
+        blocks = [Block.objects.create(name=f'Bench {n}') for n in range(4)]
+        Room.objects.bulk_create([
+            Room(block=blocks[n % 4], room_number=f'B-{n:04d}', room_type=('Classroom', 'Lab')[n % 2], capacity=40)
+            for n in range(args.rooms)
+        ])
+        rooms = list(Room.objects.all())
+        admin = User.objects.create(username='bench', email='bench@example.com', role='admin')
+
+        rng = random.Random(0)
+        first_day = date(2030, 1, 1)
+        last_day = first_day + timedelta(days=args.days - 1)
+        Booking.objects.bulk_create([
+            Booking(room=room, user=admin, date=first_day + timedelta(days=d),
+                    start_time=time(hour), end_time=time(hour + 1), status='approved')
+            for room in rooms
+            for d in range(args.days)
+            for hour in range(9, 17)
+            if rng.random() < 0.4
+        ], batch_size=10000)
+        BookingDailyRollup.rebuild()
+
+        client = Client()
+        client.force_login(admin)
+        params = {'from': first_day.isoformat(), 'to': last_day.isoformat()}
+
+        def rollup():
+            assert client.get('/api/reports/utilization/', params).status_code == 200
+
+        def scan():
+            minutes = {}
+            bookings = Booking.objects.filter(date__gte=first_day, date__lte=last_day, status='approved')
+            for room_id, start, end in bookings.values_list('room_id', 'start_time', 'end_time').iterator():
+                minutes[room_id] = minutes.get(room_id, 0) + minutes_between(start, end)
+            return minutes
+
+        rollup(), scan()  # warm up
+        print(json.dumps({
+            'vendor': connection.vendor,
+            'rooms': args.rooms,
+            'days': args.days,
+            'bookings': Booking.objects.count(),
+            'rollup_rows': BookingDailyRollup.objects.count(),
+            'rollup_report': summarize(timed(rollup, args.repeat)),
+            'booking_scan': summarize(timed(scan, max(1, args.repeat // 4))),
+        }))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""Synthetic campus data for benchmarks and load tests.
+
+    python -m benchmarks.datagen --blocks 8 --rooms 400 --users 1000 --bookings 100000
+
+Everything is written with bulk_create in batches, so seeding 100k
+bookings takes seconds. The distributions follow what a real campus
+looks like: rooms spread unevenly over blocks and types, a few popular
+rooms taking most bookings, weekday office hours with morning and early
+afternoon peaks, mostly one-hour slots, and statuses that depend on
+whether the day is past (approved, rejected, cancelled) or upcoming
+(approved, pending). Approved and pending bookings never overlap.
+
+Run as a script it seeds a throwaway test database and prints the
+counts and timings as JSON; other benchmarks import ``generate``.
+"""
+import argparse
+import json
+import random
+import time as clock
+from datetime import time, timedelta
+
+from benchmarks import setup, teardown
+
+PASSWORD = 'bench-password'
+
+# (room type, share of rooms, capacity range)
+ROOM_TYPES = [
+    ('Classroom', 45, (30, 80)),
+    ('Lab', 15, (20, 40)),
+    ('Computer Lab', 10, (30, 60)),
+    ('Seminar Hall', 10, (60, 150)),
+    ('Staff Room', 8, (8, 20)),
+    ('Reading Room', 5, (20, 60)),
+    ('Office', 5, (2, 10)),
+    ('Auditorium', 2, (200, 600)),
+]
+FEATURES = ['Projector', 'AC', 'Whiteboard', 'Smart Board', 'Sound System', 'Wi-Fi']
+
+# Start hours weighted for a morning peak and a smaller early-afternoon one
+START_HOURS = [8, 9, 10, 11, 12, 13, 14, 15, 16, 17]
+START_WEIGHTS = [4, 10, 12, 9, 3, 5, 8, 6, 3, 1]
+DURATIONS = [1, 2, 3]
+DURATION_WEIGHTS = [60, 30, 10]
+PAST_STATUSES = (['approved', 'rejected', 'cancelled'], [75, 10, 15])
+UPCOMING_STATUSES = (['approved', 'pending', 'rejected', 'cancelled'], [60, 30, 5, 5])
+
+BATCH_SIZE = 5000
+
+
+def usernames(users):
+    """(admin usernames, faculty usernames) of a campus generated with ``users`` users"""
+    admins = max(1, users // 20)
+    return (
+        [f'bench-admin-{n}' for n in range(admins)],
+        [f'bench-faculty-{n}' for n in range(users - admins)],
+    )
+
+
+def generate(blocks=4, rooms=100, users=200, bookings=20000, past_days=60, future_days=60, seed=0):
+    """Seed the current database and return the created row counts.
+
+    Every user's password is PASSWORD. Bulk writes skip the model
+    signals, so room tags, the catalog version and the daily rollups are
+    brought up to date explicitly afterwards.
+    """
+    from django.contrib.auth.hashers import make_password
+    from django.utils import timezone
+    from bookings.models import Booking
+    from reports.models import BookingDailyRollup
+    from rooms.models import Block, CatalogVersion, Room, RoomTag
+    from users.models import User
+
+    rng = random.Random(seed)
+
+    block_rows = Block.objects.bulk_create([Block(name=f'Bench Block {n}') for n in range(blocks)])
+    block_weights = [rng.uniform(0.5, 1.5) for _ in block_rows]
+    types, type_weights, capacities = zip(*ROOM_TYPES)
+    room_rows = []
+    for n in range(rooms):
+        room_type = rng.choices(types, type_weights)[0]
+        low, high = capacities[types.index(room_type)]
+        room_rows.append(Room(
+            block=rng.choices(block_rows, block_weights)[0],
+            room_number=f'BR-{n:05d}',
+            room_type=room_type,
+            capacity=rng.randint(low, high),
+            features=rng.sample(FEATURES, rng.randint(0, 3)),
+            is_active=rng.random() > 0.03,
+        ))
+    Room.objects.bulk_create(room_rows, batch_size=BATCH_SIZE)
+    room_rows = list(Room.objects.filter(room_number__startswith='BR-').order_by('id'))
+    RoomTag.sync(room_rows)
+    CatalogVersion.bump()
+
+    # Hashing once keeps seeding fast; every account gets the same password
+    password = make_password(PASSWORD)
+    admin_names, faculty_names = usernames(users)
+    User.objects.bulk_create([
+        User(username=name, email=f'{name}@example.com', password=password, role=role, first_name=name)
+        for names, role in ((admin_names, 'admin'), (faculty_names, 'faculty'))
+        for name in names
+    ], batch_size=BATCH_SIZE)
+    admins = list(User.objects.filter(username__in=admin_names).order_by('id'))
+    faculty = list(User.objects.filter(username__in=faculty_names).order_by('id'))
+
+    # Zipf-like popularity: a few rooms take most of the bookings
+    bookable = [room for room in room_rows if room.is_active]
+    rng.shuffle(bookable)
+    popularity = [1 / (rank + 1) ** 0.8 for rank in range(len(bookable))]
+    days = [
+        day for day in (timezone.localdate() + timedelta(days=offset) for offset in range(-past_days, future_days + 1))
+        if day.weekday() < 5 or rng.random() < 0.1
+    ]
+    today = timezone.localdate()
+    now = timezone.now()
+
+    taken = set()  # (room_id, date, hour) held by approved or pending bookings
+    created = 0
+    batch = []
+    attempts = 0
+    while created + len(batch) < bookings and attempts < bookings * 5:
+        attempts += 1
+        room = rng.choices(bookable, popularity)[0]
+        day = rng.choice(days)
+        start = rng.choices(START_HOURS, START_WEIGHTS)[0]
+        hours = min(rng.choices(DURATIONS, DURATION_WEIGHTS)[0], 19 - start)
+        choices, weights = PAST_STATUSES if day < today else UPCOMING_STATUSES
+        status = rng.choices(choices, weights)[0]
+
+        slots = {(room.id, day, hour) for hour in range(start, start + hours)}
+        if status in ('approved', 'pending'):
+            if slots & taken:
+                continue
+            taken |= slots
+        reviewed = status in ('approved', 'rejected')
+        batch.append(Booking(
+            room=room,
+            user=rng.choice(faculty),
+            date=day,
+            start_time=time(start),
+            end_time=time(start + hours),
+            purpose=rng.choice(['Lecture', 'Lab session', 'Exam', 'Meeting', 'Workshop', 'Seminar']),
+            status=status,
+            approved_by=rng.choice(admins) if reviewed else None,
+            approved_at=now if reviewed else None,
+        ))
+        if len(batch) == BATCH_SIZE:
+            Booking.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    Booking.objects.bulk_create(batch)
+    created += len(batch)
+    BookingDailyRollup.rebuild()
+
+    return {
+        'blocks': len(block_rows),
+        'rooms': len(room_rows),
+        'admins': len(admins),
+        'faculty': len(faculty),
+        'bookings': created,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--blocks', type=int, default=4)
+    parser.add_argument('--rooms', type=int, default=100)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--bookings', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from django.db import connection
+
+        start = clock.perf_counter()
+        counts = generate(args.blocks, args.rooms, args.users, args.bookings, seed=args.seed)
+        print(json.dumps({
+            'vendor': connection.vendor,
+            **counts,
+            'seconds': round(clock.perf_counter() - start, 2),
+        }))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+"""Multi-threaded HTTP load test of the REST API.
+
+    python -m benchmarks.loadtest --users 200 --threads 16 --duration 120
+
+Seeds a throwaway database with ``benchmarks.datagen``, starts a
+threaded WSGI server on a free local port, logs every virtual user in
+and then replays the traffic mix of the dashboard for ``--duration``
+seconds:
+
+* every user polls ``/api/bookings/`` each ``--poll-seconds`` (30 by
+  default, revalidating with If-None-Match like a browser would);
+* every user calls ``check_auth`` on each page load (``--page-seconds``);
+* faculty create a one-hour booking every ``--create-seconds``;
+* admins fetch the pending list and approve one of its first ten
+  bookings every ``--approve-seconds``.
+
+First actions are spread randomly over one interval so users do not
+fire in lockstep. Prints p50/p95/p99 latency and throughput per route
+as JSON, together with the commit and dataset size, so runs on
+different commits can be compared directly.
+"""
+import argparse
+import heapq
+import http.client
+import json
+import random
+import subprocess
+import threading
+import time as clock
+from collections import Counter, defaultdict
+from datetime import timedelta
+from http.cookies import SimpleCookie
+
+from benchmarks import setup, summarize, teardown
+from benchmarks.datagen import PASSWORD, generate, usernames
+
+
+class Recorder:
+    """Latencies and status codes per route, shared by all client threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def add(self, route, status, elapsed_ms):
+        with self.lock:
+            self.samples[route].append(elapsed_ms)
+            self.statuses[route][status] += 1
+
+    def report(self, seconds):
+        routes = {}
+        for route in sorted(self.samples):
+            statuses = self.statuses[route]
+            routes[route] = {
+                'requests': len(self.samples[route]),
+                'per_second': round(len(self.samples[route]) / seconds, 2),
+                'errors': sum(count for status, count in statuses.items() if status == 'error' or status >= 500),
+                'statuses': {str(status): count for status, count in sorted(statuses.items(), key=str)},
+                **summarize(self.samples[route]),
+            }
+        return routes
+
+
+class VirtualUser:
+    """One logged-in browser: its own connection, cookies and cached ETag"""
+
+    def __init__(self, host, port, username, role, recorder):
+        self.connection = http.client.HTTPConnection(host, port, timeout=60)
+        self.username = username
+        self.role = role
+        self.recorder = recorder
+        self.cookies = {}
+        self.etag = None
+
+    def request(self, route, method, path, data=None, headers=None):
+        """Send one request and record it under ``route``; returns (status, headers, body)"""
+        headers = dict(headers or {})
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        if method != 'GET' and 'csrftoken' in self.cookies:
+            headers['X-CSRFToken'] = self.cookies['csrftoken']
+        body = None
+        if data is not None:
+            body = json.dumps(data)
+            headers['Content-Type'] = 'application/json'
+
+        start = clock.perf_counter()
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            content = response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.recorder.add(route, 'error', (clock.perf_counter() - start) * 1000)
+            return None, {}, b''
+        self.recorder.add(route, response.status, (clock.perf_counter() - start) * 1000)
+
+        for header in response.msg.get_all('Set-Cookie') or []:
+            for name, morsel in SimpleCookie(header).items():
+                self.cookies[name] = morsel.value
+        return response.status, response.msg, content
+
+    def login(self):
+        status, _, _ = self.request(
+            'POST /api/auth/login/', 'POST', '/api/auth/login/',
+            {'username': self.username, 'password': PASSWORD},
+        )
+        return status == 200
+
+    def poll(self, rng, context):
+        headers = {'If-None-Match': self.etag} if self.etag else {}
+        status, response_headers, _ = self.request('GET /api/bookings/', 'GET', '/api/bookings/', headers=headers)
+        if status == 200:
+            self.etag = response_headers.get('ETag')
+
+    def check_auth(self, rng, context):
+        self.request('GET /api/auth/check/', 'GET', '/api/auth/check/')
+
+    def create(self, rng, context):
+        start = rng.randint(8, 17)
+        self.request('POST /api/bookings/', 'POST', '/api/bookings/', {
+            'room': rng.choice(context['rooms']),
+            'date': str(context['today'] + timedelta(days=rng.randint(1, 30))),
+            'start_time': f'{start:02d}:00',
+            'end_time': f'{start + 1:02d}:00',
+            'purpose': 'Load test',
+        })
+
+    def approve(self, rng, context):
+        status, _, body = self.request('GET /api/bookings/pending/', 'GET', '/api/bookings/pending/')
+        if status != 200:
+            return
+        pending = json.loads(body)['results']
+        if pending:
+            booking_id = rng.choice(pending[:10])['id']
+            self.request(
+                'POST /api/bookings/{id}/approve/', 'POST', f'/api/bookings/{booking_id}/approve/', {}
+            )
+
+
+def client_thread(users, intervals, context, deadline, seed):
+    """Run the scheduled actions of ``users`` until ``deadline``"""
+    rng = random.Random(seed)
+    queue = []
+    for n, user in enumerate(users):
+        for action, every in intervals[user.role].items():
+            heapq.heappush(queue, (clock.monotonic() + rng.uniform(0, every), n, action))
+
+    while queue:
+        due, n, action = heapq.heappop(queue)
+        if due >= deadline:
+            break
+        delay = due - clock.monotonic()
+        if delay > 0:
+            clock.sleep(delay)
+        getattr(users[n], action)(rng, context)
+        heapq.heappush(queue, (due + intervals[users[n].role][action], n, action))
+
+
+def start_server():
+    """A threaded WSGI server for the project on a free local port"""
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler, allow_reuse_address=False)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_threads(groups, target, *args):
+    threads = [threading.Thread(target=target, args=(group, *args, n)) for n, group in enumerate(groups)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200, help='Virtual users (one in 20 is an admin)')
+    parser.add_argument('--threads', type=int, default=16, help='Client threads the users are spread over')
+    parser.add_argument('--duration', type=float, default=120, help='Seconds of traffic after login')
+    parser.add_argument('--poll-seconds', type=float, default=30)
+    parser.add_argument('--page-seconds', type=float, default=120)
+    parser.add_argument('--create-seconds', type=float, default=300)
+    parser.add_argument('--approve-seconds', type=float, default=60)
+    parser.add_argument('--rooms', type=int, default=200)
+    parser.add_argument('--bookings', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    setup()
+    try:
+        from django.db import connection
+        from django.utils import timezone
+        from rooms.models import Room
+
+        dataset = generate(blocks=4, rooms=args.rooms, users=args.users, bookings=args.bookings, seed=args.seed)
+        context = {
+            'rooms': list(Room.objects.filter(is_active=True).values_list('id', flat=True)),
+            'today': timezone.localdate(),
+        }
+        # Server threads open their own connections to the test database
+        connection.close()
+        server = start_server()
+        host, port = server.server_address
+
+        logins = Recorder()
+        admin_names, faculty_names = usernames(args.users)
+        users = [
+            VirtualUser(host, port, name, role, logins)
+            for names, role in ((admin_names, 'admin'), (faculty_names, 'faculty'))
+            for name in names
+        ]
+        random.Random(args.seed).shuffle(users)
+        groups = [users[n::args.threads] for n in range(args.threads)]
+        run_threads(groups, lambda group, n: [user.login() for user in group])
+
+        intervals = {
+            'faculty': {'poll': args.poll_seconds, 'check_auth': args.page_seconds, 'create': args.create_seconds},
+            'admin': {'poll': args.poll_seconds, 'check_auth': args.page_seconds, 'approve': args.approve_seconds},
+        }
+        recorder = Recorder()
+        for user in users:
+            user.recorder = recorder
+        start = clock.perf_counter()
+        run_threads(groups, client_thread, intervals, context, clock.monotonic() + args.duration)
+        seconds = clock.perf_counter() - start
+        server.shutdown()
+        server.server_close()
+
+        routes = recorder.report(seconds)
+        all_samples = [sample for samples in recorder.samples.values() for sample in samples]
+        print(json.dumps({
+            'commit': current_commit(),
+            'vendor': connection.vendor,
+            'dataset': dataset,
+            'users': args.users,
+            'threads': args.threads,
+            'seconds': round(seconds, 1),
+            'login': logins.report(seconds)['POST /api/auth/login/'],
+            'routes': routes,
+            'total': {
+                'requests': len(all_samples),
+                'per_second': round(len(all_samples) / seconds, 2),
+                'errors': sum(route['errors'] for route in routes.values()),
+                **(summarize(all_samples) if all_samples else {}),
+            },
+        }, indent=2))
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 from django.contrib import admin
-from django.core.mail import send_mail
-from django.conf import settings
-from .models import Booking
+from django.db import transaction
+from notifications.outbox import enqueue_emails
+from .models import Booking, BookingSeries
 
 
 @admin.register(Booking)
@@ -13,9 +13,11 @@ class BookingAdmin(admin.ModelAdmin):
     list_editable = ('status',)
 
     def save_model(self, request, obj, form, change):
-        # If status is updated
-        if change and 'status' in form.changed_data:
-            if obj.status == 'approved':
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+
+            # If status is updated
+            if change and 'status' in form.changed_data and obj.status == 'approved':
                 subject = f"Booking Approved: Room {obj.room.room_number}"
                 message = (
                     f"Dear {obj.user.username},\n\n"
@@ -23,11 +25,17 @@ class BookingAdmin(admin.ModelAdmin):
                     f"on {obj.date} from {obj.start_time} to {obj.end_time} has been APPROVED.\n\n"
                     f"Regards,\nAdmin"
                 )
-                # Send email to the user
-                send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [obj.user.email])
-
                 # Optionally, notify all faculty/admins (if you have a group email list)
-                faculty_admin_emails = ["faculty1@example.com", "faculty2@example.com"]  
-                send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, faculty_admin_emails)
+                faculty_admin_emails = ["faculty1@example.com", "faculty2@example.com"]
+                enqueue_emails([
+                    (subject, message, [obj.user.email]),
+                    (subject, message, faculty_admin_emails),
+                ])
+
 
-        super().save_model(request, obj, form, change)
+@admin.register(BookingSeries)
+class BookingSeriesAdmin(admin.ModelAdmin):
+    list_display = ('room', 'user', 'frequency', 'start_date', 'until', 'start_time', 'end_time', 'status')
+    list_filter = ('status', 'frequency', 'room')
+    search_fields = ('room__room_number', 'user__username', 'purpose')
+    ordering = ('start_date', 'start_time')
@@ -0,0 +1,95 @@
+"""Archival of old bookings out of the live table.
+
+``archive_bookings`` moves bookings dated before the archive cutoff (the
+first day of the month BOOKING_ARCHIVE_AFTER_MONTHS months ago) into
+BookingArchive, a batch per transaction. The move is not a change to the
+bookings, so it records no events or tombstones and leaves the daily
+rollups as they are.
+
+Reads pick their table with ``booking_source``: a date range that starts
+on or after the cutoff can only contain live bookings and queries Booking
+as before, anything older queries the BookingHistory view over both.
+"""
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Booking, BookingArchive, BookingHistory
+
+COPY_FIELDS = [
+    'id', 'room_id', 'user_id', 'date', 'start_time', 'end_time', 'purpose', 'faculty_email', 'status',
+    'rejection_reason', 'approved_by_id', 'approved_at', 'series_id', 'created_at', 'updated_at',
+]
+
+
+def months_before(day, months):
+    """The first day of the month ``months`` months before ``day``'s"""
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    return date(year, month + 1, 1)
+
+
+def archive_cutoff(today=None):
+    """Bookings dated before this may be archived; later ones are always live"""
+    return months_before(today or timezone.localdate(), settings.BOOKING_ARCHIVE_AFTER_MONTHS)
+
+
+def booking_source(start_date):
+    """The model to read bookings dated from ``start_date`` (None: all dates) from"""
+    if start_date is None or start_date < archive_cutoff():
+        return BookingHistory
+    return Booking
+
+
+def ensure_partitions(days):
+    """Create the monthly archive partitions covering ``days`` (PostgreSQL only)"""
+    if connection.vendor != 'postgresql':
+        return
+    table = BookingArchive._meta.db_table
+    with connection.cursor() as cursor:
+        for first in sorted({day.replace(day=1) for day in days}):
+            following = months_before(first, -1)
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {table}_p{first:%Y%m} PARTITION OF {table} '
+                f"FOR VALUES FROM ('{first.isoformat()}') TO ('{following.isoformat()}')"
+            )
+
+
+def archive_batch(cutoff, batch_size):
+    """Move up to ``batch_size`` of the oldest bookings dated before ``cutoff``.
+
+    Returns how many were moved. The copy and the delete share one
+    transaction, so a booking is always in exactly one of the tables.
+    The delete is plain SQL: Booking's delete signals would record
+    tombstones and events and refresh rollups for every row.
+    """
+    with transaction.atomic():
+        rows = list(
+            Booking.objects.filter(date__lt=cutoff)
+            .order_by('date', 'id')
+            .select_for_update(skip_locked=True)
+            .values(*COPY_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        ensure_partitions(row['date'] for row in rows)
+        BookingArchive.objects.bulk_create([BookingArchive(**row) for row in rows])
+        ids = [row['id'] for row in rows]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {Booking._meta.db_table} WHERE id IN ({', '.join(['%s'] * len(ids))})",
+                ids,
+            )
+    return len(rows)
+
+
+def archive_bookings(cutoff, batch_size=500, progress=None):
+    """Move every booking dated before ``cutoff``, one transaction per batch"""
+    total = 0
+    while moved := archive_batch(cutoff, batch_size):
+        total += moved
+        if progress:
+            progress(total)
+    return total
@@ -0,0 +1,185 @@
+from datetime import datetime, time, timedelta
+from django.db.models import CharField
+from django.db.models.functions import Cast
+from rooms.models import Room
+from .models import Booking
+
+
+# A room counts as fully booked once this many approved minutes are taken
+FULLY_BOOKED_MINUTES = 5 * 60
+
+ALL_DAY = 'All Day'
+
+
+def parse_slot(slot):
+    """Parse a "HH:MM-HH:MM" slot into a (start, end) pair of times.
+
+    Returns None for "All Day" or an empty value.
+    """
+    if not slot or slot == ALL_DAY:
+        return None
+    try:
+        start, end = slot.split('-')
+        start = datetime.strptime(start.strip(), '%H:%M').time()
+        end = datetime.strptime(end.strip(), '%H:%M').time()
+    except ValueError:
+        raise ValueError('slot must look like HH:MM-HH:MM or "All Day"')
+    if start >= end:
+        raise ValueError('slot end must be after slot start')
+    return start, end
+
+
+def _minutes(start, end):
+    return (end.hour * 60 + end.minute) - (start.hour * 60 + start.minute)
+
+
+def room_status(bookings, slot=None):
+    """Status of one room given its (start_time, end_time, status) rows for a day.
+
+    Mirrors the rules the dashboard used to apply in the browser:
+    a specific slot is available/pending/booked, a whole day is
+    available/pending/partially_booked/fully_booked.
+    """
+    if slot is not None:
+        slot_start, slot_end = slot
+        overlapping = [
+            status for start, end, status in bookings
+            if start < slot_end and slot_start < end
+        ]
+        if not overlapping:
+            return 'available'
+        if 'pending' in overlapping:
+            return 'pending'
+        return 'booked'
+
+    if not bookings:
+        return 'available'
+    if any(status == 'pending' for _, _, status in bookings):
+        return 'pending'
+
+    total = sum(_minutes(start, end) for start, end, status in bookings if status == 'approved')
+    if total >= FULLY_BOOKED_MINUTES:
+        return 'fully_booked'
+    return 'partially_booked'
+
+
+def availability_matrix(date, block=None, slot=None):
+    """Return {room_id: status} for every active room on the given date.
+
+    Runs one query for the rooms and one for the day's active bookings,
+    then groups in Python instead of filtering per room.
+    """
+    rooms = Room.objects.filter(is_active=True)
+    bookings = Booking.objects.filter(date=date, status__in=['approved', 'pending'])
+    if block:
+        rooms = rooms.filter(block__name=block)
+        bookings = bookings.filter(room__block__name=block)
+
+    by_room = {}
+    for room_id, start, end, status in bookings.values_list('room_id', 'start_time', 'end_time', 'status'):
+        by_room.setdefault(room_id, []).append((start, end, status))
+
+    return {
+        room_id: room_status(by_room.get(room_id, []), slot)
+        for room_id in rooms.values_list('id', flat=True)
+    }
+
+
+def _to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def _iso_minutes(value):
+    # "HH:MM[:SS]" -> minutes since midnight
+    return int(value[:2]) * 60 + int(value[3:5])
+
+
+def _to_time(minutes):
+    return time(minutes // 60, minutes % 60)
+
+
+def free_gaps(busy, window_start, window_end):
+    """Yield (start, end) minute ranges inside the window not covered by ``busy``.
+
+    ``busy`` is a list of (start, end) minute pairs in any order; it is
+    sorted and scanned once.
+    """
+    cursor = window_start
+    for start, end in sorted(busy):
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start > cursor:
+            yield cursor, start
+        cursor = max(cursor, end)
+    if cursor < window_end:
+        yield cursor, window_end
+
+
+def free_slots(rooms, start_date, end_date, duration, window, limit=10, now=None):
+    """Earliest ``limit`` free slots of ``duration`` minutes across ``rooms``.
+
+    ``rooms`` is a list of dicts with id, room_number, capacity and
+    block__name; ``window`` is a (start, end) pair of times bounding each
+    day. Approved bookings of all rooms over the whole horizon come from
+    one query streamed in date order, so the scan can stop as soon as
+    ``limit`` slots are found. Each room/day is gap-scanned in memory and
+    the earliest gap of every room is offered, ordered by start time.
+    Slots on the day of ``now`` that have already started are skipped.
+    """
+    window_start, window_end = _to_minutes(window[0]), _to_minutes(window[1])
+    rooms = sorted(rooms, key=lambda room: room['room_number'])
+
+    # Ordered like booking_date_start_id_idx so rows stream without a sort.
+    # Dates and times are read as ISO text: skipping the per-value
+    # converters is most of the cost when the whole horizon is scanned
+    approved = Booking.objects.filter(
+        room_id__in=[room['id'] for room in rooms],
+        date__gte=start_date,
+        date__lte=end_date,
+        status='approved',
+        start_time__lt=window[1],
+        end_time__gt=window[0],
+    ).order_by('date', 'start_time', 'id').values_list(
+        Cast('date', CharField()), 'room_id', Cast('start_time', CharField()), Cast('end_time', CharField()),
+    ).iterator(chunk_size=2000)
+    pending_row = next(approved, None)
+
+    slots = []
+    day = start_date
+    while day <= end_date and len(slots) < limit:
+        busy = {}
+        iso_day = day.isoformat()
+        while pending_row is not None and pending_row[0] == iso_day:
+            _, room_id, start, end = pending_row
+            busy.setdefault(room_id, []).append((_iso_minutes(start), _iso_minutes(end)))
+            pending_row = next(approved, None)
+
+        earliest = window_start
+        if now is not None and day == now.date():
+            earliest = max(window_start, now.hour * 60 + now.minute + (1 if now.second or now.microsecond else 0))
+
+        found = []
+        for room in rooms:
+            for gap_start, gap_end in free_gaps(busy.get(room['id'], ()), earliest, window_end):
+                if gap_end - gap_start >= duration:
+                    found.append((gap_start, room, gap_end))
+                    break
+
+        # rooms are in room_number order and sort() is stable
+        found.sort(key=lambda item: item[0])
+        for gap_start, room, gap_end in found[:limit - len(slots)]:
+            slots.append({
+                'room': room['id'],
+                'room_number': room['room_number'],
+                'block': room['block__name'],
+                'capacity': room['capacity'],
+                'date': day,
+                'start_time': _to_time(gap_start),
+                'end_time': _to_time(gap_start + duration),
+                'free_until': _to_time(gap_end),
+            })
+        day += timedelta(days=1)
+
+    return slots
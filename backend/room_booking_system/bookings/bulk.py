@@ -0,0 +1,208 @@
+import csv
+import io
+import json
+from bisect import bisect_left
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from notifications.outbox import enqueue_emails
+from rooms.models import Room
+from .models import Booking, RoomDayLock
+from .signals import record_booking_events
+
+
+def read_rows(stream, filename=''):
+    """Read booking rows from a CSV or JSON file-like object"""
+    content = stream.read()
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    if filename.lower().endswith('.json') or content.lstrip().startswith(('[', '{')):
+        data = json.loads(content)
+        return data.get('bookings', []) if isinstance(data, dict) else data
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+def parse_time(value):
+    value = str(value).strip()
+    for fmt in ('%H:%M', '%H:%M:%S'):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            pass
+    raise ValueError(value)
+
+
+def parse_row(raw, rooms):
+    """Turn one raw row into booking field values, or raise ValidationError"""
+    errors = []
+
+    room_key = str(raw.get('room') or raw.get('room_number') or '').strip()
+    room = rooms.get(room_key)
+    if room is None:
+        errors.append(f"Unknown room '{room_key}'")
+
+    try:
+        day = date.fromisoformat(str(raw.get('date', '')).strip())
+    except ValueError:
+        errors.append('date must be in YYYY-MM-DD format')
+        day = None
+
+    try:
+        start = parse_time(raw.get('start_time', ''))
+        end = parse_time(raw.get('end_time', ''))
+        if start >= end:
+            errors.append('End time must be after start time.')
+    except ValueError:
+        errors.append('start_time and end_time must be in HH:MM format')
+        start = end = None
+
+    faculty_email = (raw.get('faculty_email') or '').strip() or None
+    if faculty_email:
+        try:
+            validate_email(faculty_email)
+        except ValidationError:
+            errors.append(f"Invalid faculty_email '{faculty_email}'")
+
+    if errors:
+        raise ValidationError(errors)
+
+    return {
+        'room': room,
+        'date': day,
+        'start_time': start,
+        'end_time': end,
+        'purpose': (raw.get('purpose') or '').strip() or None,
+        'faculty_email': faculty_email,
+    }
+
+
+def merge_intervals(intervals):
+    """Collapse (start, end) pairs into sorted, disjoint intervals"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start < merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def sweep_conflicts(candidates, existing):
+    """Find which candidates of one room/day can be booked.
+
+    ``candidates`` is a list of (start, end, row_index) and ``existing``
+    a list of (start, end) for bookings already in the database. Both are
+    swept in start order once: a candidate is rejected if it overlaps an
+    existing booking (found by bisecting the merged existing intervals)
+    or the previously accepted candidate. Returns {row_index: reason}.
+    """
+    busy = merge_intervals(existing)
+    busy_starts = [start for start, _ in busy]
+    conflicts = {}
+    last_accepted = None
+
+    for start, end, row in sorted(candidates):
+        i = bisect_left(busy_starts, end)
+        if i and busy[i - 1][1] > start:
+            conflicts[row] = 'Room already booked for that time.'
+        elif last_accepted is not None and last_accepted[1] > start:
+            conflicts[row] = f'Overlaps row {last_accepted[2] + 1} of this batch.'
+        else:
+            last_accepted = (start, end, row)
+    return conflicts
+
+
+def import_bookings(raw_rows, user, dry_run=False):
+    """Validate, conflict-check and insert a batch of approved bookings.
+
+    Existing approved bookings for every affected room/date are loaded in
+    one query and the batch is checked with an interval sweep per room/day.
+    Returns a per-row report; ``row`` numbers start at 1.
+    """
+    room_keys = {str(raw.get('room') or raw.get('room_number') or '').strip() for raw in raw_rows}
+    room_ids = [key for key in room_keys if key.isdigit()]
+    rooms = {}
+    for room in Room.objects.filter(Q(id__in=room_ids) | Q(room_number__in=room_keys)):
+        rooms[str(room.id)] = room
+        rooms[room.room_number] = room
+
+    report = []
+    parsed = {}
+    for index, raw in enumerate(raw_rows):
+        try:
+            parsed[index] = parse_row(raw, rooms)
+            report.append({'row': index + 1, 'status': 'created'})
+        except ValidationError as e:
+            report.append({'row': index + 1, 'status': 'invalid', 'errors': e.messages})
+
+    groups = {}
+    for index, values in parsed.items():
+        key = (values['room'].id, values['date'])
+        groups.setdefault(key, []).append((values['start_time'], values['end_time'], index))
+
+    with transaction.atomic():
+        if groups and not dry_run:
+            RoomDayLock.acquire_many(groups.keys())
+
+        existing = {}
+        approved = Booking.objects.filter(
+            room_id__in={room_id for room_id, _ in groups},
+            date__in={day for _, day in groups},
+            status='approved',
+        ).values_list('room_id', 'date', 'start_time', 'end_time')
+        for room_id, day, start, end in approved:
+            existing.setdefault((room_id, day), []).append((start, end))
+
+        for key, candidates in groups.items():
+            for index, reason in sweep_conflicts(candidates, existing.get(key, [])).items():
+                report[index] = {'row': index + 1, 'status': 'conflict', 'errors': [reason]}
+
+        valid = [index for index in sorted(parsed) if report[index]['status'] == 'created']
+        if dry_run:
+            for index in valid:
+                report[index]['status'] = 'valid'
+            return report
+
+        now = timezone.now()
+        bookings = Booking.objects.bulk_create([
+            Booking(user=user, status='approved', approved_by=user, approved_at=now, **parsed[index])
+            for index in valid
+        ])
+        for index, booking in zip(valid, bookings):
+            report[index]['id'] = booking.pk
+
+        # bulk_create skips post_save, so publish the stream events here
+        record_booking_events(bookings, 'created')
+        send_summaries(bookings, user)
+
+    return report
+
+
+def send_summaries(bookings, user):
+    """Queue one summary email per recipient instead of one per booking"""
+    by_recipient = {}
+    for booking in bookings:
+        recipient = booking.faculty_email or user.email
+        by_recipient.setdefault(recipient, []).append(booking)
+
+    messages = []
+    for recipient, items in by_recipient.items():
+        lines = [
+            f"- Room {b.room.room_number} on {b.date} from {b.start_time} to {b.end_time}"
+            + (f" ({b.purpose})" if b.purpose else '')
+            for b in sorted(items, key=lambda b: (b.date, b.start_time))
+        ]
+        message = (
+            f"Dear User,\n\n"
+            f"The following {len(items)} booking(s) have been CONFIRMED:\n\n"
+            + "\n".join(lines)
+            + "\n\nBest regards,\nRoomSync Team"
+        )
+        messages.append(('Room Booking Confirmation', message, [recipient]))
+
+    enqueue_emails(messages)
@@ -0,0 +1,196 @@
+import asyncio
+import json
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+from .models import BookingEvent
+
+
+EVENT_FIELDS = ('id', 'event', 'booking_id', 'room_id', 'date', 'start_time', 'end_time', 'status')
+
+
+def gap_cutoff():
+    return timezone.now() - timedelta(seconds=settings.BOOKING_STREAM_GAP_SECONDS)
+
+
+def fetch_events_after(last_id, limit=500):
+    """Events after ``last_id`` that are safe to hand out, in id order.
+
+    Ids are assigned on insert but become visible on commit, so a lower
+    id can appear after a higher one has been read. Reading stops at the
+    first gap in the ids until the missing event commits, or until the
+    event after the gap is BOOKING_STREAM_GAP_SECONDS old, at which point
+    the gap is taken for a rolled-back write. Readers that move their
+    position to the last event returned therefore never skip one.
+    """
+    events = list(
+        BookingEvent.objects.filter(id__gt=last_id)
+        .order_by('id')
+        .values(*EVENT_FIELDS, 'created_at')[:limit]
+    )
+    cutoff = gap_cutoff()
+    visible = []
+    for event in events:
+        if event['id'] != last_id + 1 and event['created_at'] > cutoff:
+            break
+        visible.append(event)
+        last_id = event['id']
+    return visible
+
+
+def latest_event_id():
+    """Where a new reader starts: after the newest event, or before the
+    first recent one while lower ids may still be committing"""
+    recent = BookingEvent.objects.filter(created_at__gt=gap_cutoff()).order_by('id').values_list('id', flat=True).first()
+    if recent is not None:
+        return recent - 1
+    return BookingEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def matches(event, room=None, date=None):
+    if room and str(event['room_id']) != str(room):
+        return False
+    if date and event['date'].isoformat() != date:
+        return False
+    return True
+
+
+def format_sse(event):
+    """Render one BookingEvent row as a server-sent event frame"""
+    data = {
+        'booking': event['booking_id'],
+        'room': event['room_id'],
+        'date': event['date'].isoformat(),
+        'start_time': event['start_time'].isoformat() if event['start_time'] else None,
+        'end_time': event['end_time'].isoformat() if event['end_time'] else None,
+        'status': event['status'],
+    }
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(data)}\n\n"
+
+
+class BookingEventHub:
+    """Per-process fan-out of booking events to connected stream clients.
+
+    One background task polls the BookingEvent table and copies new rows
+    into every subscriber's queue, so the database sees one cheap indexed
+    query per worker per poll interval no matter how many clients are
+    connected. Because the table is the channel, events written by any
+    worker reach clients connected to every other worker.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.lock = None
+        self.subscribers = set()
+        self.task = None
+        self.last_id = None
+
+    async def subscribe(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # Fresh event loop (e.g. a new worker process or test run)
+            self.__init__()
+            self.loop = loop
+            self.lock = asyncio.Lock()
+
+        queue = asyncio.Queue(maxsize=settings.BOOKING_STREAM_QUEUE_SIZE)
+        async with self.lock:
+            if self.task is None or self.task.done():
+                self.last_id = await sync_to_async(latest_event_id)()
+                self.task = asyncio.create_task(self.run())
+            self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def disconnect(self, queue):
+        """Drop a client that stopped reading.
+
+        The oldest queued event makes room for a ``None`` sentinel that ends
+        the stream; the browser's EventSource reconnects with Last-Event-ID
+        and replays what it missed from the table.
+        """
+        self.unsubscribe(queue)
+        queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def run(self):
+        while self.subscribers:
+            events = await sync_to_async(fetch_events_after)(self.last_id)
+            for event in events:
+                self.last_id = event['id']
+                for queue in list(self.subscribers):
+                    try:
+                        queue.put_nowait(event)
+                    except asyncio.QueueFull:
+                        self.disconnect(queue)
+            await asyncio.sleep(settings.BOOKING_STREAM_POLL_SECONDS)
+
+
+hub = BookingEventHub()
+
+
+def pending_frames(last_id, room=None, date=None):
+    """One-shot variant for WSGI servers, which cannot hold streams open.
+
+    Returns the frames available right now and lets the EventSource
+    reconnect after the (longer) fallback retry interval, which
+    degrades to cheap incremental polling instead of tying up a worker thread.
+    """
+    frames = [f"retry: {settings.BOOKING_STREAM_FALLBACK_RETRY_MS}\n\n"]
+    if last_id is None:
+        frames.append(f"id: {latest_event_id()}\n\n")
+        return frames
+    for event in fetch_events_after(last_id):
+        if matches(event, room, date):
+            frames.append(format_sse(event))
+        last_id = event['id']
+    frames.append(f"id: {last_id}\n\n")
+    return frames
+
+
+async def replay_events(last_id, until):
+    while last_id < until:
+        events = await sync_to_async(fetch_events_after)(last_id)
+        if not events:
+            return
+        for event in events:
+            if event['id'] > until:
+                return
+            yield event
+            last_id = event['id']
+
+
+async def stream_events(last_id, room=None, date=None):
+    """Async generator yielding SSE frames until the connection window ends"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.BOOKING_STREAM_MAX_SECONDS
+    queue = await hub.subscribe()
+    replay_until = hub.last_id
+    try:
+        yield f"retry: {settings.BOOKING_STREAM_RETRY_MS}\n\n"
+
+        # Replay from the table whatever the client missed since its
+        # Last-Event-ID; anything newer arrives through the queue.
+        if last_id is not None:
+            async for event in replay_events(last_id, replay_until):
+                if matches(event, room, date):
+                    yield format_sse(event)
+            last_id = max(last_id, replay_until)
+
+        while loop.time() < deadline:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.BOOKING_STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                break
+            if last_id is not None and event['id'] <= last_id:
+                continue
+            if matches(event, room, date):
+                yield format_sse(event)
+    finally:
+        hub.unsubscribe(queue)
@@ -0,0 +1,159 @@
+"""Streaming CSV and XLSX exports of bookings.
+
+Rows are read with ``iterator()`` and written out in chunks, so memory
+use does not grow with the number of bookings. The XLSX writer only
+needs the standard library: a workbook is a zip of XML parts, and
+zipfile can write one to a non-seekable stream.
+"""
+import csv
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from asgiref.sync import sync_to_async
+
+# (header, values() lookup) in column order
+COLUMNS = [
+    ('Room Number', 'room__room_number'),
+    ('Block', 'room__block__name'),
+    ('Date', 'date'),
+    ('Start Time', 'start_time'),
+    ('End Time', 'end_time'),
+    ('User Name', 'user__username'),
+    ('User Email', 'user__email'),
+    ('Faculty Email', 'faculty_email'),
+    ('Purpose', 'purpose'),
+    ('Status', 'status'),
+    ('Approved By', 'approved_by__username'),
+    ('Approved At', 'approved_at'),
+]
+
+ROWS_PER_CHUNK = 500
+
+
+def export_rows(queryset, chunk_size):
+    """Yield one tuple of cell values per booking, in COLUMNS order"""
+    return queryset.values_list(*[lookup for _, lookup in COLUMNS]).iterator(chunk_size=chunk_size)
+
+
+def cell_text(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def csv_chunks(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in COLUMNS])
+    for n, row in enumerate(rows, 1):
+        writer.writerow([cell_text(value) for value in row])
+        if n % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+class _Buffer:
+    """Write-only binary file that hands out what was written since the last drain"""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+# Characters XML 1.0 does not allow, even escaped
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Bookings" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def xlsx_row(values):
+    cells = ''.join(
+        f'<c t="inlineStr"><is><t>{escape(_INVALID_XML.sub("", cell_text(value)))}</t></is></c>'
+        for value in values
+    )
+    return f'<row>{cells}</row>'.encode()
+
+
+def xlsx_chunks(rows):
+    """A single-sheet workbook with every cell written as an inline string"""
+    buffer = _Buffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        yield buffer.drain()
+
+        with workbook.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(xlsx_row([header for header, _ in COLUMNS]))
+            for n, row in enumerate(rows, 1):
+                sheet.write(xlsx_row(row))
+                if n % ROWS_PER_CHUNK == 0:
+                    yield buffer.drain()
+            sheet.write(b'</sheetData></worksheet>')
+    yield buffer.drain()
+
+
+async def iterate_async(chunks):
+    """Feed a synchronous generator to an ASGI response one chunk at a time.
+
+    Django would otherwise collect the whole body in memory before sending
+    it. The generator keeps running in the thread that owns the database
+    connection.
+    """
+    chunks = iter(chunks)
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(chunks, None)) is not None:
+        yield chunk
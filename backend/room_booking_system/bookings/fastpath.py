@@ -0,0 +1,105 @@
+"""Read-only booking rows built from values() instead of BookingSerializer.
+
+Produces exactly what ``BookingSerializer(many=True).data`` would (same
+keys, order and values; see FastPathParityTests) for a fraction of the
+CPU: the per-field converters are looked up once per request, and each
+row is one dict built from a values() mapping instead of a model
+instance walked field by field.
+"""
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from rooms.serializers import RoomListSerializer
+from .serializers import BookingSerializer
+
+
+# Fields whose to_representation returns values() output unchanged
+IDENTITY_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField, serializers.ChoiceField)
+
+
+def _datetime_converter(field):
+    """DateTimeField.to_representation with the timezone lookup hoisted out"""
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if field_timezone is None or output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+
+    def convert(value):
+        if not timezone.is_aware(value):
+            return field.to_representation(value)
+        text = value.astimezone(field_timezone).isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return convert
+
+
+def _converter(field):
+    """value -> representation, or None where DRF's is the identity"""
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return None  # values() already returns the raw id
+    if isinstance(field, serializers.JSONField):
+        return field.to_representation if field.binary else None
+    if isinstance(field, IDENTITY_FIELDS):
+        return None
+    return field.to_representation
+
+
+def _plain(column, field):
+    convert = _converter(field)
+    if convert is None:
+        return lambda row: row[column]
+    return lambda row: None if row[column] is None else convert(row[column])
+
+
+def _room_details():
+    fields = RoomListSerializer().fields
+    getters = [
+        (name, _plain('room__block__name' if name == 'block' else f'room__{name}', field))
+        for name, field in fields.items()
+    ]
+    return lambda row: {name: get(row) for name, get in getters}
+
+
+def _user_full_name(row):
+    return f"{row['user__first_name']} {row['user__last_name']}".strip() or row['user__username']
+
+
+SPECIAL = {
+    'room_details': _room_details,
+    'user_name': lambda: (lambda row: row['user__username']),
+    'user_full_name': lambda: _user_full_name,
+    'user_email': lambda: (lambda row: row['user__email']),
+}
+
+
+def booking_columns(fields=None, omit=None, always=()):
+    """The values() columns the selected BookingSerializer fields need"""
+    return sorted(BookingSerializer.source_paths(fields, omit) | {'id'} | set(always))
+
+
+def booking_rows(rows, fields=None, omit=None):
+    """Turn values() dicts into BookingSerializer-shaped dicts"""
+    selected = BookingSerializer(fields=fields, omit=omit).fields
+    getters = []
+    skip_if_unapproved = None
+    for name, field in selected.items():
+        if name == 'approved_by_name':
+            # DRF leaves the key out when approved_by is null
+            skip_if_unapproved = len(getters)
+            getters.append((name, lambda row: row['approved_by__username']))
+        elif name in SPECIAL:
+            getters.append((name, SPECIAL[name]()))
+        else:
+            getters.append((name, _plain(name, field)))
+
+    if skip_if_unapproved is None:
+        return [{name: get(row) for name, get in getters} for row in rows]
+
+    with_approver = getters
+    without_approver = getters[:skip_if_unapproved] + getters[skip_if_unapproved + 1:]
+    return [
+        {name: get(row) for name, get in (with_approver if row['approved_by__username'] is not None else without_approver)}
+        for row in rows
+    ]
@@ -0,0 +1,184 @@
+"""iCalendar (.ics) feeds of bookings for calendar apps.
+
+Feeds are addressed by signed tokens, so a calendar app can poll them
+without a session. A token names the user who asked for it and their
+feed_token_version: it stops working once that user is deactivated or
+rotates their feed links, and after ICAL_TOKEN_MAX_AGE_DAYS. Each VEVENT is rendered once per booking version and
+cached; a feed whose bookings changed reuses the cached events of the
+unchanged ones. The assembled feed is cached under a stamp of its
+bookings (max updated_at and count), so any booking change invalidates it.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Count, Exists, Max, Q
+from django.utils import timezone
+
+from rooms.models import CatalogVersion, Room
+from users.models import User
+from .models import Booking
+
+FEED_TOKEN_SALT = 'bookings.ical'
+FEED_KINDS = ('user', 'room')
+
+# Feed and event entries are keyed by version stamps, so they never need
+# deleting; the timeouts only bound how long superseded entries linger
+FEED_TIMEOUT = 60 * 60
+EVENT_TIMEOUT = 24 * 60 * 60
+
+EVENT_FIELDS = [
+    'id', 'date', 'start_time', 'end_time', 'purpose', 'status', 'updated_at',
+    'room__room_number', 'room__block__name', 'user__username',
+]
+
+
+class InvalidFeedToken(Exception):
+    pass
+
+
+def make_feed_token(kind, pk, owner):
+    """A token for the ``kind`` feed of ``pk``, handed out to user ``owner``"""
+    return signing.dumps([kind, pk, owner.pk, owner.feed_token_version], salt=FEED_TOKEN_SALT)
+
+
+def read_feed_token(token):
+    """(kind, pk, owner id, owner's feed_token_version) of a feed token"""
+    try:
+        kind, pk, owner_id, version = signing.loads(
+            token, salt=FEED_TOKEN_SALT, max_age=timedelta(days=settings.ICAL_TOKEN_MAX_AGE_DAYS)
+        )
+    except (signing.BadSignature, ValueError, TypeError):
+        raise InvalidFeedToken('Invalid calendar token')
+    if kind not in FEED_KINDS or (kind == 'user' and pk != owner_id):
+        raise InvalidFeedToken('Invalid calendar token')
+    return kind, pk, owner_id, version
+
+
+def feed_scope(kind, pk, owner_id, version):
+    """(bookings within the feed window, calendar name) of a user or room feed.
+
+    A user feed holds their own bookings and those made for their email
+    as faculty. Returns None if the user or room no longer exists, or the
+    token's owner is inactive or has rotated their feed tokens since.
+    """
+    owner = User.objects.filter(pk=owner_id, is_active=True, feed_token_version=version)
+    if kind == 'user':
+        user = owner.values('username', 'email').first()
+        if user is None:
+            return None
+        bookings = Booking.objects.filter(Q(user_id=pk) | Q(faculty_email=user['email']))
+        name = f"RoomSync - {user['username']}"
+    else:
+        room = Room.objects.filter(pk=pk).filter(Exists(owner)).values('room_number').first()
+        if room is None:
+            return None
+        bookings = Booking.objects.filter(room_id=pk)
+        name = f"RoomSync - Room {room['room_number']}"
+
+    today = timezone.localdate()
+    bookings = bookings.filter(
+        date__gte=today - timedelta(days=settings.ICAL_PAST_DAYS),
+        date__lte=today + timedelta(days=settings.ICAL_FUTURE_DAYS),
+    )
+    return bookings, name
+
+
+def feed_stamp(queryset):
+    """(etag parts, last_modified) that change whenever the feed would"""
+    stamp = queryset.order_by().aggregate(last=Max('updated_at'), count=Count('id'))
+    # Room/block names appear in every event
+    version, updated_at = CatalogVersion.current()
+    parts = (stamp['last'], stamp['count'], version, updated_at, timezone.localdate())
+    return parts, max((t for t in (stamp['last'], updated_at) if t), default=None)
+
+
+def escape_text(value):
+    return (
+        str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '')
+    )
+
+
+def fold(line):
+    """Split a content line into 75-octet pieces as RFC 5545 requires"""
+    data = line.encode()
+    if len(data) <= 75:
+        return line
+    parts, start = [], 0
+    while start < len(data):
+        end = min(start + (75 if not parts else 74), len(data))
+        # Never split a UTF-8 sequence
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode())
+        start = end
+    return '\r\n '.join(parts)
+
+
+def utc_stamp(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def local_stamp(day, time):
+    return utc_stamp(timezone.make_aware(datetime.combine(day, time)))
+
+
+def render_event(row, kind):
+    summary = row['purpose'] or 'Room booking'
+    if kind == 'user':
+        summary = f"{summary} ({row['room__room_number']})"
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:booking-{row['id']}@roomsync",
+        f"DTSTAMP:{utc_stamp(row['updated_at'])}",
+        f"DTSTART:{local_stamp(row['date'], row['start_time'])}",
+        f"DTEND:{local_stamp(row['date'], row['end_time'])}",
+        f"SUMMARY:{escape_text(summary)}",
+        f"LOCATION:{escape_text(row['room__room_number'] + ', ' + row['room__block__name'])}",
+        f"DESCRIPTION:{escape_text('Booked by ' + row['user__username'])}",
+        f"STATUS:{'CONFIRMED' if row['status'] == 'approved' else 'TENTATIVE'}",
+        'END:VEVENT',
+    ]
+    return ''.join(fold(line) + '\r\n' for line in lines)
+
+
+def render_feed(queryset, kind, name):
+    """The full .ics body, rendering only events not already cached"""
+    catalog_version, _ = CatalogVersion.current()
+    rows = list(
+        queryset.filter(status__in=['approved', 'pending'])
+        .order_by('date', 'start_time', 'id')
+        .values(*EVENT_FIELDS)
+    )
+    keys = [f"ical:event:{kind}:{row['id']}:{row['updated_at'].timestamp()}:{catalog_version}" for row in rows]
+    events = cache.get_many(keys)
+
+    missing = {}
+    for key, row in zip(keys, rows):
+        if key not in events:
+            missing[key] = events[key] = render_event(row, kind)
+    if missing:
+        cache.set_many(missing, EVENT_TIMEOUT)
+
+    header = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//RoomSync//Bookings//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{escape_text(name)}',
+    ]
+    return ''.join(
+        [fold(line) + '\r\n' for line in header] + [events[key] for key in keys] + ['END:VCALENDAR\r\n']
+    )
+
+
+def cached_feed(etag, build):
+    """The feed body for ``etag``, built once across all of its pollers"""
+    key = 'ical:feed:' + etag.strip('"')
+    body = cache.get(key)
+    if body is None:
+        body = build()
+        cache.set(key, body, FEED_TIMEOUT)
+    return body
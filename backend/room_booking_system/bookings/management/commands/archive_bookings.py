@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from bookings.archive import archive_bookings, months_before
+from bookings.models import Booking
+
+
+class Command(BaseCommand):
+    help = 'Moves bookings older than N months out of the live table into the booking archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months', type=int, default=settings.BOOKING_ARCHIVE_AFTER_MONTHS,
+            help='Archive bookings dated before the first of the month this many months ago '
+                 '(default: BOOKING_ARCHIVE_AFTER_MONTHS)',
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Bookings moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Count the bookings without moving them')
+
+    def handle(self, *args, **options):
+        # Reads only look in the archive for dates before the configured
+        # cutoff, so archiving anything newer would hide it
+        if options['months'] < settings.BOOKING_ARCHIVE_AFTER_MONTHS:
+            raise CommandError(
+                f'--months must be at least BOOKING_ARCHIVE_AFTER_MONTHS ({settings.BOOKING_ARCHIVE_AFTER_MONTHS})'
+            )
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        cutoff = months_before(timezone.localdate(), options['months'])
+        if options['dry_run']:
+            count = Booking.objects.filter(date__lt=cutoff).count()
+            self.stdout.write(self.style.SUCCESS(f'Would archive {count} bookings dated before {cutoff}'))
+            return
+
+        total = archive_bookings(
+            cutoff, options['batch_size'], progress=lambda total: self.stdout.write(f'Archived {total}...')
+        )
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} bookings dated before {cutoff}'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from users.models import User
+from bookings.bulk import import_bookings, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Imports approved bookings (e.g. a semester timetable) from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV with room,date,start_time,end_time[,purpose,faculty_email] columns, or a JSON list')
+        parser.add_argument('--user', default='admin', help='Username recorded as creator and approver')
+        parser.add_argument('--dry-run', action='store_true', help='Check the file without creating anything')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+
+        with open(options['path'], 'rb') as f:
+            rows = read_rows(f, options['path'])
+
+        report = import_bookings(rows, user, dry_run=options['dry_run'])
+
+        for row in report:
+            if row['status'] in ('invalid', 'conflict'):
+                self.stdout.write(self.style.WARNING(
+                    f"Row {row['row']}: {row['status']} - {'; '.join(row['errors'])}"
+                ))
+
+        ok = sum(1 for row in report if row['status'] in ('created', 'valid'))
+        verb = 'Valid' if options['dry_run'] else 'Created'
+        self.stdout.write(self.style.SUCCESS(f'{verb}: {ok}, Skipped: {len(report) - ok}'))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0008_booking_query_indexes'),
+        ('rooms', '0002_room_equipment_room_features_room_is_active_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomDayLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='rooms.room')),
+            ],
+            options={
+                'unique_together': {('room', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:24
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+HISTORY_COLUMNS = (
+    'id, room_id, user_id, date, start_time, end_time, purpose, faculty_email, status, '
+    'rejection_reason, approved_by_id, approved_at, series_id, created_at, updated_at'
+)
+
+
+def partition_archive(apps, schema_editor):
+    """Recreate the (still empty) archive table as partitioned by month on PostgreSQL.
+
+    Partitioned tables need the partition key in their primary key, so the
+    key becomes (id, date); ids stay unique as they come from the live
+    table. Monthly partitions are created by the archive_bookings command;
+    the default partition catches anything else. The Meta indexes are
+    created after this runs (Django defers them to the end of the
+    migration), so they are built on the partitioned table.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in [
+        'ALTER TABLE bookings_bookingarchive RENAME TO bookings_bookingarchive_plain',
+        'CREATE TABLE bookings_bookingarchive (LIKE bookings_bookingarchive_plain INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (date)',
+        'DROP TABLE bookings_bookingarchive_plain',
+        'ALTER TABLE bookings_bookingarchive ADD PRIMARY KEY (id, date)',
+        'CREATE TABLE bookings_bookingarchive_default PARTITION OF bookings_bookingarchive DEFAULT',
+    ]:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0010_booking_series'),
+        ('rooms', '0004_catalog_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('purpose', models.CharField(blank=True, max_length=255, null=True)),
+                ('faculty_email', models.EmailField(blank=True, max_length=255, null=True)),
+                ('status', models.CharField(max_length=20)),
+                ('rejection_reason', models.TextField(blank=True, null=True)),
+                ('approved_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('approved_by', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('room', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='rooms.room')),
+                ('series', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='bookings.bookingseries')),
+                ('user', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['date', 'start_time', 'id'],
+                'indexes': [models.Index(fields=['date', 'start_time', 'id'], name='archive_date_start_id_idx'), models.Index(fields=['room', 'date'], name='archive_room_date_idx'), models.Index(fields=['user', 'date'], name='archive_user_date_idx')],
+            },
+        ),
+        migrations.RunPython(partition_archive, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='BookingHistory',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('purpose', models.CharField(blank=True, max_length=255, null=True)),
+                ('faculty_email', models.EmailField(blank=True, max_length=255, null=True)),
+                ('status', models.CharField(max_length=20)),
+                ('rejection_reason', models.TextField(blank=True, null=True)),
+                ('approved_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'booking history',
+                'db_table': 'bookings_bookinghistory',
+                'ordering': ['-created_at'],
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            'CREATE VIEW bookings_bookinghistory AS '
+            f'SELECT {HISTORY_COLUMNS} FROM bookings_booking '
+            'UNION ALL '
+            f'SELECT {HISTORY_COLUMNS} FROM bookings_bookingarchive',
+            'DROP VIEW bookings_bookinghistory',
+        ),
+    ]
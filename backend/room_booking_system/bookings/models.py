@@ -1,11 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from datetime import timedelta
 from users.models import User
 from rooms.models import Room
-from django.core.mail import send_mail
-from django.conf import settings
-import threading
+from notifications.outbox import enqueue_email
 
 
 class Booking(models.Model):
@@ -38,24 +37,55 @@ class Booking(models.Model):
         related_name='approved_bookings'
     )
     approved_at = models.DateTimeField(null=True, blank=True)
+    series = models.ForeignKey(
+        'bookings.BookingSeries',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='occurrences'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['updated_at'], name='booking_updated_at_idx'),
+            # Overlap checks: room + date equality, then a start_time range
+            models.Index(fields=['room', 'date', 'start_time'], name='booking_room_date_start_idx'),
+            models.Index(
+                fields=['room', 'date', 'start_time', 'end_time'],
+                condition=models.Q(status='approved'),
+                name='booking_approved_slot_idx',
+            ),
+            # Keyset pagination order of the list endpoints
+            models.Index(fields=['date', 'start_time', 'id'], name='booking_date_start_id_idx'),
+            models.Index(fields=['created_at'], name='booking_created_at_idx'),
+            models.Index(fields=['faculty_email'], name='booking_faculty_email_idx'),
+        ]
 
     def __str__(self):
         return f"{self.room.room_number} booked by {self.user.username} on {self.date}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status and slot so signals can tell what changed
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_slot = (instance.__dict__.get('room_id'), instance.__dict__.get('date'))
+        return instance
+
     def approve(self, approved_by_user):
         """Approve the booking"""
-        self.status = 'approved'
-        self.approved_by = approved_by_user
-        self.approved_at = timezone.now()
-        self.save()
-        # Email is sent via confirmation now for new bookings
-        if self.pk: # Only if it's an existing update
-             self.send_approval_email()
+        with transaction.atomic():
+            RoomDayLock.acquire(self.room_id, self.date)
+            if self.overlapping().exists():
+                raise ValidationError("Room already booked for that time.")
+            self.status = 'approved'
+            self.approved_by = approved_by_user
+            self.approved_at = timezone.now()
+            self.save(validate=False, update_fields=['status', 'approved_by', 'approved_at', 'updated_at'])
+            self.send_approval_email()
 
     def reject(self, rejected_by_user, reason=''):
         """Reject the booking"""
@@ -63,26 +93,24 @@ class Booking(models.Model):
         self.rejection_reason = reason
         self.approved_by = rejected_by_user  # Track who rejected it
         self.approved_at = timezone.now()
-        self.save()
-        self.send_rejection_email()
+        with transaction.atomic():
+            # Held while the post_save receivers recompute the day's rollup
+            RoomDayLock.acquire(self.room_id, self.date)
+            self.save(validate=False, update_fields=['status', 'rejection_reason', 'approved_by', 'approved_at', 'updated_at'])
+            self.send_rejection_email()
 
     def cancel(self):
         """Cancel the booking"""
         self.status = 'cancelled'
-        self.save()
-        self.send_cancellation_email()
-
-    def _send_email_thread(self, subject, message, recipient_list):
-        try:
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                recipient_list,
-                fail_silently=False,
-            )
-        except Exception as e:
-            print(f"Failed to send email: {e}")
+        with transaction.atomic():
+            RoomDayLock.acquire(self.room_id, self.date)
+            self.save(validate=False, update_fields=['status', 'updated_at'])
+            self.send_cancellation_email()
+
+    def _queue_email(self, subject, message):
+        # Written to the outbox in the caller's transaction; the send_outbox
+        # worker delivers it
+        enqueue_email(subject, message, [self.user.email])
 
     def send_approval_email(self):
         """Send email when booking is approved"""
@@ -98,8 +126,7 @@ class Booking(models.Model):
             f"Approved by: {self.approved_by.username if self.approved_by else 'System'}\n\n"
             f"Best regards,\nRoomSync Team"
         )
-        
-        threading.Thread(target=self._send_email_thread, args=(subject, message, [self.user.email])).start()
+        self._queue_email(subject, message)
 
     def send_rejection_email(self):
         """Send email when booking is rejected"""
@@ -116,8 +143,7 @@ class Booking(models.Model):
             f"Please contact the admin for more information.\n\n"
             f"Best regards,\nRoomSync Team"
         )
-        
-        threading.Thread(target=self._send_email_thread, args=(subject, message, [self.user.email])).start()
+        self._queue_email(subject, message)
 
     def send_cancellation_email(self):
         """Send email when booking is cancelled"""
@@ -131,11 +157,12 @@ class Booking(models.Model):
             f"Time: {self.start_time} - {self.end_time}\n\n"
             f"Best regards,\nRoomSync Team"
         )
-        
-        threading.Thread(target=self._send_email_thread, args=(subject, message, [self.user.email])).start()
+        self._queue_email(subject, message)
 
     def send_confirmation_email(self):
         """Send email when booking is created (Now Confirmed)"""
+        # Admins book on behalf of faculty_email when it is given
+        recipient_email = self.faculty_email or self.user.email
         subject = f"Booking Confirmed: {self.room.room_number}"
         message = (
             f"Dear {self.user.username},\n\n"
@@ -147,32 +174,253 @@ class Booking(models.Model):
             f"Purpose: {self.purpose}\n\n"
             f"Best regards,\nRoomSync Team"
         )
-        
-        threading.Thread(target=self._send_email_thread, args=(subject, message, [self.user.email])).start()
+        enqueue_email(subject, message, [recipient_email])
 
-    def clean(self):
-        """Validate booking doesn't overlap with approved bookings"""
-        overlapping = Booking.objects.filter(
-            room=self.room,
+    def overlapping(self):
+        """Approved bookings of the same room whose time overlaps this one"""
+        return Booking.objects.filter(
+            room_id=self.room_id,
             date=self.date,
             start_time__lt=self.end_time,
             end_time__gt=self.start_time,
             status='approved'  # Only check against approved bookings
         ).exclude(id=self.id)
 
-        if overlapping.exists():
+    def clean(self):
+        """Validate booking doesn't overlap with approved bookings"""
+        if self.overlapping().exists():
             raise ValidationError("Room already booked for that time.")
         
         # Validate time range
         if self.start_time >= self.end_time:
             raise ValidationError("End time must be after start time.")
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, validate=True, **kwargs):
+        # Callers that already checked conflicts under a RoomDayLock, or
+        # that only change status away from approved, pass validate=False.
         is_new = self.pk is None
-        self.full_clean()  # triggers clean()
-        super().save(*args, **kwargs)
-        
-        # Send confirmation email for new bookings
-        if is_new and self.status == 'approved':
-            self.send_confirmation_email()
+        if validate:
+            self.full_clean()  # triggers clean()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            # Send confirmation email for new bookings
+            if is_new and self.status == 'approved':
+                self.send_confirmation_email()
+
+
+
+class BookingSeries(models.Model):
+    """A recurring booking (e.g. a weekly lecture) expanded into Booking rows"""
+    FREQUENCY_CHOICES = [
+        ('weekly', 'Weekly'),
+        ('biweekly', 'Every two weeks'),
+    ]
+    FREQUENCY_DAYS = {'weekly': 7, 'biweekly': 14}
+
+    room = models.ForeignKey('rooms.Room', on_delete=models.CASCADE, related_name='booking_series')
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='booking_series')
+    start_date = models.DateField()
+    until = models.DateField()
+    frequency = models.CharField(max_length=20, choices=FREQUENCY_CHOICES, default='weekly')
+    exceptions = models.JSONField(default=list, blank=True)  # ISO dates that are skipped
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    purpose = models.CharField(max_length=255, blank=True, null=True)
+    faculty_email = models.EmailField(max_length=255, blank=True, null=True)
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('active', 'Active'),
+            ('cancelled', 'Cancelled')
+        ],
+        default='active'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['start_date', 'start_time']
+        verbose_name_plural = 'booking series'
+
+    def __str__(self):
+        return f"{self.room} {self.frequency} from {self.start_date} until {self.until}"
+
+    def occurrence_dates(self):
+        """Dates of every occurrence, skipping the exception dates"""
+        skipped = set(self.exceptions)
+        step = timedelta(days=self.FREQUENCY_DAYS[self.frequency])
+        dates = []
+        day = self.start_date
+        while day <= self.until:
+            if day.isoformat() not in skipped:
+                dates.append(day)
+            day += step
+        return dates
+
+
+class RoomDayLock(models.Model):
+    """One row per room and date, locked while a booking for that day is written.
+
+    Writers take the lock with an UPDATE before running the overlap
+    check, which on PostgreSQL blocks other transactions on the same row
+    and on SQLite takes the database write lock.
+    """
+    room = models.ForeignKey('rooms.Room', on_delete=models.CASCADE, related_name='+')
+    date = models.DateField()
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('room', 'date')
+
+    def __str__(self):
+        return f"Lock for room {self.room_id} on {self.date}"
+
+    @classmethod
+    def acquire(cls, room_id, date):
+        """Lock the room/day row until the surrounding transaction ends"""
+        cls.objects.get_or_create(room_id=room_id, date=date)
+        cls.objects.filter(room_id=room_id, date=date).update(version=models.F('version') + 1)
+
+    @classmethod
+    def acquire_many(cls, keys):
+        """Lock many (room_id, date) rows at once, e.g. for a bulk import.
+
+        Rows are locked in a fixed order so concurrent batches cannot
+        deadlock; the IN filters may lock a few extra rows, which is harmless.
+        """
+        keys = sorted(set(keys))
+        cls.objects.bulk_create([cls(room_id=room_id, date=date) for room_id, date in keys], ignore_conflicts=True)
+        locks = cls.objects.filter(
+            room_id__in={room_id for room_id, _ in keys},
+            date__in={date for _, date in keys},
+        )
+        list(locks.select_for_update().order_by('room_id', 'date').values_list('id', flat=True))
+        locks.update(version=models.F('version') + 1)
 
+
+class BookingTombstone(models.Model):
+    """Record of a hard-deleted booking, so sync clients can drop it"""
+    booking_id = models.BigIntegerField()
+    room_id = models.BigIntegerField()
+    date = models.DateField()
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['deleted_at']
+
+    def __str__(self):
+        return f"Booking {self.booking_id} deleted at {self.deleted_at}"
+
+
+class BookingEvent(models.Model):
+    """Append-only log of booking changes, read by the live event stream"""
+    EVENT_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('approved', 'Approved'),
+        ('rejected', 'Rejected'),
+        ('cancelled', 'Cancelled'),
+        ('deleted', 'Deleted'),
+    ]
+
+    event = models.CharField(max_length=20, choices=EVENT_CHOICES)
+    booking_id = models.BigIntegerField()
+    room_id = models.BigIntegerField()
+    date = models.DateField()
+    start_time = models.TimeField(null=True)
+    end_time = models.TimeField(null=True)
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"Booking {self.booking_id} {self.event}"
+
+
+class BookingRecord(models.Model):
+    """Booking columns shared by the archive table and the history view.
+
+    ``id`` is the id the booking had in the live table, so archived rows
+    keep their identity in URLs, exports and calendar UIDs.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    purpose = models.CharField(max_length=255, blank=True, null=True)
+    faculty_email = models.EmailField(max_length=255, blank=True, null=True)
+    status = models.CharField(max_length=20)
+    rejection_reason = models.TextField(blank=True, null=True)
+    approved_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"Booking {self.id} of room {self.room_id} on {self.date}"
+
+
+class BookingArchive(BookingRecord):
+    """Bookings moved out of the live table by ``archive_bookings``.
+
+    On PostgreSQL the table is partitioned by month of ``date`` (see
+    migration 0011), so old months can be detached or dropped on their
+    own. Foreign keys are not enforced by the database, which partitioned
+    tables make awkward; Django still cascades deletes of rooms and users.
+    """
+    room = models.ForeignKey(
+        'rooms.Room', on_delete=models.CASCADE, related_name='+', db_constraint=False, db_index=False
+    )
+    user = models.ForeignKey(
+        'users.User', on_delete=models.CASCADE, related_name='+', db_constraint=False, db_index=False
+    )
+    approved_by = models.ForeignKey(
+        'users.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+        db_constraint=False, db_index=False
+    )
+    series = models.ForeignKey(
+        'bookings.BookingSeries', on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+        db_constraint=False, db_index=False
+    )
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['date', 'start_time', 'id']
+        indexes = [
+            models.Index(fields=['date', 'start_time', 'id'], name='archive_date_start_id_idx'),
+            models.Index(fields=['room', 'date'], name='archive_room_date_idx'),
+            models.Index(fields=['user', 'date'], name='archive_user_date_idx'),
+        ]
+
+
+class BookingHistory(BookingRecord):
+    """Read-only view over live and archived bookings (UNION ALL).
+
+    Reads whose date range reaches past the archive cutoff query this
+    instead of Booking; see bookings.archive.booking_source. Both databases
+    push date/room filters down into each half of the union.
+    """
+    room = models.ForeignKey(
+        'rooms.Room', on_delete=models.DO_NOTHING, related_name='+', db_constraint=False
+    )
+    user = models.ForeignKey(
+        'users.User', on_delete=models.DO_NOTHING, related_name='+', db_constraint=False
+    )
+    approved_by = models.ForeignKey(
+        'users.User', on_delete=models.DO_NOTHING, null=True, blank=True, related_name='+', db_constraint=False
+    )
+    series = models.ForeignKey(
+        'bookings.BookingSeries', on_delete=models.DO_NOTHING, null=True, blank=True, related_name='+',
+        db_constraint=False
+    )
+
+    class Meta:
+        managed = False
+        db_table = 'bookings_bookinghistory'
+        ordering = ['-created_at']
+        verbose_name_plural = 'booking history'
@@ -0,0 +1,89 @@
+import base64
+from datetime import date, time
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class BookingCursorPagination(BasePagination):
+    """Keyset pagination over (date, start_time, id).
+
+    Each page is fetched with a single indexed range query that starts
+    right after the last row of the previous page, so the cost of a page
+    does not depend on how deep into the result set the client is.
+    """
+    page_size = 100
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering = ('date', 'start_time', 'id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            last_date, last_start, last_id = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(date__gt=last_date)
+                | Q(date=last_date, start_time__gt=last_start)
+                | Q(date=last_date, start_time=last_start, id__gt=last_id)
+            )
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def encode_cursor(self, booking):
+        # Pages hold Booking instances, or values() dicts on the fast path
+        if isinstance(booking, dict):
+            day, start, pk = booking['date'], booking['start_time'], booking['id']
+        else:
+            day, start, pk = booking.date, booking.start_time, booking.id
+        raw = f"{day.isoformat()}|{start.isoformat()}|{pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            last_date, last_start, last_id = raw.split('|')
+            return date.fromisoformat(last_date), time.fromisoformat(last_start), int(last_id)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,25 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class NormalizedJSONRenderer(JSONRenderer):
+    """Selected with ?format=normalized; list views then sideload related objects"""
+    format = 'normalized'
+
+
+class ExportRenderer(JSONRenderer):
+    """Selected with ?format= on the export action, which streams its own body.
+
+    Only error responses (bad filters, permission denied) are rendered
+    here, as JSON.
+    """
+    charset = 'utf-8'
+
+
+class CSVRenderer(ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class XLSXRenderer(ExportRenderer):
+    media_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    format = 'xlsx'
@@ -1,9 +1,12 @@
 from rest_framework import serializers
-from .models import Booking
+from room_booking_system.serializers import DynamicFieldsMixin
+from .models import Booking, BookingSeries
+from rooms.models import Room
 from rooms.serializers import RoomListSerializer
+from users.models import User
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     room_details = RoomListSerializer(source='room', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
     user_full_name = serializers.SerializerMethodField()
@@ -38,6 +41,43 @@ class BookingSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['user', 'status', 'approved_by', 'approved_at', 'created_at', 'updated_at']
 
+    field_sources = {
+        'room_details': [f'room__{name}' for name in sorted(RoomListSerializer.source_paths())],
+        'user_name': ['user__username'],
+        'user_full_name': ['user__username', 'user__first_name', 'user__last_name'],
+        'user_email': ['user__email'],
+        'approved_by_name': ['approved_by__username'],
+    }
+
+
+# Fields that embed related objects; normalized responses sideload those instead
+EMBEDDED_FIELDS = ['room_details', 'user_name', 'user_full_name', 'user_email', 'approved_by_name']
+
+
+def sideload(bookings):
+    """Rooms and users referenced by ``bookings``, each serialized once.
+
+    Returns ({room_id: room}, {user_id: user}) for a normalized response.
+    """
+    room_ids = {booking.room_id for booking in bookings}
+    user_ids = {booking.user_id for booking in bookings} | {
+        booking.approved_by_id for booking in bookings if booking.approved_by_id
+    }
+    rooms = Room.objects.filter(id__in=room_ids).select_related('block')
+    users = User.objects.filter(id__in=user_ids).only('id', 'username', 'first_name', 'last_name', 'email')
+    return (
+        {room['id']: room for room in RoomListSerializer(rooms, many=True).data},
+        {
+            user.id: {
+                'id': user.id,
+                'username': user.username,
+                'full_name': f"{user.first_name} {user.last_name}".strip() or user.username,
+                'email': user.email,
+            }
+            for user in users
+        },
+    )
+
 
 class BookingCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating bookings"""
@@ -52,27 +92,77 @@ class BookingCreateSerializer(serializers.ModelSerializer):
             'purpose',
             'faculty_email'
         ]
+        # The confirmation email names the room's block
+        extra_kwargs = {'room': {'queryset': Room.objects.select_related('block')}}
     
     def validate(self, data):
-        # Check for overlapping approved bookings
-        overlapping = Booking.objects.filter(
-            room=data['room'],
-            date=data['date'],
-            start_time__lt=data['end_time'],
-            end_time__gt=data['start_time'],
-            status='approved'
-        )
-        
-        if overlapping.exists():
+        # Overlaps are checked once, under a lock, by bookings.services.create_booking
+        if data['start_time'] >= data['end_time']:
             raise serializers.ValidationError(
-                "This room is already booked for the selected time slot."
+                "End time must be after start time."
             )
         
+        return data
+
+
+class BookingSeriesSerializer(serializers.ModelSerializer):
+    """Compact representation of a recurring booking"""
+    room_number = serializers.CharField(source='room.room_number', read_only=True)
+    user_name = serializers.CharField(source='user.username', read_only=True)
+
+    class Meta:
+        model = BookingSeries
+        fields = [
+            'id',
+            'room',
+            'room_number',
+            'user',
+            'user_name',
+            'start_date',
+            'until',
+            'frequency',
+            'exceptions',
+            'start_time',
+            'end_time',
+            'purpose',
+            'faculty_email',
+            'status',
+            'created_at',
+            'updated_at'
+        ]
+        read_only_fields = ['user', 'status', 'created_at', 'updated_at']
+
+
+class BookingSeriesCreateSerializer(serializers.ModelSerializer):
+    """Serializer for creating recurring bookings"""
+    exceptions = serializers.ListField(child=serializers.DateField(), required=False)
+    skip_conflicts = serializers.BooleanField(required=False, default=False, write_only=True)
+
+    class Meta:
+        model = BookingSeries
+        fields = [
+            'room',
+            'start_date',
+            'until',
+            'frequency',
+            'exceptions',
+            'start_time',
+            'end_time',
+            'purpose',
+            'faculty_email',
+            'skip_conflicts'
+        ]
+
+    def validate(self, data):
         if data['start_time'] >= data['end_time']:
             raise serializers.ValidationError(
                 "End time must be after start time."
             )
-        
+        if data['start_date'] > data['until']:
+            raise serializers.ValidationError(
+                "The series must end on or after its start date."
+            )
+        data['exceptions'] = [day.isoformat() for day in data.get('exceptions', [])]
         return data
 
 
@@ -0,0 +1,139 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from .models import Booking, RoomDayLock
+from .signals import record_booking_events
+
+
+def create_booking(user, room, date, start_time, end_time, purpose=None, faculty_email=None, approve=False):
+    """Create a booking with a single conflict check under a room/day lock.
+
+    The lock serializes concurrent writers for the same room and date, so
+    two requests racing for the same slot cannot both pass the overlap
+    check. ``approve`` records ``user`` as the approver in the same write.
+    """
+    if start_time >= end_time:
+        raise ValidationError("End time must be after start time.")
+
+    booking = Booking(
+        room=room,
+        user=user,
+        date=date,
+        start_time=start_time,
+        end_time=end_time,
+        purpose=purpose,
+        faculty_email=faculty_email,
+    )
+    if approve:
+        booking.status = 'approved'
+        booking.approved_by = user
+        booking.approved_at = timezone.now()
+
+    with transaction.atomic():
+        RoomDayLock.acquire(room.pk, date)
+        if booking.overlapping().exists():
+            raise ValidationError("This room is already booked for the selected time slot.")
+        booking.save(validate=False)
+
+    return booking
+
+
+def create_series(series, approve=False, skip_conflicts=False):
+    """Save a BookingSeries and create all of its occurrences at once.
+
+    Every occurrence is checked against existing approved bookings with a
+    single range query. Conflicting dates either fail the whole series or,
+    with ``skip_conflicts``, are recorded as exception dates. Occurrences
+    wait for an admin's approval unless ``approve`` is set.
+    """
+    if series.start_time >= series.end_time:
+        raise ValidationError("End time must be after start time.")
+    if series.start_date > series.until:
+        raise ValidationError("The series must end on or after its start date.")
+
+    dates = series.occurrence_dates()
+    if not dates:
+        raise ValidationError("The series has no occurrences.")
+    if len(dates) > settings.BOOKING_SERIES_MAX_OCCURRENCES:
+        raise ValidationError(
+            f"A series can have at most {settings.BOOKING_SERIES_MAX_OCCURRENCES} occurrences."
+        )
+
+    with transaction.atomic():
+        RoomDayLock.acquire_many((series.room_id, day) for day in dates)
+        conflicts = set(
+            Booking.objects.filter(
+                room_id=series.room_id,
+                date__gte=dates[0],
+                date__lte=dates[-1],
+                date__in=dates,
+                start_time__lt=series.end_time,
+                end_time__gt=series.start_time,
+                status='approved',
+            ).values_list('date', flat=True)
+        )
+        if conflicts and not skip_conflicts:
+            raise ValidationError(
+                "Room already booked on: " + ", ".join(day.isoformat() for day in sorted(conflicts))
+            )
+
+        series.exceptions = sorted(set(series.exceptions) | {day.isoformat() for day in conflicts})
+        series.save()
+
+        now = timezone.now()
+        occurrences = Booking.objects.bulk_create([
+            Booking(
+                room_id=series.room_id,
+                user_id=series.user_id,
+                series=series,
+                date=day,
+                start_time=series.start_time,
+                end_time=series.end_time,
+                purpose=series.purpose,
+                faculty_email=series.faculty_email,
+                status='approved' if approve else 'pending',
+                approved_by_id=series.user_id if approve else None,
+                approved_at=now if approve else None,
+            )
+            for day in dates if day not in conflicts
+        ])
+        record_booking_events(occurrences, 'created')
+
+    return series, occurrences
+
+
+def cancel_occurrences(bookings):
+    """Cancel many bookings with one UPDATE and publish their events.
+
+    Call inside a transaction: the room/day locks are held until the
+    rollups of those days have been recomputed.
+    """
+    bookings = list(bookings.exclude(status='cancelled'))
+    RoomDayLock.acquire_many((booking.room_id, booking.date) for booking in bookings)
+    Booking.objects.filter(pk__in=[b.pk for b in bookings]).update(status='cancelled', updated_at=timezone.now())
+    for booking in bookings:
+        booking.status = 'cancelled'
+    record_booking_events(bookings, 'cancelled')
+    return bookings
+
+
+def cancel_series(series, from_date=None):
+    """Cancel a whole series, or only its occurrences on/after ``from_date``"""
+    with transaction.atomic():
+        occurrences = series.occurrences.all()
+        if from_date:
+            occurrences = occurrences.filter(date__gte=from_date)
+        else:
+            series.status = 'cancelled'
+            series.save(update_fields=['status', 'updated_at'])
+        return cancel_occurrences(occurrences)
+
+
+def cancel_series_occurrence(series, day):
+    """Cancel a single occurrence and remember it as an exception date"""
+    with transaction.atomic():
+        if day.isoformat() not in series.exceptions:
+            series.exceptions = sorted(series.exceptions + [day.isoformat()])
+            series.save(update_fields=['exceptions', 'updated_at'])
+        return cancel_occurrences(series.occurrences.filter(date=day))
@@ -0,0 +1,92 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+from users.models import User
+from .models import Booking, BookingArchive, BookingEvent, BookingTombstone
+
+# User fields embedded in booking payloads (user_name, user_email, ...)
+USER_DISPLAY_FIELDS = {'username', 'first_name', 'last_name', 'email'}
+
+# Sent with ``bookings=[...]`` by the bulk_create()/update() paths, which
+# skip post_save, so other apps can follow those writes too
+bookings_changed = Signal()
+
+
+def record_booking_event(instance, event):
+    booking_event = BookingEvent.objects.create(
+        event=event,
+        booking_id=instance.pk,
+        room_id=instance.room_id,
+        date=instance.date,
+        start_time=instance.start_time,
+        end_time=instance.end_time,
+        status=instance.status,
+    )
+    # Live streams only replay recent history, so trim the log now and then
+    if booking_event.pk % 100 == 0:
+        BookingEvent.objects.filter(
+            created_at__lt=timezone.now() - timedelta(days=settings.BOOKING_SYNC_RETENTION_DAYS)
+        ).delete()
+
+
+def record_booking_events(bookings, event):
+    """Bulk variant for bulk_create()/update() paths, which skip signals"""
+    BookingEvent.objects.bulk_create([
+        BookingEvent(
+            event=event,
+            booking_id=booking.pk,
+            room_id=booking.room_id,
+            date=booking.date,
+            start_time=booking.start_time,
+            end_time=booking.end_time,
+            status=booking.status,
+        )
+        for booking in bookings
+    ])
+    bookings_changed.send(sender=Booking, bookings=bookings, event=event)
+
+
+@receiver(post_save, sender=Booking)
+def publish_booking_saved(sender, instance, created, **kwargs):
+    if created:
+        event = 'created'
+    elif instance.status != getattr(instance, '_loaded_status', None) and instance.status in ('approved', 'rejected', 'cancelled'):
+        event = instance.status
+    else:
+        event = 'updated'
+    record_booking_event(instance, event)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Booking)
+def record_booking_tombstone(sender, instance, **kwargs):
+    """Leave a tombstone behind so the sync feed can report the delete"""
+    now = timezone.now()
+    BookingTombstone.objects.create(
+        booking_id=instance.pk,
+        room_id=instance.room_id,
+        date=instance.date,
+        deleted_at=now,
+    )
+    record_booking_event(instance, 'deleted')
+    # Tombstones only need to outlive the oldest sync token we still accept
+    BookingTombstone.objects.filter(
+        deleted_at__lt=now - timedelta(days=settings.BOOKING_SYNC_RETENTION_DAYS)
+    ).delete()
+
+
+@receiver(post_save, sender=User)
+def touch_bookings_of_renamed_user(sender, instance, created, raw=False, **kwargs):
+    """Move updated_at of a user's bookings when their name or email changes.
+
+    List ETags, sync tokens and calendar feeds all follow max(updated_at),
+    so clients refetch the bookings that show the old name.
+    """
+    if created or raw or not USER_DISPLAY_FIELDS & getattr(instance, 'changed_fields', set()):
+        return
+    now = timezone.now()
+    for model in (Booking, BookingArchive):
+        model.objects.filter(Q(user=instance) | Q(approved_by=instance)).update(updated_at=now)
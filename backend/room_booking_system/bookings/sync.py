@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+from .models import BookingTombstone
+
+
+SYNC_TOKEN_SALT = 'bookings.sync'
+
+
+class InvalidSyncToken(Exception):
+    pass
+
+
+def make_sync_token(moment):
+    """Wrap a timestamp in an opaque, tamper-proof token"""
+    return signing.dumps(moment.isoformat(), salt=SYNC_TOKEN_SALT, compress=True)
+
+
+def read_sync_token(token):
+    try:
+        return datetime.fromisoformat(signing.loads(token, salt=SYNC_TOKEN_SALT))
+    except (signing.BadSignature, ValueError, TypeError):
+        raise InvalidSyncToken('Invalid sync token')
+
+
+def token_expired(since):
+    return since < timezone.now() - timedelta(days=settings.BOOKING_SYNC_RETENTION_DAYS)
+
+
+def changes_since(queryset, since):
+    """Return (changed bookings, deleted booking ids) since a timestamp.
+
+    ``updated_at`` and ``deleted_at`` are set before the writing
+    transaction commits, so a row can become visible after a token later
+    than its timestamp was handed out. The delta therefore starts
+    BOOKING_SYNC_OVERLAP_SECONDS before ``since``. Rows in that overlap
+    are sent again, which is harmless because clients apply changes
+    idempotently by id.
+    """
+    since -= timedelta(seconds=settings.BOOKING_SYNC_OVERLAP_SECONDS)
+    changed = queryset.filter(updated_at__gte=since)
+    deleted = list(
+        BookingTombstone.objects.filter(deleted_at__gte=since)
+        .values_list('booking_id', flat=True)
+        .distinct()
+    )
+    return changed, deleted
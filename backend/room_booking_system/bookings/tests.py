@@ -1,3 +1,926 @@
-from django.test import TestCase
+import csv
+import io
+import threading
+import time as time_module
+import zipfile
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from datetime import date, time, timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from room_booking_system.middleware import query_stats
+from notifications.models import OutboxEmail
+from reports.models import BookingDailyRollup
+from room_booking_system.testing import QueryBudgetMixin, seed_campus
+from rooms.models import Block, Room
+from rooms.serializers import RoomListSerializer
+from users.models import User
+from . import events, ical
+from .archive import archive_cutoff, months_before
+from .fastpath import booking_columns, booking_rows
+from .models import Booking, BookingArchive, BookingEvent, BookingHistory, BookingTombstone
+from .serializers import EMBEDDED_FIELDS, BookingSerializer
+from .services import create_booking
+from .sync import read_sync_token
+from .signals import record_booking_events
+
+
+class AvailabilityTests(TestCase):
+    """Room statuses for a day or a slot, as the dashboard shows them"""
+
+    @classmethod
+    def setUpTestData(cls):
+        main, science = Block.objects.create(name='Main'), Block.objects.create(name='Science')
+        cls.full, cls.partial, cls.pending = [
+            Room.objects.create(block=block, room_number=number, room_type='Classroom', capacity=40)
+            for block, number in ((main, 'M-1'), (main, 'M-2'), (science, 'S-1'))
+        ]
+        cls.free = Room.objects.create(block=science, room_number='S-2', room_type='Lab', capacity=20)
+        Room.objects.create(block=science, room_number='S-3', room_type='Lab', capacity=20, is_active=False)
+        user = User.objects.create(username='avail', email='avail@example.com', role='faculty')
+        cls.day = date(2030, 1, 7)
+        Booking.objects.bulk_create([
+            Booking(room=cls.full, user=user, date=cls.day, start_time=time(9), end_time=time(12)),
+            Booking(room=cls.full, user=user, date=cls.day, start_time=time(13), end_time=time(15)),
+            Booking(room=cls.partial, user=user, date=cls.day, start_time=time(9), end_time=time(10)),
+            Booking(room=cls.partial, user=user, date=cls.day, start_time=time(10), end_time=time(11),
+                    status='cancelled'),
+            Booking(room=cls.pending, user=user, date=cls.day, start_time=time(10), end_time=time(11),
+                    status='pending'),
+            Booking(room=cls.free, user=user, date=cls.day + timedelta(days=1), start_time=time(9),
+                    end_time=time(17)),
+        ])
+
+    def statuses(self, **params):
+        response = self.client.get('/api/bookings/availability/', {'date': str(self.day), **params})
+        self.assertEqual(response.status_code, 200)
+        return {int(room_id): status for room_id, status in response.json()['rooms'].items()}
+
+    def test_whole_day(self):
+        self.assertEqual(self.statuses(), {
+            self.full.pk: 'fully_booked',
+            self.partial.pk: 'partially_booked',
+            self.pending.pk: 'pending',
+            self.free.pk: 'available',
+        })
+
+    def test_slot_and_block(self):
+        self.assertEqual(self.statuses(slot='09:30-10:00', block='Main'), {
+            self.full.pk: 'booked', self.partial.pk: 'booked',
+        })
+        # Bookings ending at the slot start and cancelled ones do not count
+        self.assertEqual(self.statuses(slot='10:00-11:00')[self.partial.pk], 'available')
+        self.assertEqual(self.statuses(slot='10:30-12:00')[self.pending.pk], 'pending')
+
+    def test_bad_parameters(self):
+        for params in ({'date': '07/01/2030'}, {'date': str(self.day), 'slot': '11:00-10:00'},
+                       {'date': str(self.day), 'slot': 'noon'}):
+            with self.subTest(**params):
+                self.assertEqual(self.client.get('/api/bookings/availability/', params).status_code, 400)
+
+
+class CursorPaginationTests(TestCase):
+    """Keyset pages cover every booking in the window exactly once"""
+
+    @classmethod
+    def setUpTestData(cls):
+        block = Block.objects.create(name='Main')
+        rooms = [Room.objects.create(block=block, room_number=f'P-{n}', room_type='Classroom', capacity=30)
+                 for n in range(4)]
+        user = User.objects.create(username='pages', email='pages@example.com', role='faculty')
+        cls.day = date(2030, 1, 7)
+        bookings = [
+            # Ties on (date, start_time) across rooms, broken by id
+            Booking(room=room, user=user, date=cls.day + timedelta(days=day), start_time=time(hour),
+                    end_time=time(hour + 1))
+            for day in range(3) for hour in (9, 10) for room in rooms
+        ]
+        bookings.append(Booking(room=rooms[0], user=user, date=cls.day + timedelta(days=30),
+                                start_time=time(9), end_time=time(10)))
+        Booking.objects.bulk_create(bookings)
+        cls.window = {'start_date': str(cls.day), 'end_date': str(cls.day + timedelta(days=2))}
+        cls.expected = list(
+            Booking.objects.filter(date__lte=cls.day + timedelta(days=2))
+            .order_by('date', 'start_time', 'id').values_list('id', flat=True)
+        )
+
+    def walk(self, page_size):
+        ids, pages = [], 0
+        url, params = '/api/bookings/', {**self.window, 'page_size': page_size}
+        while url:
+            body = self.client.get(url, params).json()
+            ids += [row['id'] for row in body['results']]
+            pages += 1
+            url, params = body['next'], None
+        return ids, pages
+
+    def test_pages_split_ties(self):
+        self.assertEqual(len(self.expected), 24)
+        for page_size, pages in ((5, 5), (8, 3), (24, 1), (100, 1)):
+            with self.subTest(page_size=page_size):
+                ids, walked = self.walk(page_size)
+                self.assertEqual(ids, self.expected)
+                self.assertEqual(walked, pages)
+
+    def test_page_size_is_clamped(self):
+        results = self.client.get('/api/bookings/', {**self.window, 'page_size': 0}).json()['results']
+        self.assertEqual(len(results), 24)  # falls back to the default of 100
+        results = self.client.get('/api/bookings/', {**self.window, 'page_size': 'x'}).json()['results']
+        self.assertEqual(len(results), 24)
+
+    def test_window_and_bad_cursor(self):
+        ids = [row['id'] for row in self.client.get(
+            '/api/bookings/', {'start_date': str(self.day + timedelta(days=30))}
+        ).json()['results']]
+        self.assertEqual(len(ids), 1)
+        response = self.client.get('/api/bookings/', {**self.window, 'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'cursor': 'Invalid cursor'})
+        response = self.client.get('/api/bookings/', {'start_date': '2030-02-01', 'end_date': '2030-01-01'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_bad_filters(self):
+        for path, params in [
+            ('/api/bookings/', {'room': 'abc'}),
+            ('/api/bookings/', {'date': 'monday'}),
+            ('/api/bookings/', {'room': 'abc', 'series': 'compact'}),
+            ('/api/bookings/by_room/', {'room_id': 'abc'}),
+            ('/api/bookings/by_room/', {'room_id': '1', 'date': '2030-13-01'}),
+        ]:
+            with self.subTest(path=path, params=params):
+                self.assertEqual(self.client.get(path, params).status_code, 400)
+        self.assertEqual(self.client.get('/api/bookings/by_room/').status_code, 400)
+
+
+class SyncTests(TestCase):
+    """Deltas between two sync tokens report every create, update and delete"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.faculty = cls.campus['faculty'][0]
+        # Out of reach of the overlap a delta re-reads
+        Booking.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def sync(self, token=None):
+        response = self.client.get('/api/bookings/sync/', {'since': token} if token else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_delta_between_tokens(self):
+        first = self.sync()
+        self.assertTrue(first['reset'])
+        self.assertEqual(first['deleted'], [])
+
+        updated, deleted = Booking.objects.filter(status='pending')[:2]
+        created = create_booking(self.faculty, self.campus['rooms'][0], timezone.localdate() + timedelta(days=40),
+                                 time(9), time(10))
+        updated.purpose = 'Moved'
+        updated.save()
+        deleted_id = deleted.pk
+        deleted.delete()
+
+        delta = self.sync(first['token'])
+        self.assertFalse(delta['reset'])
+        changed = {row['id']: row for row in delta['changed']}
+        self.assertEqual(set(changed), {created.pk, updated.pk})
+        self.assertEqual(changed[updated.pk]['purpose'], 'Moved')
+        self.assertEqual(delta['deleted'], [deleted_id])
+
+    @override_settings(BOOKING_SYNC_OVERLAP_SECONDS=60)
+    def test_late_commits_are_not_missed(self):
+        token = self.sync()['token']
+        cut = read_sync_token(token)
+        # Written before the token was cut but committed after it
+        late = Booking.objects.filter(status='approved').first()
+        Booking.objects.filter(pk=late.pk).update(purpose='Late', updated_at=cut - timedelta(seconds=30))
+        BookingTombstone.objects.create(booking_id=10**6, room_id=late.room_id, date=late.date,
+                                        deleted_at=cut - timedelta(seconds=30))
+        stale = Booking.objects.exclude(pk=late.pk).first()
+        Booking.objects.filter(pk=stale.pk).update(updated_at=cut - timedelta(seconds=90))
+
+        delta = self.sync(token)
+        self.assertEqual([row['id'] for row in delta['changed']], [late.pk])
+        self.assertEqual(delta['deleted'], [10**6])
+
+    def test_bad_and_expired_tokens(self):
+        self.assertEqual(self.client.get('/api/bookings/sync/', {'since': 'nope'}).status_code, 400)
+        token = self.sync()['token']
+        with override_settings(BOOKING_SYNC_RETENTION_DAYS=-1):
+            self.assertTrue(self.sync(token)['reset'])
+
+
+class EventStreamTests(TestCase):
+    """Stream readers resume from Last-Event-ID and never skip a late commit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.rooms = cls.campus['rooms']
+
+    def setUp(self):
+        BookingEvent.objects.update(created_at=timezone.now() - timedelta(hours=1))
+        self.start = BookingEvent.objects.order_by('-id').values_list('id', flat=True).first()
+
+    def add_events(self, count, room=None):
+        booking = Booking.objects.filter(room=room or self.rooms[0]).first()
+        record_booking_events([booking] * count, 'updated')
+        return list(BookingEvent.objects.filter(id__gt=self.start).order_by('id').values_list('id', flat=True))
+
+    def ids(self, events):
+        return [event['id'] for event in events]
+
+    def test_reading_holds_back_at_gaps(self):
+        first, missing, last = self.add_events(3)
+        # An event that is not visible yet, as if its transaction were open
+        BookingEvent.objects.filter(pk=missing).delete()
+        self.assertEqual(self.ids(events.fetch_events_after(self.start)), [first])
+        self.assertEqual(self.ids(events.fetch_events_after(first)), [])
+        # Past the grace period the gap is taken for a rollback
+        BookingEvent.objects.filter(pk=last).update(created_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(self.ids(events.fetch_events_after(first)), [last])
+
+    def test_new_readers_start_before_recent_events(self):
+        self.assertEqual(events.latest_event_id(), self.start)
+        new = self.add_events(2)
+        self.assertEqual(events.latest_event_id(), self.start)
+        BookingEvent.objects.filter(pk__in=new).update(created_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(events.latest_event_id(), new[-1])
+
+    def test_wsgi_fallback_resumes_from_last_event_id(self):
+        response = self.client.get('/api/bookings/stream/')
+        self.assertEqual(b''.join(response.streaming_content).decode().split('\n\n')[1], f'id: {self.start}')
+
+        other = self.add_events(1, room=self.rooms[1])
+        new = self.add_events(2)[1:]
+        body = b''.join(self.client.get(
+            '/api/bookings/stream/', {'room': self.rooms[0].pk}, HTTP_LAST_EVENT_ID=str(self.start),
+        ).streaming_content).decode()
+        self.assertEqual([line for line in body.split('\n') if line.startswith('id:')],
+                         [f'id: {pk}' for pk in new] + [f'id: {new[-1]}'])
+        self.assertNotIn(f'id: {other[0]}\nevent', body)
+        self.assertEqual(self.client.get('/api/bookings/stream/', HTTP_LAST_EVENT_ID='x').status_code, 400)
+
+    @override_settings(BOOKING_STREAM_POLL_SECONDS=0.01, BOOKING_STREAM_HEARTBEAT_SECONDS=0.05,
+                       BOOKING_STREAM_MAX_SECONDS=0.5)
+    def test_stream_replays_then_follows_the_hub(self):
+        missed = self.add_events(2)
+
+        async def read():
+            frames = []
+            async for frame in events.stream_events(self.start, room=self.rooms[0].pk):
+                frames.append(frame)
+                if len(frames) == 3:
+                    # Replayed both events; now one that arrives live
+                    await events.sync_to_async(self.add_events)(1)
+            await events.hub.task
+            return frames
+
+        frames = async_to_sync(read)()
+        ids = [int(frame.split('\n')[0][4:]) for frame in frames if frame.startswith('id: ')]
+        self.assertEqual(ids, missed + [missed[-1] + 1])
+        self.assertEqual(events.hub.subscribers, set())
+
+
+class BulkImportTests(TestCase):
+    """A bulk import creates the good rows and reports every bad one"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.admin = cls.campus['admin']
+        cls.room, cls.other = cls.campus['rooms'][:2]
+        cls.day = timezone.localdate() + timedelta(days=100)
+        Booking.objects.create(room=cls.room, user=cls.admin, date=cls.day, start_time=time(9), end_time=time(10))
+
+    def rows(self):
+        day = str(self.day)
+        return [
+            {'room': 'R-000', 'date': day, 'start_time': '10:00', 'end_time': '11:00', 'purpose': 'Fits'},
+            {'room': 'R-000', 'date': day, 'start_time': '09:30', 'end_time': '10:30'},  # existing booking
+            {'room': str(self.room.pk), 'date': day, 'start_time': '10:30', 'end_time': '12:00'},  # row 1
+            {'room': 'R-000', 'date': day, 'start_time': '11:00', 'end_time': '12:00',
+             'faculty_email': 'guest@example.com'},
+            {'room': 'R-001', 'date': day, 'start_time': '09:00', 'end_time': '10:00'},  # other room
+            {'room': 'R-999', 'date': day, 'start_time': '09:00', 'end_time': '10:00'},
+            {'room': 'R-001', 'date': 'soon', 'start_time': '10', 'end_time': '09:00', 'faculty_email': 'x'},
+        ]
+
+    def post(self, rows, **params):
+        self.client.force_login(self.admin)
+        path = '/api/bookings/bulk/' + ('?dry_run=true' if params.get('dry_run') else '')
+        return self.client.post(path, rows, content_type='application/json')
+
+    def test_partial_success(self):
+        before = Booking.objects.count()
+        body = self.post(self.rows()).json()
+        self.assertEqual(body['counts'], {'created': 3, 'conflict': 2, 'invalid': 2})
+        statuses = [row['status'] for row in body['rows']]
+        self.assertEqual(statuses, ['created', 'conflict', 'conflict', 'created', 'created', 'invalid', 'invalid'])
+        self.assertEqual(body['rows'][1]['errors'], ['Room already booked for that time.'])
+        self.assertEqual(body['rows'][2]['errors'], ['Overlaps row 1 of this batch.'])
+        self.assertEqual(body['rows'][5]['errors'], ["Unknown room 'R-999'"])
+        self.assertEqual(len(body['rows'][6]['errors']), 3)
+
+        self.assertEqual(Booking.objects.count(), before + 3)
+        created = Booking.objects.filter(pk__in=[row['id'] for row in body['rows'] if 'id' in row])
+        self.assertEqual(
+            sorted(created.values_list('room__room_number', 'start_time', 'status')),
+            [('R-000', time(10), 'approved'), ('R-000', time(11), 'approved'), ('R-001', time(9), 'approved')],
+        )
+        # Running it again conflicts on every row that was created
+        self.assertEqual(self.post(self.rows()).json()['counts'], {'conflict': 5, 'invalid': 2})
+
+    def test_dry_run_writes_nothing(self):
+        before = Booking.objects.count()
+        body = self.post(self.rows(), dry_run=True).json()
+        self.assertEqual(body['counts'], {'valid': 3, 'conflict': 2, 'invalid': 2})
+        self.assertEqual(Booking.objects.count(), before)
+
+    def test_csv_upload_and_permissions(self):
+        upload = io.BytesIO(b'room,date,start_time,end_time\nR-001,' + str(self.day).encode() + b',13:00,14:00\n')
+        upload.name = 'bookings.csv'
+        self.client.force_login(self.admin)
+        body = self.client.post('/api/bookings/bulk/', {'file': upload}).json()
+        self.assertEqual(body['counts'], {'created': 1})
+        self.client.force_login(self.campus['faculty'][0])
+        self.assertEqual(self.client.post('/api/bookings/bulk/', [], content_type='application/json').status_code, 403)
+
+
+class ConditionalListTests(TestCase):
+    """Booking list polls get 304 until a booking in scope changes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.faculty = cls.campus['faculty'][0]
+
+    def setUp(self):
+        self.client.force_login(self.faculty)
+
+    def poll(self, etag=None, path='/api/bookings/'):
+        return self.client.get(path, HTTP_IF_NONE_MATCH=etag) if etag else self.client.get(path)
+
+    def test_304_until_changed(self):
+        first = self.poll()
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('no-cache', first['Cache-Control'])
+        not_modified = self.poll(first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        since = self.client.get('/api/bookings/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(since.status_code, 304)
+
+        booking = Booking.objects.filter(user=self.faculty).first()
+        booking.purpose = 'Rescheduled review'
+        booking.save()
+        updated = self.poll(first['ETag'])
+        self.assertEqual(updated.status_code, 200)
+        self.assertNotEqual(updated['ETag'], first['ETag'])
+        self.assertIn('Rescheduled review', {row['purpose'] for row in updated.json()['results']})
+        self.assertEqual(self.poll(updated['ETag']).status_code, 304)
+
+        booking.delete()
+        deleted = self.poll(updated['ETag'])
+        self.assertEqual(deleted.status_code, 200)
+        self.assertNotIn(booking.pk, {row['id'] for row in deleted.json()['results']})
+
+    def test_renaming_a_user_changes_the_validator(self):
+        first = self.poll()
+        # Logging in only saves last_login, which no booking shows
+        self.client.force_login(self.faculty)
+        self.assertEqual(self.poll(first['ETag']).status_code, 304)
+
+        user = User.objects.get(pk=self.faculty.pk)
+        user.first_name, user.last_name = 'Renamed', 'Person'
+        user.save()
+        renamed = self.poll(first['ETag'])
+        self.assertEqual(renamed.status_code, 200)
+        names = {row['user_full_name'] for row in renamed.json()['results'] if row['user'] == user.pk}
+        self.assertEqual(names, {'Renamed Person'})
+
+    def test_validators_are_per_scope(self):
+        mine = self.poll(path='/api/bookings/my_bookings/')
+        everyone = self.poll()
+        self.assertNotEqual(mine['ETag'], everyone['ETag'])
+        self.assertEqual(self.poll(everyone['ETag'], '/api/bookings/my_bookings/').status_code, 200)
+
+
+class NormalizedListTests(TestCase):
+    """?format=normalized carries ids in bookings and each room/user once"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.admin = cls.campus['admin']
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_payload_shape(self):
+        plain = self.client.get('/api/bookings/').json()
+        body = self.client.get('/api/bookings/', {'format': 'normalized'}).json()
+        self.assertEqual(set(body), {'next', 'bookings', 'rooms', 'users'})
+        self.assertEqual(body['next'] is None, plain['next'] is None)
+
+        # Same rows in the same order, minus the embedded room/user fields
+        self.assertEqual(
+            body['bookings'],
+            [{name: value for name, value in row.items() if name not in EMBEDDED_FIELDS} for row in plain['results']],
+        )
+
+        bookings = body['bookings']
+        room_ids = {booking['room'] for booking in bookings}
+        user_ids = {booking['user'] for booking in bookings} | {
+            booking['approved_by'] for booking in bookings if booking['approved_by']
+        }
+        self.assertGreater(len(bookings), len(room_ids))
+        self.assertEqual(set(body['rooms']), {str(pk) for pk in room_ids})
+        self.assertEqual(set(body['users']), {str(pk) for pk in user_ids})
+
+        rooms = Room.objects.filter(id__in=room_ids).select_related('block')
+        self.assertEqual(body['rooms'], {str(room['id']): room for room in RoomListSerializer(rooms, many=True).data})
+        for pk, user in body['users'].items():
+            self.assertEqual(set(user), {'id', 'username', 'full_name', 'email'})
+            self.assertEqual(str(user['id']), pk)
+
+    def test_empty_page(self):
+        window = {'start_date': '2000-01-01', 'end_date': '2000-01-02'}
+        body = self.client.get('/api/bookings/', {'format': 'normalized', **window}).json()
+        self.assertEqual(body, {'next': None, 'bookings': [], 'rooms': {}, 'users': {}})
+
+
+class BookingCreateTests(TestCase):
+    """POST /api/bookings/: error shape and confirmation emails"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.admin = cls.campus['admin']
+        cls.room = cls.campus['rooms'][0]
+        cls.day = timezone.localdate() + timedelta(days=200)
+
+    def create(self, user, start, end, **extra):
+        self.client.force_login(user)
+        return self.client.post('/api/bookings/', {
+            'room': self.room.pk, 'date': str(self.day), 'start_time': start, 'end_time': end, **extra,
+        }, content_type='application/json')
+
+    def test_admin_booking_queues_one_confirmation(self):
+        response = self.create(self.admin, '09:00', '10:00', faculty_email='guest@example.com')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(list(OutboxEmail.objects.values_list('recipients', flat=True)), [['guest@example.com']])
+
+    def test_overlap_error_shape(self):
+        self.create(self.admin, '09:00', '10:00')
+        response = self.create(self.campus['faculty'][0], '09:30', '10:30')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {'non_field_errors': ['This room is already booked for the selected time slot.']}
+        )
+        response = self.create(self.admin, '11:00', '10:00')
+        self.assertEqual(response.json(), {'non_field_errors': ['End time must be after start time.']})
+
+
+class ConcurrentBookingTests(TransactionTestCase):
+    """Many threads racing for the same slots must never double book a room"""
+
+    THREADS = 12
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('needs a file-backed test database shared across threads')
+        block = Block.objects.create(name='X')
+        self.room = Room.objects.create(block=block, room_number='X-001', room_type='Classroom', capacity=40)
+        self.users = [
+            User.objects.create(username=f'user{n}', email=f'user{n}@example.com', role='faculty')
+            for n in range(self.THREADS)
+        ]
+
+    def race(self, slots_for_user):
+        barrier = threading.Barrier(self.THREADS)
+        created, rejected, errors = [], [], []
+
+        def worker(user):
+            try:
+                barrier.wait()
+                for start, end in slots_for_user(user):
+                    try:
+                        created.append(create_booking(user, self.room, date(2030, 1, 7), start, end))
+                    except ValidationError:
+                        rejected.append(user)
+            except Exception as e:  # pragma: no cover - surfaced by the assertion below
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(user,)) for user in self.users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        return created, rejected
+
+    def assertNoOverlaps(self):
+        bookings = list(Booking.objects.filter(room=self.room, status='approved').order_by('start_time'))
+        for earlier, later in zip(bookings, bookings[1:]):
+            self.assertLessEqual(earlier.end_time, later.start_time)
+
+    def test_same_slot_is_booked_once(self):
+        created, rejected = self.race(lambda user: [(time(9), time(10))])
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(len(rejected), self.THREADS - 1)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_every_new_booking_is_checked(self):
+        existing = create_booking(self.users[0], self.room, date(2030, 1, 7), time(9), time(10), approve=True)
+        with self.assertRaises(ValidationError):
+            create_booking(self.users[1], self.room, date(2030, 1, 7), time(9, 30), time(10, 30))
+        Booking.objects.filter(pk=existing.pk).update(status='rejected')
+        create_booking(self.users[1], self.room, date(2030, 1, 7), time(9, 30), time(10, 30))
+
+    def test_overlapping_slots_never_double_book(self):
+        # Every user tries the whole day in staggered, overlapping half-hour steps
+        def slots(user):
+            offset = self.users.index(user) % 2
+            return [(time(h, 30 * offset), time(h + 1, 30 * offset)) for h in range(8, 18)]
+
+        created, rejected = self.race(slots)
+
+        self.assertEqual(len(created) + len(rejected), self.THREADS * 10)
+        self.assertNoOverlaps()
+
+
+class FastPathParityTests(TestCase):
+    """The values() fast path must render byte-identical JSON to BookingSerializer"""
+
+    @classmethod
+    def setUpTestData(cls):
+        block = Block.objects.create(name='Science Block')
+        rooms = [
+            Room.objects.create(block=block, room_number='S-101', room_type='Lab', capacity=30,
+                                features=['Projector', 'AC'], equipment=[{'name': 'PC', 'count': 20}]),
+            Room.objects.create(block=block, room_number='S-102', room_type='Classroom', capacity=60,
+                                is_active=False),
+        ]
+        named = User.objects.create(username='named', email='named@example.com', role='faculty',
+                                    first_name='Ada', last_name='Lovelace')
+        plain = User.objects.create(username='plain', email='plain@example.com', role='student')
+        admin = User.objects.create(username='boss', email='boss@example.com', role='admin', first_name='Bo')
+
+        bookings = [
+            Booking(room=rooms[0], user=named, date=date(2030, 1, 7), start_time=time(9), end_time=time(10),
+                    purpose='Lecture', faculty_email='guest@example.com'),
+            Booking(room=rooms[0], user=plain, date=date(2030, 1, 7), start_time=time(10, 15, 30), end_time=time(11),
+                    status='pending'),
+            Booking(room=rooms[1], user=plain, date=date(2030, 1, 8), start_time=time(13), end_time=time(14),
+                    status='rejected', rejection_reason='Exams', approved_by=admin,
+                    approved_at=timezone.now().replace(microsecond=0)),
+            Booking(room=rooms[1], user=named, date=date(2030, 1, 9), start_time=time(8), end_time=time(9),
+                    approved_by=admin, approved_at=timezone.now()),
+        ]
+        Booking.objects.bulk_create(bookings)
+
+    def render_both(self, **sparse):
+        queryset = Booking.objects.order_by('date', 'start_time', 'id')
+        slow = BookingSerializer(
+            BookingSerializer.optimize_queryset(queryset, **sparse), many=True, **sparse
+        ).data
+        fast = booking_rows(queryset.values(*booking_columns(**sparse)), **sparse)
+        return JSONRenderer().render(slow), JSONRenderer().render(fast)
+
+    def test_all_fields(self):
+        slow, fast = self.render_both()
+        self.assertIn(b'approved_by_name', slow)
+        self.assertEqual(slow, fast)
+
+    def test_sparse_fields(self):
+        for sparse in [
+            {'fields': ['id', 'room', 'date', 'start_time', 'end_time', 'status']},
+            {'fields': ['id', 'room_details', 'approved_by_name']},
+            {'omit': ['room_details', 'user_email']},
+            {'fields': ['user_full_name', 'approved_at'], 'omit': ['approved_at']},
+        ]:
+            with self.subTest(**sparse):
+                slow, fast = self.render_both(**sparse)
+                self.assertEqual(slow, fast)
+
+    def test_list_endpoint_matches_serializer(self):
+        response = self.client.get('/api/bookings/', {'start_date': '2030-01-01', 'end_date': '2030-01-31'})
+        expected = BookingSerializer(Booking.objects.order_by('date', 'start_time', 'id'), many=True).data
+        self.assertEqual(JSONRenderer().render(response.json()['results']), JSONRenderer().render(expected))
+
+
+class BookingQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Every bookings route runs a fixed number of queries, whatever the row count"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.admin = cls.campus['admin']
+        cls.faculty = cls.campus['faculty'][0]
+        cls.room = cls.campus['rooms'][0]
+        cls.series = cls.campus['series']
+        cls.today = timezone.localdate()
+
+    def pending_booking(self):
+        return Booking.objects.filter(status='pending', user=self.faculty).first()
+
+    def test_list(self):
+        response = self.assertQueryBudget(4, '/api/bookings/')
+        self.assertGreater(len(response.json()['results']), 40)
+        self.assertQueryBudget(6, '/api/bookings/', user=self.faculty)
+        self.assertQueryBudget(6, '/api/bookings/?format=normalized')
+        self.assertQueryBudget(6, '/api/bookings/?series=compact')
+        self.assertQueryBudget(4, '/api/bookings/?fields=id,room_details,user_full_name')
+
+    def test_retrieve(self):
+        self.assertQueryBudget(1, f'/api/bookings/{self.pending_booking().pk}/')
+
+    def test_filtered_lists(self):
+        self.assertQueryBudget(4, f'/api/bookings/by_room/?room_id={self.room.pk}')
+        self.assertQueryBudget(4, '/api/bookings/by_date/')
+        self.assertQueryBudget(6, '/api/bookings/my_bookings/', user=self.faculty)
+        self.assertQueryBudget(6, '/api/bookings/pending/', user=self.admin)
+
+    def test_availability(self):
+        self.assertQueryBudget(2, '/api/bookings/availability/')
+        self.assertQueryBudget(2, '/api/bookings/availability/?block=Main&slot=09:00-12:00')
+
+    def test_sync(self):
+        token = self.assertQueryBudget(1, '/api/bookings/sync/').json()['token']
+        Booking.objects.filter(status='pending').update(purpose='Moved', updated_at=timezone.now())
+        BookingTombstone.objects.create(booking_id=10**6, room_id=self.room.pk, date=self.today)
+        response = self.assertQueryBudget(2, f'/api/bookings/sync/?since={token}')
+        self.assertGreater(len(response.json()['changed']), 10)
+
+    def test_create(self):
+        data = {'room': self.room.pk, 'date': str(self.today + timedelta(days=60)),
+                'start_time': '09:00', 'end_time': '10:00', 'purpose': 'Review'}
+        self.assertQueryBudget(20, '/api/bookings/', 'post', self.faculty, data, status=201)
+        data['start_time'], data['end_time'] = '11:00', '12:00'
+        self.assertQueryBudget(18, '/api/bookings/', 'post', self.admin, data, status=201)
+
+    def test_bulk(self):
+        rows = [
+            {'room': room.room_number, 'date': str(self.today + timedelta(days=90 + n)),
+             'start_time': '09:00', 'end_time': '10:00'}
+            for n, room in enumerate(self.campus['rooms'])
+        ]
+        response = self.assertQueryBudget(14, '/api/bookings/bulk/', 'post', self.admin, rows, status=201)
+        self.assertEqual(response.json()['counts'], {'created': 12})
+
+    def test_approve_reject_cancel(self):
+        booking = self.pending_booking()
+        self.assertQueryBudget(18, f'/api/bookings/{booking.pk}/approve/', 'post', self.admin)
+        # Reject, cancel and delete take the room/day lock like approve
+        booking = self.pending_booking()
+        self.assertQueryBudget(13, f'/api/bookings/{booking.pk}/reject/', 'post', self.admin, {'rejection_reason': 'No'})
+        booking = self.pending_booking()
+        self.assertQueryBudget(13, f'/api/bookings/{booking.pk}/cancel/', 'post', self.faculty)
+
+    def test_destroy(self):
+        booking = self.pending_booking()
+        self.assertQueryBudget(16, f'/api/bookings/{booking.pk}/', 'delete', self.admin, status=204)
+
+    def test_series(self):
+        self.assertQueryBudget(3, '/api/bookings/series/', user=self.admin)
+        self.assertQueryBudget(3, f'/api/bookings/series/{self.series.pk}/', user=self.faculty)
+        data = {'room': self.room.pk, 'start_date': str(self.today + timedelta(days=60)),
+                'until': str(self.today + timedelta(days=200)), 'start_time': '07:00', 'end_time': '08:00'}
+        response = self.assertQueryBudget(14, '/api/bookings/series/', 'post', self.faculty, data, status=201)
+        self.assertEqual(response.json()['occurrences'], 21)
+        series_id = response.json()['series']['id']
+        # A faculty member's series waits for approval like any request
+        self.assertEqual(
+            set(Booking.objects.filter(series_id=series_id).values_list('status', 'approved_by')),
+            {('pending', None)},
+        )
+        admin_data = {**data, 'start_time': '18:00', 'end_time': '19:00'}
+        response = self.assertQueryBudget(14, '/api/bookings/series/', 'post', self.admin, admin_data, status=201)
+        self.assertEqual(
+            set(Booking.objects.filter(series_id=response.json()['series']['id']).values_list('status', 'approved_by')),
+            {('approved', self.admin.pk)},
+        )
+        self.assertQueryBudget(13, f'/api/bookings/series/{series_id}/cancel_occurrence/', 'post', self.faculty,
+                               {'date': str(self.today + timedelta(days=60))})
+        self.assertQueryBudget(13, f'/api/bookings/series/{series_id}/cancel/', 'post', self.faculty, {})
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.admin = cls.campus['admin']
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def export(self, **params):
+        response = self.client.get('/api/bookings/export/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        with query_stats() as stats:
+            body = b''.join(response.streaming_content)
+        self.assertEqual(stats.count, 1)
+        return response, body
+
+    @override_settings(BOOKING_EXPORT_CHUNK_SIZE=7)
+    def test_csv(self):
+        response, body = self.export()
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.reader(io.StringIO(body.decode())))
+        self.assertEqual(rows[0][:3], ['Room Number', 'Block', 'Date'])
+        self.assertEqual(len(rows) - 1, Booking.objects.count())
+        self.assertEqual([row[2] for row in rows[1:]], sorted(row[2] for row in rows[1:]))
+
+        _, body = self.export(format='csv', status='pending', block='Science')
+        rows = list(csv.reader(io.StringIO(body.decode())))[1:]
+        self.assertEqual(len(rows), Booking.objects.filter(status='pending', room__block__name='Science').count())
+        self.assertEqual({(row[1], row[9]) for row in rows}, {('Science', 'pending')})
+
+    def test_xlsx(self):
+        Booking.objects.filter(pk=Booking.objects.first().pk).update(purpose='Labs & <tests>\x07')
+        today = timezone.localdate()
+        response, body = self.export(format='xlsx', **{'from': str(today), 'to': str(today + timedelta(days=2))})
+        self.assertEqual(response['Content-Type'], 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        self.assertIn(f'bookings_{today}', response['Content-Disposition'])
+
+        with zipfile.ZipFile(io.BytesIO(body)) as workbook:
+            self.assertIsNone(workbook.testzip())
+            sheet = workbook.read('xl/worksheets/sheet1.xml').decode()
+        expected = Booking.objects.filter(date__gte=today, date__lte=today + timedelta(days=2)).count()
+        self.assertEqual(sheet.count('<row>'), expected + 1)
+
+    def test_rejected_requests(self):
+        self.assertEqual(self.client.get('/api/bookings/export/?from=yesterday').status_code, 400)
+        self.assertEqual(self.client.get('/api/bookings/export/?format=pdf').status_code, 404)
+        self.client.force_login(self.campus['faculty'][0])
+        self.assertEqual(self.client.get('/api/bookings/export/').status_code, 403)
+
+
+class CalendarFeedTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.faculty = cls.campus['faculty'][0]
+        cls.room = cls.campus['rooms'][0]
+
+    def feed_path(self, kind='user', **params):
+        self.client.force_login(self.faculty)
+        links = self.client.get('/api/bookings/calendar/', params).json()
+        return links[kind].replace('http://testserver', '')
+
+    def events(self, body):
+        return body.decode().count('BEGIN:VEVENT')
+
+    def test_user_feed(self):
+        Booking.objects.filter(pk=Booking.objects.exclude(user=self.faculty).first().pk).update(
+            faculty_email=self.faculty.email, status='approved'
+        )
+        path = self.feed_path()
+        response = self.assertQueryBudget(5, path)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = response.content
+        self.assertTrue(body.startswith(b'BEGIN:VCALENDAR\r\n') and body.endswith(b'END:VCALENDAR\r\n'))
+        self.assertEqual(self.events(body), Booking.objects.filter(
+            Q(user=self.faculty) | Q(faculty_email=self.faculty.email), status__in=['approved', 'pending']
+        ).count())
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.decode().split('\r\n')))
+
+    def test_room_feed(self):
+        path = self.feed_path('room', room=self.room.pk)
+        body = self.assertQueryBudget(5, path).content
+        self.assertEqual(self.events(body), Booking.objects.filter(
+            room=self.room, status__in=['approved', 'pending'], date__lte=timezone.localdate() + timedelta(days=365)
+        ).count())
+        self.assertIn(b'LOCATION:R-000\\, Main', body)
+
+    def test_conditional_and_cached(self):
+        path = self.feed_path('room', room=self.room.pk)
+        first = self.assertQueryBudget(5, path)
+        # A warm feed costs only the token's scope and stamp queries
+        self.assertQueryBudget(3, path)
+        self.assertQueryBudget(3, path, HTTP_IF_NONE_MATCH=first['ETag'], status=304)
+
+        booking = Booking.objects.filter(room=self.room, status='approved').first()
+        booking.purpose = 'Moved; to, Friday'
+        booking.save()
+        # Only the changed booking's event is rendered again
+        with mock.patch.object(ical, 'render_event', wraps=ical.render_event) as render_event:
+            changed = self.assertQueryBudget(5, path, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(render_event.call_count, 1)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+        self.assertIn(b'SUMMARY:Moved\\; to\\, Friday', changed.content)
+
+    def test_bad_tokens(self):
+        path = self.feed_path()
+        self.assertQueryBudget(0, path.replace('.ics', 'x.ics'), status=404)
+        self.client.force_login(self.faculty)
+        self.assertEqual(self.client.get('/api/bookings/calendar/?room=999').status_code, 404)
+        self.assertEqual(self.client.post(path).status_code, 405)
+
+    def test_rotation_revokes_feed_urls(self):
+        user_path, room_path = self.feed_path(), self.feed_path('room', room=self.room.pk)
+        links = self.client.post(f'/api/bookings/calendar/?room={self.room.pk}').json()
+        self.assertNotIn(user_path, links['user'])
+        for old in (user_path, room_path):
+            self.assertEqual(self.client.get(old).status_code, 404)
+        for new in links.values():
+            self.assertEqual(self.client.get(new.replace('http://testserver', '')).status_code, 200)
+        # A bad room does not rotate anything
+        self.assertEqual(self.client.post('/api/bookings/calendar/?room=999').status_code, 404)
+        self.assertEqual(self.client.get(links['user'].replace('http://testserver', '')).status_code, 200)
+
+    def test_inactive_owner_and_old_tokens(self):
+        user_path, room_path = self.feed_path(), self.feed_path('room', room=self.room.pk)
+        User.objects.filter(pk=self.faculty.pk).update(is_active=False)
+        for path in (user_path, room_path):
+            self.assertQueryBudget(1, path, status=404)
+        User.objects.filter(pk=self.faculty.pk).update(is_active=True)
+
+        later = time_module.time() + timedelta(days=settings.ICAL_TOKEN_MAX_AGE_DAYS, seconds=1).total_seconds()
+        with mock.patch('django.core.signing.time.time', return_value=later):
+            self.assertQueryBudget(0, user_path, status=404)
+        self.assertEqual(self.client.get(user_path).status_code, 200)
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.admin = cls.campus['admin']
+        cls.faculty = cls.campus['faculty'][0]
+        cls.old_day = months_before(timezone.localdate(), 14)
+        old = Booking.objects.bulk_create([
+            Booking(room=room, user=cls.faculty, date=cls.old_day + timedelta(days=n), start_time=time(9),
+                    end_time=time(11), status='approved' if n % 2 else 'pending')
+            for n, room in enumerate(cls.campus['rooms'][:6])
+        ])
+        record_booking_events(old, 'created')
+        cls.old_ids = sorted(booking.pk for booking in old)
+
+    def rollups(self):
+        return sorted(BookingDailyRollup.objects.values_list('room_id', 'date', 'approved_minutes', 'booking_count'))
+
+    def archive(self, *args):
+        out = io.StringIO()
+        call_command('archive_bookings', *args, stdout=out)
+        return out.getvalue()
+
+    def test_command_moves_old_bookings(self):
+        live, rollups, events = Booking.objects.count(), self.rollups(), BookingEvent.objects.count()
+        self.assertIn('Would archive 6', self.archive('--dry-run'))
+        self.assertEqual(Booking.objects.count(), live)
+
+        self.assertIn('Archived 6 bookings', self.archive('--batch-size', '4'))
+        self.assertEqual(Booking.objects.count(), live - 6)
+        self.assertEqual(sorted(BookingArchive.objects.values_list('id', flat=True)), self.old_ids)
+        self.assertFalse(Booking.objects.filter(date__lt=archive_cutoff()).exists())
+        self.assertEqual(BookingHistory.objects.count(), live)
+        # Archiving is not a change: no sync/stream noise, rollups keep the history
+        self.assertEqual(BookingEvent.objects.count(), events)
+        self.assertFalse(BookingTombstone.objects.exists())
+        self.assertEqual(self.rollups(), rollups)
+        BookingDailyRollup.rebuild()
+        self.assertEqual(self.rollups(), rollups)
+
+        with self.assertRaises(CommandError):
+            self.archive('--months', '1')
+
+    def test_reads_include_archive_only_when_needed(self):
+        self.archive()
+        self.client.force_login(self.faculty)
+        with CaptureQueriesContext(connection) as queries:
+            recent = self.client.get('/api/bookings/').json()['results']
+        self.assertTrue(recent)
+        self.assertFalse(any('bookinghistory' in query['sql'] for query in queries))
+
+        window = {'start_date': str(self.old_day), 'end_date': str(self.old_day + timedelta(days=10))}
+        for path in ['/api/bookings/', '/api/bookings/my_bookings/']:
+            results = self.client.get(path, window).json()['results']
+            self.assertEqual(sorted(row['id'] for row in results), self.old_ids)
+            self.assertEqual(results[0]['room_details']['room_number'], 'R-000')
+        normalized = self.client.get('/api/bookings/', {'format': 'normalized', **window}).json()
+        self.assertEqual(len(normalized['bookings']), 6)
+        by_date = self.client.get('/api/bookings/by_date/', {'date': str(self.old_day)}).json()['results']
+        self.assertEqual([row['id'] for row in by_date], self.old_ids[:1])
+
+        self.client.force_login(self.admin)
+        body = b''.join(self.client.get('/api/bookings/export/').streaming_content)
+        self.assertEqual(len(list(csv.reader(io.StringIO(body.decode())))) - 1, BookingHistory.objects.count())
+        body = b''.join(self.client.get('/api/bookings/export/', {'from': str(timezone.localdate())}).streaming_content)
+        self.assertNotIn(str(self.old_day), body.decode())
@@ -3,6 +3,11 @@ from rest_framework.routers import DefaultRouter
 from . import views
 
 router = DefaultRouter()
+# Registered before the bookings themselves so 'series/' is not read as a booking id
+router.register(r'series', views.BookingSeriesViewSet, basename='booking-series')
 router.register(r'', views.BookingViewSet, basename='booking')
 
-urlpatterns = router.urls
+urlpatterns = [
+    path('stream/', views.booking_event_stream, name='booking-stream'),
+    path('calendar/<str:token>.ics', views.booking_calendar_feed, name='booking-calendar-feed'),
+] + router.urls
@@ -1,11 +1,40 @@
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_safe
 from django.utils import timezone
-from .models import Booking
+from datetime import datetime, timedelta
+from notifications.outbox import enqueue_email
+from room_booking_system.conditional import conditional_response, make_etag
+from room_booking_system.serializers import sparse_fields
+from rooms.models import CatalogVersion, Room
+from .models import Booking, BookingSeries, BookingTombstone, RoomDayLock
+from .archive import booking_source
+from .bulk import import_bookings, read_rows
+from .events import pending_frames, stream_events
+from .fastpath import booking_columns, booking_rows
+from .pagination import BookingCursorPagination
+from .services import cancel_series, cancel_series_occurrence, create_booking, create_series
+from .sync import InvalidSyncToken, changes_since, make_sync_token, read_sync_token, token_expired
+from .availability import availability_matrix, parse_slot, ALL_DAY
+from . import export, ical
+from .renderers import CSVRenderer, NormalizedJSONRenderer, XLSXRenderer
 from .serializers import (
+    EMBEDDED_FIELDS,
+    sideload,
     BookingSerializer,
+    BookingSeriesSerializer,
+    BookingSeriesCreateSerializer,
     BookingCreateSerializer,
     BookingApprovalSerializer,
     BookingRejectionSerializer
@@ -15,9 +44,11 @@ from .serializers import (
 class BookingViewSet(viewsets.ModelViewSet):
     """API endpoint for managing bookings"""
     queryset = Booking.objects.all()
+    pagination_class = BookingCursorPagination
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [NormalizedJSONRenderer]
     
     def get_permissions(self):
-        if self.action in ['list', 'retrieve', 'by_room', 'by_date']:
+        if self.action in ['list', 'retrieve', 'by_room', 'by_date', 'availability', 'sync']:
             return [AllowAny()]
         return [IsAuthenticated()]
     
@@ -29,17 +60,23 @@ class BookingViewSet(viewsets.ModelViewSet):
         elif self.action == 'reject':
             return BookingRejectionSerializer
         return BookingSerializer
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action == 'retrieve':
+            kwargs.update(sparse_fields(self.request))
+        return super().get_serializer(*args, **kwargs)
     
     def get_queryset(self):
-        queryset = Booking.objects.all().select_related('room', 'user', 'approved_by').order_by('-created_at')
+        model = self.booking_source() if self.action == 'list' else Booking
+        queryset = model.objects.all().select_related('room__block', 'user', 'approved_by').order_by('-created_at')
         
         # Filter by room
-        room_id = self.request.query_params.get('room', None)
-        if room_id:
+        room_id = self.parse_int_param('room')
+        if room_id is not None:
             queryset = queryset.filter(room_id=room_id)
         
         # Filter by date
-        date = self.request.query_params.get('date', None)
+        date = self.parse_date_param('date')
         if date:
             queryset = queryset.filter(date=date)
         
@@ -51,17 +88,143 @@ class BookingViewSet(viewsets.ModelViewSet):
         # Filter by user (my bookings)
         if self.request.query_params.get('my_bookings', None) == 'true':
             if self.request.user.is_authenticated:
-                from django.db.models import Q
                 queryset = queryset.filter(
                     Q(user=self.request.user) | Q(faculty_email=self.request.user.email)
                 )
         
         return queryset
+
+    def parse_date_param(self, name):
+        value = self.request.query_params.get(name, None)
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise ValidationError({name: 'Date must be in YYYY-MM-DD format'})
+
+    def parse_int_param(self, name):
+        value = self.request.query_params.get(name, None)
+        if not value:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({name: 'Must be an integer'})
+
+    def get_date_window(self):
+        """The (start_date, end_date) range a list request covers, inclusive.
+
+        Missing bounds default to a window around today so that clients
+        polling the list never download the whole booking history.
+        An explicit ``date`` filter is a one-day window of its own.
+        """
+        start_date = self.parse_date_param('start_date')
+        end_date = self.parse_date_param('end_date')
+
+        if not (start_date or end_date):
+            day = self.parse_date_param('date')
+            if day:
+                return day, day
+
+        today = timezone.now().date()
+        if start_date is None:
+            start_date = (end_date or today) - timedelta(days=settings.BOOKING_LIST_PAST_DAYS)
+        if end_date is None:
+            end_date = start_date + timedelta(days=settings.BOOKING_LIST_PAST_DAYS + settings.BOOKING_LIST_FUTURE_DAYS)
+        if start_date > end_date:
+            raise ValidationError({'end_date': 'end_date must not be before start_date'})
+        return start_date, end_date
+
+    def booking_source(self):
+        """Booking, or the history view if the date window reaches archived bookings"""
+        return booking_source(self.get_date_window()[0])
+
+    def filter_date_window(self, queryset):
+        """Restrict a list queryset to the request's date window"""
+        start_date, end_date = self.get_date_window()
+        return queryset.filter(date__gte=start_date, date__lte=end_date)
+
+    def list_validators(self, queryset, *extra):
+        """(etag, last_modified) of a list from cheap version stamps.
+
+        Any insert or update moves max(updated_at), a delete changes the
+        count and the latest tombstone, and room edits move the catalog
+        version (room details are embedded in each booking).
+        """
+        stamp = queryset.order_by().aggregate(last=Max('updated_at'), count=Count('id'))
+        deleted = BookingTombstone.objects.order_by('-id').values_list('id', 'deleted_at').first() or (None, None)
+        catalog = CatalogVersion.current()
+        etag = make_etag(
+            stamp['last'], stamp['count'], deleted[0], catalog,
+            self.request.user.pk, self.request.get_full_path(), *extra
+        )
+        last_modified = max((t for t in (stamp['last'], deleted[1]) if t), default=None)
+        return etag, last_modified
+
+    def page_response(self, queryset):
+        # ?fields= / ?omit= narrow both the payload and the query
+        sparse = sparse_fields(self.request)
+        normalized = getattr(self.request.accepted_renderer, 'format', None) == NormalizedJSONRenderer.format
+        always = list(self.paginator.ordering)
+        if normalized:
+            sparse['omit'] = (sparse['omit'] or []) + EMBEDDED_FIELDS
+            always += ['room', 'user', 'approved_by']
+
+        if not normalized:
+            # Plain JSON skips the serializer; see bookings.fastpath
+            page = self.paginate_queryset(queryset.values(*booking_columns(always=always, **sparse)))
+            return self.get_paginated_response(booking_rows(page, **sparse))
+
+        queryset = BookingSerializer.optimize_queryset(queryset, always=always, **sparse)
+        page = self.paginate_queryset(queryset)
+        serializer = BookingSerializer(page, many=True, **sparse)
+
+        # ?format=normalized: bookings carry ids, each room/user is sent once
+        rooms, users = sideload(page)
+        return Response({
+            'next': self.paginator.get_next_link(),
+            'bookings': serializer.data,
+            'rooms': rooms,
+            'users': users,
+        })
+
+    def paginated_response(self, queryset):
+        """A page of bookings, or 304 if the client's copy is current"""
+        etag, last_modified = self.list_validators(queryset)
+        return conditional_response(self.request, etag, last_modified, lambda: self.page_response(queryset))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_date_window(self.get_queryset())
+
+        # ?series=compact returns each recurring series once instead of
+        # one row per occurrence
+        compact = request.query_params.get('series', None) == 'compact'
+        if not compact:
+            return self.paginated_response(queryset)
+
+        queryset = queryset.filter(series__isnull=True)
+        start_date, end_date = self.get_date_window()
+        series = BookingSeries.objects.filter(
+            start_date__lte=end_date,
+            until__gte=start_date,
+            status='active',
+        ).select_related('room', 'user')
+        room_id = self.parse_int_param('room')
+        if room_id is not None:
+            series = series.filter(room_id=room_id)
+
+        def build():
+            response = self.page_response(queryset)
+            if not request.query_params.get(self.paginator.cursor_query_param):
+                response.data['series'] = BookingSeriesSerializer(series, many=True).data
+            return response
+
+        series_stamp = series.order_by().aggregate(last=Max('updated_at'), count=Count('id'))
+        etag, last_modified = self.list_validators(queryset, series_stamp['last'], series_stamp['count'])
+        return conditional_response(request, etag, last_modified, build)
     
     def perform_create(self, serializer):
-        from django.contrib.auth import get_user_model
-        from rest_framework.exceptions import ValidationError
-        
         print(f"DEBUG: perform_create request.data: {self.request.data}")
         faculty_email = serializer.validated_data.get('faculty_email', None)
         print(f"DEBUG: perform_create called. faculty_email={faculty_email}")
@@ -69,46 +232,22 @@ class BookingViewSet(viewsets.ModelViewSet):
         # Admin can provide any faculty email for notifications/overrides
         # We don't strictly require the user to be registered in the system
         # to allow booking for external faculty or guest accounts via Admin panel.
-        pass
-        
-        # 'faculty_email' is now a model field, so we DO NOT pop it. serializer.save() will handle it.
+        # 'faculty_email' is a model field, so it is passed straight through.
 
-        booking = serializer.save(user=self.request.user)
-        
-        # Approve immediately since Admin is creating it
-        if self.request.user.role == 'admin':
-            print("DEBUG: User is admin, approving booking immediately.")
-            booking.status = 'approved'
-            booking.approved_by = self.request.user
-            booking.approved_at = timezone.now()
-            booking.save()
-            
-            # Use faculty_email if provided, otherwise user's email
-            recipient_email = booking.faculty_email if booking.faculty_email else self.request.user.email
-            print(f"DEBUG: Sending confirmation email to {recipient_email}")
-            
-            # Send confirmation email
-            from django.core.mail import send_mail
-            try:
-                sent_count = send_mail(
-                    'Room Booking Confirmation',
-                    f'Your booking for Room {booking.room.room_number} on {booking.date} from {booking.start_time} to {booking.end_time} has been confirmed.',
-                    'noreply@roomsync.com',
-                    [recipient_email],
-                    fail_silently=False, # Change to False to see errors
-                )
-                print(f"DEBUG: Email sent successfully. Count: {sent_count}")
-            except Exception as e:
-                print(f"DEBUG: Failed to send email: {e}")
-                import traceback
-                traceback.print_exc()
+        # Approve immediately (in the same write) when an Admin is creating it;
+        # saving an approved booking queues its confirmation email
+        try:
+            booking = create_booking(
+                self.request.user,
+                approve=self.request.user.role == 'admin',
+                **serializer.validated_data
+            )
+        except DjangoValidationError as e:
+            raise ValidationError({'non_field_errors': e.messages})
+        serializer.instance = booking
 
     def perform_destroy(self, instance):
-        """Send email before deleting/cancelling the booking"""
-        from django.core.mail import send_mail
-        
-        print(f"DEBUG: perform_destroy called for booking {instance.id}")
-        
+        """Queue the cancellation email and delete the booking in one transaction"""
         # Get recipient email (stored faculty_email or User's email)
         recipient_email = instance.faculty_email if instance.faculty_email else instance.user.email
         
@@ -121,21 +260,10 @@ class BookingViewSet(viewsets.ModelViewSet):
             "Regards,\nRoomSync Admin"
         )
         
-        try:
-            print(f"DEBUG: Sending cancellation email to {recipient_email}")
-            send_mail(
-                subject,
-                message,
-                'noreply@roomsync.com',
-                [recipient_email],
-                fail_silently=False,
-            )
-            print("DEBUG: Cancellation email sent.")
-        except Exception as e:
-            print(f"DEBUG: Failed to send cancellation email: {e}")
-        
-        # Proceed with deletion
-        instance.delete()
+        with transaction.atomic():
+            RoomDayLock.acquire(instance.room_id, instance.date)
+            enqueue_email(subject, message, [recipient_email], 'noreply@roomsync.com')
+            instance.delete()
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def pending(self, request):
@@ -146,10 +274,44 @@ class BookingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        pending_bookings = Booking.objects.filter(status='pending').select_related('room', 'user').order_by('date', 'start_time')
-        serializer = BookingSerializer(pending_bookings, many=True)
-        return Response(serializer.data)
+        pending_bookings = Booking.objects.filter(status='pending').select_related('room', 'user')
+        return self.paginated_response(self.filter_date_window(pending_bookings))
     
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def bulk(self, request):
+        """Import many approved bookings from a CSV/JSON upload or a JSON list (admin only)"""
+        if request.user.role != 'admin':
+            return Response(
+                {'error': 'Only admins can import bookings'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        upload = request.FILES.get('file', None)
+        try:
+            if upload:
+                rows = read_rows(upload, upload.name)
+            elif isinstance(request.data, list):
+                rows = request.data
+            else:
+                rows = request.data.get('bookings', [])
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({'error': f'Could not read file: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            return Response({'error': 'Expected a list of bookings'}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get('dry_run', None) == 'true'
+        report = import_bookings(rows, request.user, dry_run=dry_run)
+        counts = {}
+        for row in report:
+            counts[row['status']] = counts.get(row['status'], 0) + 1
+
+        return Response({
+            'dry_run': dry_run,
+            'counts': counts,
+            'rows': report,
+        }, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def approve(self, request, pk=None):
         """Approve a pending booking (admin/faculty only)"""
@@ -174,6 +336,11 @@ class BookingViewSet(viewsets.ModelViewSet):
                 'message': 'Booking approved successfully',
                 'booking': serializer.data
             })
+        except DjangoValidationError as e:
+            return Response(
+                {'error': ' '.join(e.messages)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -214,42 +381,168 @@ class BookingViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def by_room(self, request):
         """Get bookings for a specific room"""
-        room_id = request.query_params.get('room_id', None)
-        date = request.query_params.get('date', None)
+        room_id = self.parse_int_param('room_id')
+        date = self.parse_date_param('date')
         
-        if not room_id:
+        if room_id is None:
             return Response(
                 {'error': 'room_id parameter is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        queryset = Booking.objects.filter(room_id=room_id)
+        queryset = self.booking_source().objects.filter(room_id=room_id)
         
         if date:
             queryset = queryset.filter(date=date)
         
-        serializer = BookingSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(self.filter_date_window(queryset))
     
     @action(detail=False, methods=['get'])
     def by_date(self, request):
         """Get all bookings for a specific date"""
+        # Default to today
+        date = self.parse_date_param('date') or timezone.now().date()
+        queryset = booking_source(date).objects.filter(date=date)
+        return self.paginated_response(queryset)
+    
+    @action(detail=False, methods=['get'])
+    def availability(self, request):
+        """Get the status of every active room for a date, optionally per block and slot"""
         date = request.query_params.get('date', None)
-        
-        if not date:
-            # Default to today
+        block = request.query_params.get('block', None)
+        slot_param = request.query_params.get('slot', ALL_DAY)
+
+        if date:
+            try:
+                date = datetime.strptime(date, '%Y-%m-%d').date()
+            except ValueError:
+                return Response(
+                    {'error': 'date must be in YYYY-MM-DD format'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
             date = timezone.now().date()
-        
-        queryset = Booking.objects.filter(date=date)
-        serializer = BookingSerializer(queryset, many=True)
-        return Response(serializer.data)
-    
+
+        try:
+            slot = parse_slot(slot_param)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'date': date,
+            'block': block,
+            'slot': slot_param or ALL_DAY,
+            'rooms': availability_matrix(date, block=block, slot=slot),
+        })
+
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        """Incremental sync: bookings changed or deleted since a previous token.
+
+        Without ``since`` (or with an expired token) a full snapshot of the
+        current date window is returned with ``reset: true``.
+        """
+        token = make_sync_token(timezone.now())
+        since = request.query_params.get('since', None)
+        queryset = Booking.objects.select_related('room__block', 'user', 'approved_by')
+
+        if since:
+            try:
+                since = read_sync_token(since)
+            except InvalidSyncToken as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not since or token_expired(since):
+            snapshot = self.booking_source().objects.select_related('room__block', 'user', 'approved_by')
+            bookings = self.filter_date_window(snapshot).order_by('date', 'start_time', 'id')
+            return Response({
+                'token': token,
+                'reset': True,
+                'changed': BookingSerializer(bookings, many=True).data,
+                'deleted': [],
+            })
+
+        changed, deleted = changes_since(queryset, since)
+        return Response({
+            'token': token,
+            'reset': False,
+            'changed': BookingSerializer(changed.order_by('updated_at', 'id'), many=True).data,
+            'deleted': deleted,
+        })
+
+    @action(detail=False, methods=['get', 'post'], permission_classes=[IsAuthenticated])
+    def calendar(self, request):
+        """Signed .ics feed URLs: the current user's, and a room's with ?room=.
+
+        POST first revokes every feed URL the user was handed before.
+        """
+        room_id = request.query_params.get('room', None)
+        if room_id and (not room_id.isdigit() or not Room.objects.filter(pk=room_id).exists()):
+            return Response({'error': 'Room not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        user = request.user
+        if request.method == 'POST':
+            user.feed_token_version += 1
+            user.save(update_fields=['feed_token_version'])
+
+        def feed_url(kind, pk):
+            token = ical.make_feed_token(kind, pk, user)
+            return request.build_absolute_uri(reverse('booking-calendar-feed', args=[token]))
+
+        links = {'user': feed_url('user', user.pk)}
+        if room_id:
+            links['room'] = feed_url('room', int(room_id))
+        return Response(links)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated],
+            renderer_classes=[CSVRenderer, XLSXRenderer])
+    def export(self, request):
+        """Stream bookings as CSV or XLSX (admin only).
+
+        Query params: format (csv or xlsx), from/to (YYYY-MM-DD, both
+        optional), status and block. Rows are streamed in date order.
+        """
+        if request.user.role != 'admin':
+            return Response({'error': 'Only admins can export bookings'}, status=status.HTTP_403_FORBIDDEN)
+
+        params = request.query_params
+        try:
+            start, end = (
+                datetime.strptime(params[key], '%Y-%m-%d').date() if params.get(key) else None
+                for key in ('from', 'to')
+            )
+        except ValueError:
+            return Response({'error': 'from/to must be dates in YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = booking_source(start).objects.order_by('date', 'start_time', 'id')
+        if start:
+            queryset = queryset.filter(date__gte=start)
+        if end:
+            queryset = queryset.filter(date__lte=end)
+        if params.get('status'):
+            queryset = queryset.filter(status=params['status'])
+        if params.get('block'):
+            queryset = queryset.filter(room__block__name=params['block'])
+
+        fmt = request.accepted_renderer.format
+        rows = export.export_rows(queryset, settings.BOOKING_EXPORT_CHUNK_SIZE)
+        if fmt == 'xlsx':
+            chunks, content_type = export.xlsx_chunks(rows), XLSXRenderer.media_type
+        else:
+            chunks, content_type = export.csv_chunks(rows), 'text/csv; charset=utf-8'
+        if 'wsgi.version' not in request.META:
+            chunks = export.iterate_async(chunks)
+
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        name = '_'.join(['bookings'] + [params[key] for key in ('from', 'to') if params.get(key)])
+        response['Content-Disposition'] = f'attachment; filename="{name}.{fmt}"'
+        response['Cache-Control'] = 'no-store'
+        return response
+
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_bookings(self, request):
         """Get current user's bookings"""
-        queryset = Booking.objects.filter(user=request.user).order_by('-date')
-        serializer = BookingSerializer(queryset, many=True)
-        return Response(serializer.data)
+        queryset = self.booking_source().objects.filter(user=request.user)
+        return self.paginated_response(self.filter_date_window(queryset))
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def cancel(self, request, pk=None):
@@ -275,3 +568,139 @@ class BookingViewSet(viewsets.ModelViewSet):
             'booking': serializer.data
         })
 
+
+class BookingSeriesViewSet(mixins.CreateModelMixin,
+                           mixins.ListModelMixin,
+                           mixins.RetrieveModelMixin,
+                           viewsets.GenericViewSet):
+    """API endpoint for recurring bookings"""
+    permission_classes = [IsAuthenticated]
+
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return BookingSeriesCreateSerializer
+        return BookingSeriesSerializer
+
+    def get_queryset(self):
+        queryset = BookingSeries.objects.select_related('room', 'user')
+        user = self.request.user
+        if user.role != 'admin':
+            queryset = queryset.filter(Q(user=user) | Q(faculty_email=user.email))
+        return queryset
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        skip_conflicts = data.pop('skip_conflicts', False)
+
+        try:
+            series, occurrences = create_series(
+                BookingSeries(user=request.user, **data),
+                approve=request.user.role == 'admin',
+                skip_conflicts=skip_conflicts,
+            )
+        except DjangoValidationError as e:
+            raise ValidationError(e.messages)
+
+        return Response({
+            'message': f'Series created with {len(occurrences)} bookings',
+            'series': BookingSeriesSerializer(series).data,
+            'occurrences': len(occurrences),
+        }, status=status.HTTP_201_CREATED)
+
+    def check_owner(self, series):
+        if series.user_id != self.request.user.id and self.request.user.role != 'admin':
+            return Response(
+                {'error': 'You can only cancel your own bookings'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return None
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        """Cancel a series, or with from_date only its later occurrences"""
+        series = self.get_object()
+        denied = self.check_owner(series)
+        if denied:
+            return denied
+
+        from_date = request.data.get('from_date', None)
+        if from_date:
+            try:
+                from_date = datetime.strptime(from_date, '%Y-%m-%d').date()
+            except ValueError:
+                return Response({'error': 'from_date must be in YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cancelled = cancel_series(series, from_date)
+        return Response({
+            'message': f'{len(cancelled)} bookings cancelled',
+            'series': BookingSeriesSerializer(series).data,
+        })
+
+    @action(detail=True, methods=['post'])
+    def cancel_occurrence(self, request, pk=None):
+        """Cancel one occurrence of a series"""
+        series = self.get_object()
+        denied = self.check_owner(series)
+        if denied:
+            return denied
+
+        try:
+            day = datetime.strptime(request.data.get('date', ''), '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            return Response({'error': 'date must be in YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cancelled = cancel_series_occurrence(series, day)
+        return Response({
+            'message': f'{len(cancelled)} bookings cancelled',
+            'series': BookingSeriesSerializer(series).data,
+        })
+
+
+@require_safe
+def booking_calendar_feed(request, token):
+    """iCalendar feed of a user's or a room's bookings, addressed by a signed token"""
+    try:
+        kind, pk, owner_id, version = ical.read_feed_token(token)
+    except ical.InvalidFeedToken as e:
+        return JsonResponse({'error': str(e)}, status=404)
+
+    scope = ical.feed_scope(kind, pk, owner_id, version)
+    if scope is None:
+        return JsonResponse({'error': 'Calendar not found'}, status=404)
+    bookings, name = scope
+
+    parts, last_modified = ical.feed_stamp(bookings)
+    etag = make_etag('ical', kind, pk, name, *parts)
+
+    def build():
+        body = ical.cached_feed(etag, lambda: ical.render_feed(bookings, kind, name))
+        response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = f'inline; filename="roomsync-{kind}-{pk}.ics"'
+        return response
+
+    return conditional_response(request, etag, last_modified, build)
+
+
+async def booking_event_stream(request):
+    """Server-sent events feed of booking changes, filterable by room and date"""
+    room = request.GET.get('room', None)
+    date = request.GET.get('date', None)
+    last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id', None)
+
+    try:
+        last_id = int(last_id) if last_id else None
+    except ValueError:
+        return JsonResponse({'error': 'Invalid Last-Event-ID'}, status=400)
+
+    if 'wsgi.version' in request.META:
+        # Plain WSGI workers cannot hold a stream open without blocking
+        frames = await sync_to_async(pending_frames)(last_id, room, date)
+        response = StreamingHttpResponse(frames, content_type='text/event-stream')
+    else:
+        response = StreamingHttpResponse(stream_events(last_id, room, date), content_type='text/event-stream')
+
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from notifications.models import OutboxEmail
+from notifications.outbox import deliver_batch
+
+
+class Command(BaseCommand):
+    help = 'Delivers queued emails from the outbox in batches over one mail connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the due emails once and exit')
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument('--interval', type=float, default=settings.OUTBOX_POLL_SECONDS,
+                            help='Seconds to sleep when the outbox is empty')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, unsent = deliver_batch(options['batch_size'])
+            if sent or unsent:
+                self.stdout.write(f'Sent: {sent}, Not sent: {unsent}')
+                continue
+
+            if options['once']:
+                pending = OutboxEmail.objects.filter(status='pending').count()
+                self.stdout.write(self.style.SUCCESS(f'Outbox drained, {pending} waiting for retry'))
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+def enqueue_email(subject, body, recipients, from_email=None):
+    """Queue one email; it is sent only if the surrounding transaction commits"""
+    return enqueue_emails([(subject, body, recipients, from_email)])[0]
+
+
+def enqueue_emails(messages):
+    """Queue many (subject, body, recipients[, from_email]) tuples with one INSERT"""
+    rows = []
+    for subject, body, recipients, *rest in messages:
+        recipients = [r for r in recipients if r]
+        if not recipients:
+            continue
+        rows.append(OutboxEmail(
+            subject=subject[:255],
+            body=body,
+            recipients=recipients,
+            from_email=(rest[0] if rest and rest[0] else settings.DEFAULT_FROM_EMAIL),
+        ))
+    return OutboxEmail.objects.bulk_create(rows)
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2*base, 4*base, ... capped at one day"""
+    return timedelta(seconds=min(settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), 86400))
+
+
+def claim_batch(batch_size):
+    """Lease up to ``batch_size`` due emails to this worker.
+
+    Claimed rows get ``next_attempt_at`` pushed past the lease, so other
+    workers skip them; if this worker dies they become due again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = OutboxEmail.objects.filter(status='pending', next_attempt_at__lte=now).order_by('id')
+        if db_connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        batch = list(due[:batch_size])
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+            next_attempt_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+        )
+    return batch
+
+
+def deliver_batch(batch_size=None, connection=None):
+    """Send one batch of due emails over a single mail connection.
+
+    Messages are sent one at a time on the open connection so a rejected
+    recipient only fails its own row. Failed rows are retried with
+    exponential backoff until OUTBOX_MAX_ATTEMPTS, then marked failed.
+    Returns (sent, unsent) counts for the batch.
+    """
+    batch = claim_batch(batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not batch:
+        return 0, 0
+
+    sent, retry = [], []
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # Nothing could be sent; every row counts as one failed attempt
+        for email in batch:
+            email.last_error = str(e)
+            retry.append(email)
+    else:
+        with connection:
+            for email in batch:
+                message = EmailMessage(email.subject, email.body, email.from_email, email.recipients)
+                try:
+                    connection.send_messages([message])
+                    sent.append(email)
+                except Exception as e:
+                    email.last_error = str(e)
+                    retry.append(email)
+
+    now = timezone.now()
+    for email in retry:
+        email.attempts += 1
+        if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            email.status = 'failed'
+        else:
+            email.next_attempt_at = now + retry_delay(email.attempts)
+
+    with transaction.atomic():
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in sent]).update(
+            status='sent', sent_at=now, attempts=F('attempts') + 1, last_error=''
+        )
+        OutboxEmail.objects.bulk_update(retry, ['status', 'attempts', 'next_attempt_at', 'last_error'])
+
+    return len(sent), len(retry)
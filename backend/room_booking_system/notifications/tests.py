@@ -0,0 +1,108 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase
+from django.utils import timezone
+
+from . import outbox
+from .models import OutboxEmail
+
+
+class FlakyBackend(EmailBackend):
+    """Rejects every message to a bad@ address; can also fail to connect"""
+
+    def __init__(self, *args, fail_open=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_open = fail_open
+
+    def open(self):
+        if self.fail_open:
+            raise ConnectionRefusedError('SMTP server down')
+        return super().open()
+
+    def send_messages(self, messages):
+        if any(address.startswith('bad@') for message in messages for address in message.to):
+            raise ValueError('Recipient rejected')
+        return super().send_messages(messages)
+
+
+class OutboxTests(TestCase):
+    """Leases, retries with backoff and giving up in the outbox worker"""
+
+    def enqueue(self, *recipients):
+        emails = outbox.enqueue_emails([('Hello', 'Body', [recipient]) for recipient in recipients])
+        self.now = timezone.now()  # the worker's clock, once they are due
+        return emails
+
+    def at(self, moment):
+        return mock.patch.object(outbox.timezone, 'now', return_value=moment)
+
+    def deliver(self, moment=None, **backend):
+        with self.at(moment or self.now):
+            return outbox.deliver_batch(connection=FlakyBackend(**backend))
+
+    def test_enqueue_skips_empty_recipients(self):
+        emails = outbox.enqueue_emails([('A', 'Body', ['a@example.com', '']), ('B', 'Body', [None])])
+        self.assertEqual(len(emails), 1)
+        self.assertEqual(OutboxEmail.objects.get().recipients, ['a@example.com'])
+        self.assertEqual(OutboxEmail.objects.get().from_email, settings.DEFAULT_FROM_EMAIL)
+
+    def test_claims_are_leased_until_they_expire(self):
+        first, second, third = self.enqueue('a@example.com', 'b@example.com', 'c@example.com')
+        with self.at(self.now):
+            self.assertEqual([email.pk for email in outbox.claim_batch(2)], [first.pk, second.pk])
+            # Leased rows are skipped by other workers
+            self.assertEqual([email.pk for email in outbox.claim_batch(10)], [third.pk])
+            self.assertEqual(outbox.claim_batch(10), [])
+
+        # A worker that died mid-batch: its rows come back once the lease ends
+        expired = self.now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS + 1)
+        with self.at(expired):
+            self.assertEqual(len(outbox.claim_batch(10)), 3)
+
+    def test_failed_sends_are_retried_with_backoff(self):
+        good, bad = self.enqueue('good@example.com', 'bad@example.com')
+        self.assertEqual(self.deliver(), (1, 1))
+        self.assertEqual([message.to for message in mail.outbox], [['good@example.com']])
+
+        good.refresh_from_db()
+        bad.refresh_from_db()
+        self.assertEqual((good.status, good.attempts, good.sent_at), ('sent', 1, self.now))
+        self.assertEqual((bad.status, bad.attempts, bad.last_error), ('pending', 1, 'Recipient rejected'))
+        base = settings.OUTBOX_RETRY_BASE_SECONDS
+        self.assertEqual(bad.next_attempt_at, self.now + timedelta(seconds=base))
+
+        # Not due before the backoff has passed, then the delay doubles
+        self.assertEqual(self.deliver(self.now + timedelta(seconds=base - 1)), (0, 0))
+        retry_at = self.now + timedelta(seconds=base)
+        self.assertEqual(self.deliver(retry_at), (0, 1))
+        bad.refresh_from_db()
+        self.assertEqual(bad.attempts, 2)
+        self.assertEqual(bad.next_attempt_at, retry_at + timedelta(seconds=2 * base))
+
+    def test_gives_up_after_max_attempts(self):
+        email, = self.enqueue('bad@example.com')
+        moment = self.now
+        for attempt in range(1, settings.OUTBOX_MAX_ATTEMPTS + 1):
+            self.assertEqual(self.deliver(moment), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual(email.attempts, attempt)
+            moment = email.next_attempt_at
+        self.assertEqual(email.status, 'failed')
+        self.assertEqual(self.deliver(moment + timedelta(days=2)), (0, 0))
+
+    def test_connection_failure_counts_for_every_row(self):
+        self.enqueue('a@example.com', 'b@example.com')
+        self.assertEqual(self.deliver(fail_open=True), (0, 2))
+        self.assertEqual(
+            set(OutboxEmail.objects.values_list('status', 'attempts', 'last_error')),
+            {('pending', 1, 'SMTP server down')},
+        )
+        self.assertEqual(mail.outbox, [])
+
+    def test_backoff_is_capped(self):
+        self.assertEqual(outbox.retry_delay(1), timedelta(seconds=settings.OUTBOX_RETRY_BASE_SECONDS))
+        self.assertEqual(outbox.retry_delay(40), timedelta(days=1))
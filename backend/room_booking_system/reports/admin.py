@@ -1,3 +1,17 @@
 from django.contrib import admin
+from .models import BookingDailyRollup
 
-# Register your models here.
+
+@admin.register(BookingDailyRollup)
+class BookingDailyRollupAdmin(admin.ModelAdmin):
+    """Read-only view of the rollup table; rebuild it with `manage.py rebuild_rollups`"""
+    list_display = ('room', 'date', 'approved_minutes', 'pending_count', 'booking_count')
+    list_filter = ('room__block',)
+    date_hierarchy = 'date'
+    list_select_related = ('room',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
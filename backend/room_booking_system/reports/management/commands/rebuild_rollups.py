@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from reports.models import BookingDailyRollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the daily booking rollups from the bookings table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', help='First date to rebuild (YYYY-MM-DD), default: all')
+        parser.add_argument('--to', dest='end', help='Last date to rebuild (YYYY-MM-DD), default: all')
+
+    def handle(self, *args, **options):
+        try:
+            start, end = (
+                datetime.strptime(options[name], '%Y-%m-%d').date() if options[name] else None
+                for name in ('start', 'end')
+            )
+        except ValueError:
+            raise CommandError('--from and --to must be dates in YYYY-MM-DD format')
+
+        rows = BookingDailyRollup.rebuild(start, end)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} room/day rollups'))
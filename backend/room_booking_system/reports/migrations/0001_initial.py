@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_rollups(apps, schema_editor):
+    Booking = apps.get_model('bookings', 'Booking')
+    BookingDailyRollup = apps.get_model('reports', 'BookingDailyRollup')
+
+    totals = {}
+    rows = Booking.objects.order_by().values_list('room_id', 'date', 'start_time', 'end_time', 'status')
+    for room_id, day, start, end, status in rows.iterator(chunk_size=5000):
+        entry = totals.setdefault((room_id, day), [0, 0, 0])
+        if status == 'approved':
+            entry[0] += (end.hour * 3600 + end.minute * 60 + end.second
+                         - start.hour * 3600 - start.minute * 60 - start.second) // 60
+        elif status == 'pending':
+            entry[1] += 1
+        entry[2] += 1
+
+    BookingDailyRollup.objects.bulk_create([
+        BookingDailyRollup(room_id=room_id, date=day, approved_minutes=minutes, pending_count=pending, booking_count=count)
+        for (room_id, day), (minutes, pending, count) in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('bookings', '0010_booking_series'),
+        ('rooms', '0004_catalog_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('approved_minutes', models.PositiveIntegerField(default=0)),
+                ('pending_count', models.PositiveIntegerField(default=0)),
+                ('booking_count', models.PositiveIntegerField(default=0)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='rooms.room')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date', 'room'], name='rollup_date_room_idx')],
+                'constraints': [models.UniqueConstraint(fields=('room', 'date'), name='rollup_room_date_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
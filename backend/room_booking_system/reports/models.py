@@ -1,3 +1,108 @@
-from django.db import models
+from functools import reduce
+from operator import or_
 
-# Create your models here.
+from django.db import models, transaction
+
+
+def minutes_between(start, end):
+    """Whole minutes from ``start`` to ``end``, two times of the same day"""
+    return ((end.hour - start.hour) * 3600 + (end.minute - start.minute) * 60 + end.second - start.second) // 60
+
+
+class BookingDailyRollup(models.Model):
+    """Booking totals of one room on one day, kept in step with Booking.
+
+    ``approved_minutes`` sums approved bookings only, ``pending_count``
+    counts bookings awaiting approval and ``booking_count`` counts every
+    booking whatever its status. Room/days without bookings have no row.
+    """
+    room = models.ForeignKey('rooms.Room', on_delete=models.CASCADE, related_name='daily_rollups')
+    date = models.DateField()
+    approved_minutes = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
+    booking_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['room', 'date'], name='rollup_room_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'room'], name='rollup_date_room_idx'),
+        ]
+
+    def __str__(self):
+        return f"Room {self.room_id} on {self.date}: {self.approved_minutes} min"
+
+    @staticmethod
+    def totals(rows):
+        """Fold (room_id, date, start_time, end_time, status) rows into per room/day totals"""
+        totals = {}
+        for room_id, day, start, end, status in rows:
+            entry = totals.setdefault((room_id, day), [0, 0, 0])
+            if status == 'approved':
+                entry[0] += minutes_between(start, end)
+            elif status == 'pending':
+                entry[1] += 1
+            entry[2] += 1
+        return totals
+
+    @classmethod
+    def write(cls, totals):
+        """Upsert rollup rows for the given {(room_id, date): [minutes, pending, count]}"""
+        cls.objects.bulk_create(
+            [
+                cls(room_id=room_id, date=day, approved_minutes=minutes, pending_count=pending, booking_count=count)
+                for (room_id, day), (minutes, pending, count) in totals.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['room', 'date'],
+            update_fields=['approved_minutes', 'pending_count', 'booking_count'],
+            batch_size=1000,
+        )
+
+    @classmethod
+    def refresh(cls, keys):
+        """Recompute the rows of the given (room_id, date) pairs from their bookings.
+
+        Only the bookings of those room/days are read, so a single save
+        costs one small SELECT and one upsert (or delete). Days old enough
+        to have archived bookings are read from the history view.
+        """
+        from bookings.archive import booking_source
+
+        keys = set(keys)
+        if not keys:
+            return
+        rows = booking_source(min(day for _, day in keys)).objects.filter(
+            room_id__in={room_id for room_id, _ in keys},
+            date__in={day for _, day in keys},
+        ).values_list('room_id', 'date', 'start_time', 'end_time', 'status')
+        totals = {key: value for key, value in cls.totals(rows).items() if key in keys}
+
+        empty = sorted(keys - totals.keys())
+        for i in range(0, len(empty), 200):
+            cls.objects.filter(reduce(or_, (
+                models.Q(room_id=room_id, date=day) for room_id, day in empty[i:i + 200]
+            ))).delete()
+        if totals:
+            cls.write(totals)
+
+    @classmethod
+    def rebuild(cls, start=None, end=None):
+        """Recompute every row, or those dated within [start, end], from scratch"""
+        from bookings.archive import booking_source
+
+        bookings = booking_source(start).objects.order_by()
+        rollups = cls.objects.all()
+        if start:
+            bookings, rollups = bookings.filter(date__gte=start), rollups.filter(date__gte=start)
+        if end:
+            bookings, rollups = bookings.filter(date__lte=end), rollups.filter(date__lte=end)
+
+        totals = cls.totals(
+            bookings.values_list('room_id', 'date', 'start_time', 'end_time', 'status').iterator(chunk_size=5000)
+        )
+        with transaction.atomic():
+            rollups.delete()
+            cls.write(totals)
+        return len(totals)
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bookings.models import Booking
+from bookings.signals import bookings_changed
+from .models import BookingDailyRollup
+
+
+@receiver(post_save, sender=Booking)
+def refresh_rollup_on_save(sender, instance, **kwargs):
+    keys = {(instance.room_id, instance.date)}
+    # A booking moved to another room or day also changes its old rollup row
+    loaded = getattr(instance, '_loaded_slot', None)
+    if loaded and None not in loaded:
+        keys.add(loaded)
+    BookingDailyRollup.refresh(keys)
+    instance._loaded_slot = (instance.room_id, instance.date)
+
+
+@receiver(post_delete, sender=Booking)
+def refresh_rollup_on_delete(sender, instance, **kwargs):
+    BookingDailyRollup.refresh({(instance.room_id, instance.date)})
+
+
+@receiver(bookings_changed)
+def refresh_rollups(sender, bookings, **kwargs):
+    BookingDailyRollup.refresh((booking.room_id, booking.date) for booking in bookings)
@@ -1,3 +1,176 @@
+from datetime import time, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+
+from bookings.bulk import import_bookings
+from bookings.models import Booking, BookingSeries, RoomDayLock
+from bookings.services import cancel_series, create_booking, create_series
+from room_booking_system.testing import QueryBudgetMixin, seed_campus
+from .models import BookingDailyRollup
+
+
+def rollup_rows():
+    return sorted(BookingDailyRollup.objects.values_list(
+        'room_id', 'date', 'approved_minutes', 'pending_count', 'booking_count'
+    ))
+
+
+class RollupMaintenanceTests(TestCase):
+    """Rollups kept up to date on every write must match a full rebuild"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.admin = cls.campus['admin']
+        cls.faculty = cls.campus['faculty'][0]
+        cls.rooms = cls.campus['rooms']
+        cls.today = timezone.localdate()
+
+    def assertMatchesRebuild(self):
+        incremental = rollup_rows()
+        BookingDailyRollup.rebuild()
+        self.assertEqual(incremental, rollup_rows())
+
+    def test_seeded_data(self):
+        self.assertTrue(rollup_rows())
+        self.assertMatchesRebuild()
+
+    def test_single_writes(self):
+        day = self.today + timedelta(days=40)
+        booking = create_booking(self.faculty, self.rooms[1], day, time(9), time(10, 30))
+        self.assertEqual(
+            BookingDailyRollup.objects.values_list('approved_minutes', 'booking_count').get(room=self.rooms[1], date=day),
+            (90, 1),
+        )
+
+        pending = Booking.objects.filter(status='pending').first()
+        pending.approve(self.admin)
+        Booking.objects.filter(status='pending').first().reject(self.admin, 'No')
+        Booking.objects.filter(status='approved').first().cancel()
+
+        # Moving a booking updates both its old and its new room/day
+        booking.room, booking.date = self.rooms[2], day + timedelta(days=1)
+        booking.save()
+        self.assertFalse(BookingDailyRollup.objects.filter(room=self.rooms[1], date=day).exists())
+
+        Booking.objects.filter(status='rejected').first().delete()
+        self.assertMatchesRebuild()
+
+    def test_status_changes_lock_the_day(self):
+        # The rollup of a room/day is only recomputed while its lock is held
+        calls = []
+        acquire, acquire_many, refresh = RoomDayLock.acquire, RoomDayLock.acquire_many, BookingDailyRollup.refresh
+
+        def record_acquire(room_id, day):
+            calls.append(('lock', {(room_id, day)}))
+            return acquire(room_id, day)
+
+        def record_acquire_many(keys):
+            keys = set(keys)  # may be a generator
+            calls.append(('lock', keys))
+            return acquire_many(keys)
+
+        def record_refresh(keys):
+            keys = set(keys)
+            calls.append(('refresh', keys))
+            return refresh(keys)
+
+        for model, name, record in [
+            (RoomDayLock, 'acquire', record_acquire),
+            (RoomDayLock, 'acquire_many', record_acquire_many),
+            (BookingDailyRollup, 'refresh', record_refresh),
+        ]:
+            patch = mock.patch.object(model, name, side_effect=record)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        def assertLockedFirst(change):
+            calls.clear()
+            change()
+            refreshed = set().union(*(keys for kind, keys in calls if kind == 'refresh'))
+            self.assertTrue(refreshed)
+            self.assertEqual(calls[0], ('lock', refreshed))
+
+        assertLockedFirst(lambda: Booking.objects.filter(status='pending').first().reject(self.admin, 'No'))
+        assertLockedFirst(lambda: Booking.objects.filter(status='approved').first().cancel())
+        self.client.force_login(self.admin)
+        assertLockedFirst(lambda: self.client.delete(f"/api/bookings/{Booking.objects.values_list('pk', flat=True)[0]}/"))
+        series = Booking.objects.exclude(series=None).values_list('series', flat=True).first()
+        assertLockedFirst(lambda: cancel_series(BookingSeries.objects.get(pk=series)))
+        self.assertMatchesRebuild()
+
+    def test_bulk_writes(self):
+        start = self.today + timedelta(days=50)
+        series, _ = create_series(BookingSeries(
+            room=self.rooms[3], user=self.faculty, start_date=start, until=start + timedelta(days=28),
+            start_time=time(12), end_time=time(13),
+        ))
+        import_bookings([
+            {'room': room.room_number, 'date': str(start + timedelta(days=n)), 'start_time': '08:00', 'end_time': '09:00'}
+            for n, room in enumerate(self.rooms)
+        ], self.admin)
+        self.assertMatchesRebuild()
+
+        cancel_series(series, from_date=start + timedelta(days=14))
+        self.assertMatchesRebuild()
+
+    def test_room_delete_drops_rollups(self):
+        self.rooms[0].delete()
+        self.assertFalse(BookingDailyRollup.objects.filter(room_id=self.rooms[0].pk).exists())
+        self.assertMatchesRebuild()
+
+    def test_rebuild_command(self):
+        expected = rollup_rows()
+        BookingDailyRollup.objects.all().delete()
+        call_command('rebuild_rollups', stdout=StringIO())
+        self.assertEqual(rollup_rows(), expected)
+
+
+class UtilizationApiTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.admin = cls.campus['admin']
+        cls.today = timezone.localdate()
+        cls.range = {'from': str(cls.today), 'to': str(cls.today + timedelta(days=9))}
+
+    def get(self, budget, **params):
+        return self.assertQueryBudget(budget, '/api/reports/utilization/', user=self.admin, data={**self.range, **params}).json()
+
+    def test_per_room(self):
+        results = self.get(4)['results']
+        self.assertEqual(len(results), 12)
+
+        room = self.campus['rooms'][0]
+        row = next(r for r in results if r['id'] == room.pk)
+        minutes = sum(
+            (b.end_time.hour - b.start_time.hour) * 60
+            for b in Booking.objects.filter(room=room, status='approved', date__lte=self.today + timedelta(days=9))
+        )
+        self.assertEqual(row['approved_minutes'], minutes)
+        self.assertEqual(row['available_minutes'], 10 * 480)
+        self.assertEqual(row['utilization'], round(minutes / 4800, 4))
+
+    def test_groups_add_up(self):
+        per_room = self.get(4)['results']
+        total = sum(r['approved_minutes'] for r in per_room)
+        for group in ('block', 'type', 'day'):
+            with self.subTest(group=group):
+                results = self.get(4, group=group)['results']
+                self.assertEqual(sum(r['approved_minutes'] for r in results), total)
+                self.assertEqual(sum(r['booking_count'] for r in results), sum(r['booking_count'] for r in per_room))
+        blocks = self.get(4, group='block')['results']
+        self.assertEqual([(b['block__name'], b['rooms']) for b in blocks], [('Library', 4), ('Main', 4), ('Science', 4)])
 
-# Create your tests here.
+    def test_filters_and_errors(self):
+        self.assertEqual(len(self.get(4, block='Main', type='Classroom')['results']), 4)
+        room = self.campus['rooms'][0]
+        self.assertEqual([r['id'] for r in self.get(4, room=room.pk)['results']], [room.pk])
+        self.assertQueryBudget(2, '/api/reports/utilization/', user=self.campus['faculty'][0], status=403)
+        self.assertQueryBudget(2, '/api/reports/utilization/?group=user', user=self.admin, status=400)
+        self.assertQueryBudget(2, '/api/reports/utilization/?from=2030-01-02&to=2030-01-01', user=self.admin, status=400)
+        self.assertQueryBudget(2, '/api/reports/utilization/?room=R-000', user=self.admin, status=400)
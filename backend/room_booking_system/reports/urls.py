@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('utilization/', views.utilization_view, name='utilization'),
+]
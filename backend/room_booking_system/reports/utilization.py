@@ -0,0 +1,46 @@
+from django.db.models import Count, Sum
+
+from .models import BookingDailyRollup
+
+# group -> (room columns of each result row, the one rows are keyed by,
+# the matching rollup column)
+GROUPS = {
+    'room': (['room_number', 'id', 'block__name', 'room_type', 'capacity'], 'id', 'room_id'),
+    'block': (['block__name'], 'block__name', 'room__block__name'),
+    'type': (['room_type'], 'room_type', 'room__room_type'),
+}
+TOTALS = ('approved_minutes', 'pending_count', 'booking_count')
+
+
+def with_ratio(row, rooms, days, day_minutes):
+    available = rooms * days * day_minutes
+    row['available_minutes'] = available
+    row['utilization'] = round(row['approved_minutes'] / available, 4) if available else 0.0
+    return row
+
+
+def utilization(rooms, start_date, end_date, group='room', day_minutes=480):
+    """Approved minutes against opening minutes for ``rooms`` over [start, end].
+
+    Sums come from BookingDailyRollup alone, in one grouped query over the
+    rollup rows of the range (at most rooms x days, usually far fewer), plus
+    one query for the rooms themselves. ``group`` is room, block, type or day.
+    """
+    days = (end_date - start_date).days + 1
+    rollups = BookingDailyRollup.objects.filter(room__in=rooms, date__gte=start_date, date__lte=end_date)
+    sums = {name: Sum(name) for name in TOTALS}
+
+    if group == 'day':
+        room_count = rooms.count()
+        rows = rollups.values('date').annotate(**sums).order_by('date')
+        return [with_ratio(row, room_count, 1, day_minutes) for row in rows]
+
+    fields, row_key, rollup_key = GROUPS[group]
+    totals = {row.pop(rollup_key): row for row in rollups.values(rollup_key).annotate(**sums).order_by()}
+    empty = dict.fromkeys(TOTALS, 0)
+
+    results = []
+    for row in rooms.order_by(fields[0]).values(*fields).annotate(rooms=Count('id')):
+        row.update(totals.get(row[row_key], empty))
+        results.append(with_ratio(row, row['rooms'], days, day_minutes))
+    return results
@@ -1,3 +1,60 @@
-from django.shortcuts import render
+from datetime import datetime, timedelta
 
-# Create your views here.
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from rooms.models import Room
+from .utilization import GROUPS, utilization
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def utilization_view(request):
+    """Room utilization over a date range (Admin only).
+
+    Query params: from/to (YYYY-MM-DD, default the last 30 days),
+    group (room, block, type or day), block, type and room filters.
+    """
+    if request.user.role != 'admin':
+        return Response({'error': 'Only admins can view reports'}, status=status.HTTP_403_FORBIDDEN)
+
+    params = request.query_params
+    group = params.get('group', 'room')
+    if group not in GROUPS and group != 'day':
+        return Response({'error': 'group must be room, block, type or day'}, status=status.HTTP_400_BAD_REQUEST)
+
+    today = timezone.localdate()
+    try:
+        end_date = datetime.strptime(params['to'], '%Y-%m-%d').date() if params.get('to') else today
+        start_date = datetime.strptime(params['from'], '%Y-%m-%d').date() if params.get('from') else end_date - timedelta(days=29)
+        room_id = int(params['room']) if params.get('room') else None
+    except ValueError:
+        return Response(
+            {'error': 'from/to must be dates in YYYY-MM-DD format and room an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if start_date > end_date or (end_date - start_date).days >= settings.REPORTS_MAX_DAYS:
+        return Response(
+            {'error': f'to must be on or after from, at most {settings.REPORTS_MAX_DAYS} days later'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    rooms = Room.objects.all()
+    if params.get('block'):
+        rooms = rooms.filter(block__name=params['block'])
+    if params.get('type'):
+        rooms = rooms.filter(room_type=params['type'])
+    if room_id is not None:
+        rooms = rooms.filter(pk=room_id)
+
+    return Response({
+        'from': start_date,
+        'to': end_date,
+        'group': group,
+        'day_minutes': settings.REPORTS_DAY_MINUTES,
+        'results': utilization(rooms, start_date, end_date, group, settings.REPORTS_DAY_MINUTES),
+    })
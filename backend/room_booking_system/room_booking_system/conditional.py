@@ -0,0 +1,33 @@
+"""Conditional GET support (ETag / Last-Modified) for cheap polling.
+
+Views compute a validator from a few version stamps, and
+``conditional_response`` answers a matching If-None-Match or
+If-Modified-Since with 304 before the response body is built.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """A strong ETag for the given version stamps and request scope"""
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def conditional_response(request, etag, last_modified, build):
+    """Return 304 if the client is up to date, else build() with validators.
+
+    ``last_modified`` is a datetime or None; ``build`` returns the full
+    response and is only called when the client's copy is stale.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = build()
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+    # Let browsers keep the copy but revalidate it on every poll
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
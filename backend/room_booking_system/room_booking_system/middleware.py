@@ -0,0 +1,59 @@
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+
+class QueryStats:
+    """Number of queries run and time spent in the database, in seconds"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+@contextmanager
+def query_stats():
+    """Count the queries run on every database connection inside the block.
+
+        with query_stats() as stats:
+            ...
+        stats.count, stats.seconds
+    """
+    stats = QueryStats()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        yield stats
+
+
+class QueryCountMiddleware:
+    """Add X-Query-Count and X-DB-Time-Ms headers to every response.
+
+    Only active when QUERY_COUNT_HEADERS is set (it follows DEBUG by
+    default). Queries run while a streaming response is consumed are not
+    included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'QUERY_COUNT_HEADERS', settings.DEBUG)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        with query_stats() as stats:
+            response = self.get_response(request)
+        response['X-Query-Count'] = str(stats.count)
+        response['X-DB-Time-Ms'] = f'{stats.seconds * 1000:.1f}'
+        return response
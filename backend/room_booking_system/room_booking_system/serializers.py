@@ -0,0 +1,61 @@
+"""Serializer helpers shared by the apps."""
+
+
+def parse_field_list(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def sparse_fields(request):
+    """The ?fields= / ?omit= params of a request as serializer kwargs"""
+    return {
+        'fields': parse_field_list(request.query_params.get('fields')) or None,
+        'omit': parse_field_list(request.query_params.get('omit')) or None,
+    }
+
+
+class DynamicFieldsMixin:
+    """Lets a ModelSerializer be narrowed with ``fields=[...]`` / ``omit=[...]``.
+
+    Unknown names are ignored. ``field_sources`` maps serializer fields to
+    the model paths they read (``'room_details': ['room__room_number', ...]``);
+    fields not listed read the model field of the same name. It drives
+    ``optimize_queryset``, which loads only those columns and joins.
+    """
+    field_sources = {}
+
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+    @classmethod
+    def selected_fields(cls, fields=None, omit=None):
+        names = list(cls.Meta.fields)
+        if fields:
+            names = [name for name in names if name in fields]
+        return [name for name in names if name not in (omit or ())]
+
+    @classmethod
+    def source_paths(cls, fields=None, omit=None):
+        """Model paths read by the selected fields"""
+        paths = set()
+        for name in cls.selected_fields(fields, omit):
+            paths.update(cls.field_sources.get(name, [name]))
+        return paths
+
+    @classmethod
+    def optimize_queryset(cls, queryset, fields=None, omit=None, always=()):
+        """Restrict ``queryset`` to the columns and joins the selected fields read.
+
+        ``always`` lists extra model fields the caller needs (e.g. the
+        pagination keys).
+        """
+        paths = cls.source_paths(fields, omit) | set(always)
+        related = {path.rsplit('__', 1)[0] for path in paths if '__' in path}
+        queryset = queryset.select_related(None)
+        if related:  # select_related() without arguments would follow every FK
+            queryset = queryset.select_related(*related)
+        return queryset.only(queryset.model._meta.pk.name, *paths)
@@ -33,7 +33,10 @@ CSRF_TRUSTED_ORIGINS = os.environ.get('CSRF_TRUSTED_ORIGINS', 'http://localhost:
 CSRF_TRUSTED_ORIGINS.extend(['https://roomsyncc-1.onrender.com', 'https://room-syncc.vercel.app'])
 CSRF_TRUSTED_ORIGINS = list(set([o for o in CSRF_TRUSTED_ORIGINS if o]))
 
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Set EMAIL_BACKEND=django.core.mail.backends.filebased.EmailBackend (with
+# EMAIL_FILE_PATH) or ...console.EmailBackend to try the outbox worker locally
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = os.environ.get('EMAIL_FILE_PATH', str(BASE_DIR / 'sent_emails'))
 EMAIL_HOST = 'smtp.gmail.com'  # or smtp.office365.com for Outlook
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -57,16 +60,19 @@ INSTALLED_APPS = [
     'users',
     'bookings',
     'support',
+    'notifications',
+    'reports',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'room_booking_system.middleware.QueryCountMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -110,10 +116,64 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                # Take the write lock when a transaction starts, so
+                # concurrent booking writers queue up instead of deadlocking
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+            # A file (not in-memory) test database lets the concurrency
+            # tests open one connection per thread
+            'TEST': {
+                'NAME': BASE_DIR / 'test_db.sqlite3',
+            },
         }
     }
 
 
+# Per-process memory cache by default. Set CACHE_BACKEND to
+# django.core.cache.backends.filebased.FileBasedCache or ...db.DatabaseCache
+# (with CACHE_LOCATION) to share entries between workers without Redis.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'roomsync'),
+    },
+    # Sessions and logged-in users. A file cache by default, so every
+    # worker on the host sees logouts and user changes at once. It lives
+    # in the project (created 0700), not a shared temp dir other local
+    # users could read or plant files in.
+    'sessions': {
+        'BACKEND': os.environ.get('SESSION_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('SESSION_CACHE_LOCATION', str(BASE_DIR / 'cache' / 'sessions')),
+    },
+}
+
+# Swaps every cache above for a memory cache while tests run, so they
+# never clear the sessions of a local development server
+TEST_RUNNER = 'room_booking_system.testing.TestRunner'
+
+# Where sessions live: db (a django_session query per request), cache
+# (sessions cache only; lost if it is cleared) or cached_db (reads from
+# the cache, writes through to the database)
+SESSION_CACHE_MODE = os.environ.get('SESSION_CACHE_MODE', 'cached_db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+}[SESSION_CACHE_MODE]
+SESSION_CACHE_ALIAS = 'sessions'
+
+# How long users.middleware reuses a logged-in user without a users_user
+# query; 0 loads the user from the database on every request
+AUTH_USER_CACHE_SECONDS = int(os.environ.get('AUTH_USER_CACHE_SECONDS', '300'))
+
+# Lifetimes of the signed tokens issued by login with "tokens": true
+# (users.tokens). Role changes reach readers within the access lifetime
+# at worst, when the revocation entry in the sessions cache is lost.
+ACCESS_TOKEN_SECONDS = int(os.environ.get('ACCESS_TOKEN_SECONDS', '900'))
+REFRESH_TOKEN_SECONDS = int(os.environ.get('REFRESH_TOKEN_SECONDS', str(7 * 24 * 3600)))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -188,6 +248,10 @@ CORS_ALLOWED_ORIGINS = list(set([o for o in CORS_ALLOWED_ORIGINS if o]))
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Per-request query count and DB time headers (room_booking_system.middleware)
+QUERY_COUNT_HEADERS = os.environ.get('QUERY_COUNT_HEADERS', str(DEBUG)) == 'True'
+CORS_EXPOSE_HEADERS = ['X-Query-Count', 'X-DB-Time-Ms']
+
 # CSRF & Session Cookie Settings for Cross-Origin (Vercel -> Render)
 # Only enable these in production (when not in DEBUG mode)
 if not DEBUG:
@@ -201,8 +265,64 @@ if not DEBUG:
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
+        'users.authentication.SignedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
 }
+
+# Default date window (in days around today) applied to booking list
+# endpoints when the client does not pass start_date/end_date
+BOOKING_LIST_PAST_DAYS = int(os.environ.get('BOOKING_LIST_PAST_DAYS', '30'))
+BOOKING_LIST_FUTURE_DAYS = int(os.environ.get('BOOKING_LIST_FUTURE_DAYS', '90'))
+
+# Rows fetched per round trip by the streaming /api/bookings/export/
+BOOKING_EXPORT_CHUNK_SIZE = int(os.environ.get('BOOKING_EXPORT_CHUNK_SIZE', '2000'))
+
+# Upper bound on the occurrences a single recurring booking series may expand to
+BOOKING_SERIES_MAX_OCCURRENCES = 200
+
+# How long delete tombstones are kept; sync tokens older than this get a full resync
+BOOKING_SYNC_RETENTION_DAYS = int(os.environ.get('BOOKING_SYNC_RETENTION_DAYS', '7'))
+
+# How far behind its token a sync delta re-reads. Timestamps are taken
+# before commit, so a write that commits after a token was cut can carry
+# an earlier time; it is still reported if its transaction took less
+# than this.
+BOOKING_SYNC_OVERLAP_SECONDS = int(os.environ.get('BOOKING_SYNC_OVERLAP_SECONDS', '60'))
+
+# Bookings dated before the first of the month this many months ago may be
+# moved to the archive (manage.py archive_bookings); reads reaching further
+# back than that also query the archive
+BOOKING_ARCHIVE_AFTER_MONTHS = int(os.environ.get('BOOKING_ARCHIVE_AFTER_MONTHS', '12'))
+
+# Date window (in days around today) of the .ics calendar feeds
+ICAL_PAST_DAYS = int(os.environ.get('ICAL_PAST_DAYS', '30'))
+ICAL_FUTURE_DAYS = int(os.environ.get('ICAL_FUTURE_DAYS', '365'))
+# Feed URLs stop working this many days after they were handed out;
+# GET /api/bookings/calendar/ hands out fresh ones
+ICAL_TOKEN_MAX_AGE_DAYS = int(os.environ.get('ICAL_TOKEN_MAX_AGE_DAYS', '365'))
+
+# Live booking event stream (/api/bookings/stream/, served over ASGI)
+BOOKING_STREAM_POLL_SECONDS = float(os.environ.get('BOOKING_STREAM_POLL_SECONDS', '1'))
+BOOKING_STREAM_HEARTBEAT_SECONDS = 15
+BOOKING_STREAM_MAX_SECONDS = 300  # clients reconnect with Last-Event-ID
+BOOKING_STREAM_RETRY_MS = int(os.environ.get('BOOKING_STREAM_RETRY_MS', '3000'))
+BOOKING_STREAM_QUEUE_SIZE = 1000
+BOOKING_STREAM_FALLBACK_RETRY_MS = 30000  # reconnect interval when served over WSGI
+# How long readers wait for a missing lower event id to commit before
+# taking it for a rolled-back write and reading past it
+BOOKING_STREAM_GAP_SECONDS = float(os.environ.get('BOOKING_STREAM_GAP_SECONDS', '5'))
+
+# Email outbox, drained by `python manage.py send_outbox`
+OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', '50'))
+OUTBOX_POLL_SECONDS = float(os.environ.get('OUTBOX_POLL_SECONDS', '5'))
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_RETRY_BASE_SECONDS = 60  # doubled after every failed attempt
+OUTBOX_LEASE_SECONDS = 300  # a claimed batch is retried if its worker dies
+
+# Utilization reports (/api/reports/): opening minutes per room and day that
+# booked minutes are measured against, and the longest range one report covers
+REPORTS_DAY_MINUTES = int(os.environ.get('REPORTS_DAY_MINUTES', '480'))
+REPORTS_MAX_DAYS = 731
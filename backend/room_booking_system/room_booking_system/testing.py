@@ -0,0 +1,127 @@
+"""Shared fixtures for the per-app query budget tests"""
+from datetime import time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from django.utils import timezone
+
+from .middleware import query_stats
+
+
+class TestRunner(DiscoverRunner):
+    """Runs the tests against per-process memory caches.
+
+    The sessions cache is a file cache in the project by default; tests
+    clear it, which would log out every local session and empty the
+    token deny-list of the development server.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._caches = override_settings(CACHES={
+            alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'test-{alias}'}
+            for alias in settings.CACHES
+        })
+        self._caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._caches.disable()
+        super().teardown_test_environment(**kwargs)
+
+
+def seed_campus():
+    """A small but realistic campus: blocks, rooms, users and bookings.
+
+    Every list has enough rows that a per-row query would blow any of
+    the budgets. Returns a dict of the created objects.
+    """
+    from bookings.models import Booking, BookingSeries
+    from bookings.services import create_series
+    from bookings.signals import record_booking_events
+    from rooms.models import Block, Room
+    from support.models import SupportMessage
+    from users.models import User
+
+    admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role='admin', first_name='Ada')
+    faculty = [
+        User.objects.create_user(f'faculty{n}', f'faculty{n}@example.com', 'pw', role='faculty', last_name=f'F{n}')
+        for n in range(4)
+    ]
+
+    blocks = [Block.objects.create(name=name) for name in ('Main', 'Science', 'Library')]
+    rooms = []
+    for n in range(12):
+        rooms.append(Room.objects.create(
+            block=blocks[n % 3],
+            room_number=f'R-{n:03d}',
+            room_type=('Classroom', 'Lab', 'Seminar')[n % 3],
+            capacity=20 + 10 * (n % 5),
+            features=['Projector', 'AC'] if n % 2 else ['Whiteboard'],
+            equipment=[{'name': 'PC', 'count': n}] if n % 3 == 1 else [],
+        ))
+
+    today = timezone.localdate()
+    bookings = []
+    for n in range(48):
+        user = faculty[n % 4]
+        status = ('approved', 'pending', 'rejected')[n % 3]
+        bookings.append(Booking(
+            room=rooms[n % 12],
+            user=user,
+            date=today + timedelta(days=n % 6),
+            start_time=time(8 + n // 12),
+            end_time=time(9 + n // 12),
+            purpose=f'Lecture {n}',
+            faculty_email=f'guest{n}@example.com' if n % 5 == 0 else None,
+            status=status,
+            approved_by=admin if status != 'pending' else None,
+            approved_at=timezone.now() if status != 'pending' else None,
+        ))
+    # bulk_create skips post_save, so publish the writes like the bulk import does
+    record_booking_events(Booking.objects.bulk_create(bookings), 'created')
+
+    series, _ = create_series(BookingSeries(
+        room=rooms[0], user=faculty[0], start_date=today + timedelta(days=7),
+        until=today + timedelta(days=35), start_time=time(16), end_time=time(17),
+        purpose='Weekly seminar',
+    ), approve=True)
+
+    SupportMessage.objects.bulk_create([
+        SupportMessage(name=f'Sender {n}', email=f'sender{n}@example.com', message='Help',
+                       user=faculty[n % 4] if n % 2 else None)
+        for n in range(15)
+    ])
+
+    return {'admin': admin, 'faculty': faculty, 'blocks': blocks, 'rooms': rooms, 'series': series}
+
+
+class QueryBudgetMixin:
+    """TestCase mixin that requests a URL and checks how many queries it ran.
+
+    Budgets are upper bounds that include the session and user lookups of
+    an authenticated request. The (test runner's memory) caches are
+    cleared before every test so cached endpoints and users are measured
+    cold.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        caches[settings.SESSION_CACHE_ALIAS].clear()
+
+    def assertQueryBudget(self, budget, path, method='get', user=None, data=None, status=200, **extra):
+        self.client.logout()
+        if user is not None:
+            self.client.force_login(user)
+        if data is not None and method != 'get':
+            extra.setdefault('content_type', 'application/json')
+        with query_stats() as stats:
+            response = getattr(self.client, method)(path, data, **extra)
+        self.assertEqual(response.status_code, status, getattr(response, 'content', b'')[:500])
+        self.assertLessEqual(
+            stats.count, budget,
+            f'{method.upper()} {path} ran {stats.count} queries, budget is {budget}'
+        )
+        return response
@@ -26,6 +26,7 @@ urlpatterns = [
     path('api/auth/', include('users.urls')),
     path('api/users/', include('users.urls')),
     path('api/support/', include('support.urls')),
+    path('api/reports/', include('reports.urls')),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,33 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+
+from .models import CatalogVersion
+
+
+# Entries are keyed by catalog version, so they never need deleting;
+# the timeout only bounds how long superseded versions linger
+TIMEOUT = 24 * 60 * 60
+
+
+def params_key(params):
+    """A short, memcached-safe digest of a QueryDict, ignoring param order"""
+    canonical = urlencode(sorted(params.lists()), doseq=True)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def cached_catalog(name, build, current=None):
+    """Return build() for ``name``, cached until the next Room/Block change.
+
+    ``current`` is a (version, updated_at) pair the caller already read.
+    """
+    version, updated_at = current or CatalogVersion.current()
+    # updated_at guards against a counter that restarted (e.g. a reset database)
+    stamp = updated_at.timestamp() if updated_at else 0
+    key = f'rooms:v{version}:{stamp}:{name}'
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, TIMEOUT)
+    return data
@@ -0,0 +1,290 @@
+"""Bulk import of the room catalog from CSV, JSON or XLSX files.
+
+Rows are read lazily and applied in batches: one SELECT of the batch's
+existing rooms, then one ``bulk_create(update_conflicts=True)`` upsert of
+the rooms that are new or differ, so the cost per row is a fraction of a
+query and memory stays flat whatever the file size. Only the room
+numbers seen so far are kept between batches (to find duplicates and,
+with ``deactivate_missing``, the rooms the file no longer lists; a room
+named by an invalid row still counts as listed).
+
+Plain ``.json`` files are parsed whole; use JSON Lines (``.jsonl``) or
+CSV for inventories too big for that.
+"""
+import csv
+import json
+import zipfile
+from itertools import islice
+from xml.etree import ElementTree
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .models import Block, CatalogVersion, Room, RoomTag
+
+ROOM_TYPES = {value for value, _ in Room._meta.get_field('room_type').choices}
+UPDATE_FIELDS = ['block', 'room_type', 'capacity', 'features', 'equipment', 'is_active']
+TRUE_VALUES = {'true', '1', 'yes', 'y'}
+FALSE_VALUES = {'false', '0', 'no', 'n'}
+
+_XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
+def column_index(reference):
+    """0-based column of a cell reference such as 'C12'"""
+    index = 0
+    for char in reference:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - ord('A') + 1
+    return index - 1
+
+
+def xlsx_cell(cell, strings):
+    kind = cell.get('t')
+    if kind == 'inlineStr':
+        return ''.join(text.text or '' for text in cell.iter(f'{_XLSX_NS}t'))
+    value = cell.find(f'{_XLSX_NS}v')
+    value = value.text if value is not None else ''
+    if kind == 's':
+        return strings[int(value)]
+    if kind == 'b':
+        return value == '1'
+    return value or ''
+
+
+def xlsx_rows(path):
+    """Rows of the first sheet of a workbook as dicts keyed by the header row"""
+    with zipfile.ZipFile(path) as workbook:
+        strings = []
+        if 'xl/sharedStrings.xml' in workbook.namelist():
+            with workbook.open('xl/sharedStrings.xml') as f:
+                for _, element in ElementTree.iterparse(f):
+                    if element.tag == f'{_XLSX_NS}si':
+                        strings.append(''.join(text.text or '' for text in element.iter(f'{_XLSX_NS}t')))
+                        element.clear()
+
+        header = None
+        with workbook.open('xl/worksheets/sheet1.xml') as f:
+            for _, element in ElementTree.iterparse(f):
+                if element.tag != f'{_XLSX_NS}row':
+                    continue
+                cells = {}
+                for cell in element.iter(f'{_XLSX_NS}c'):
+                    reference = cell.get('r')
+                    cells[column_index(reference) if reference else len(cells)] = xlsx_cell(cell, strings)
+                element.clear()
+                values = [cells.get(i, '') for i in range(max(cells) + 1)] if cells else []
+                if header is None:
+                    header = [str(value).strip() for value in values]
+                elif any(value != '' for value in values):
+                    yield dict(zip(header, values))
+
+
+def read_rows(path):
+    """Lazily yield raw room rows (dicts) from a .csv, .json, .jsonl or .xlsx file"""
+    name = str(path).lower()
+    if name.endswith('.xlsx'):
+        yield from xlsx_rows(path)
+    elif name.endswith(('.jsonl', '.ndjson')):
+        with open(path, encoding='utf-8-sig') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif name.endswith('.json'):
+        with open(path, encoding='utf-8-sig') as f:
+            data = json.load(f)
+        yield from data.get('rooms', []) if isinstance(data, dict) else data
+    elif name.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            yield from csv.DictReader(f)
+    else:
+        raise ValueError('Room files must be .csv, .json, .jsonl or .xlsx')
+
+
+def parse_list(value):
+    """A JSON list as is, or a ';'-separated cell split into stripped items"""
+    if isinstance(value, list):
+        return value
+    if value is None:
+        return []
+    return [item.strip() for item in str(value).split(';') if item.strip()]
+
+
+def raw_room_number(raw):
+    return str(raw.get('room_number') or raw.get('name') or '').strip()
+
+
+def parse_room(raw):
+    """Turn one raw row into Room field values, or raise ValidationError.
+
+    Accepts the model's field names as well as the keys of the frontend's
+    src/data.ts (name, type, isActive).
+    """
+    errors = []
+
+    room_number = raw_room_number(raw)
+    if not room_number:
+        errors.append('room_number is required')
+    elif len(room_number) > 20:
+        errors.append('room_number must be at most 20 characters')
+
+    block = str(raw.get('block') or '').strip()
+    if not block:
+        errors.append('block is required')
+    elif len(block) > 100:
+        errors.append('block must be at most 100 characters')
+
+    room_type = str(raw.get('room_type') or raw.get('type') or '').strip()
+    if room_type not in ROOM_TYPES:
+        errors.append(f"Unknown room_type '{room_type}'")
+
+    capacity = raw.get('capacity')
+    try:
+        capacity = float(str(capacity).strip())
+        if not capacity.is_integer() or capacity < 0:
+            raise ValueError
+        capacity = int(capacity)
+    except ValueError:
+        errors.append('capacity must be a whole number')
+
+    is_active = raw.get('is_active', raw.get('isActive', True))
+    if not isinstance(is_active, bool):
+        text = str(is_active).strip().lower()
+        if text in TRUE_VALUES or text == '':
+            is_active = True
+        elif text in FALSE_VALUES:
+            is_active = False
+        else:
+            errors.append('is_active must be true or false')
+
+    if errors:
+        raise ValidationError(errors)
+
+    return {
+        'room_number': room_number,
+        'block': block,
+        'room_type': room_type,
+        'capacity': capacity,
+        'features': parse_list(raw.get('features')),
+        'equipment': parse_list(raw.get('equipment')),
+        'is_active': is_active,
+    }
+
+
+def classify(room, current):
+    """('added' | 'changed' | 'deactivated' | 'unchanged', changed fields) of a parsed row"""
+    if current is None:
+        return 'added', []
+    changed = [
+        field for field in UPDATE_FIELDS
+        if room[field] != current['block__name' if field == 'block' else field]
+    ]
+    if not changed:
+        return 'unchanged', []
+    if changed == ['is_active'] and not room['is_active']:
+        return 'deactivated', changed
+    return 'changed', changed
+
+
+class CatalogImport:
+    """One import run; ``report`` counts rows per outcome.
+
+    ``on_change(kind, label, details)`` is called for every added,
+    changed, deactivated and invalid row as it is found.
+    """
+
+    def __init__(self, dry_run=False, batch_size=1000, on_change=None):
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.on_change = on_change or (lambda kind, label, details: None)
+        self.report = dict.fromkeys(['added', 'changed', 'deactivated', 'unchanged', 'invalid', 'blocks_added'], 0)
+        self.blocks = dict(Block.objects.values_list('name', 'id'))
+        self.seen = set()
+        # Every room number a row names, valid or not
+        self.listed = set()
+
+    def run(self, rows, deactivate_missing=False):
+        rows = enumerate(rows, 1)
+        while batch := list(islice(rows, self.batch_size)):
+            self.apply(self.parse(batch))
+        if deactivate_missing:
+            self.deactivate_missing()
+        if not self.dry_run and any(self.report[kind] for kind in ('added', 'changed', 'deactivated', 'blocks_added')):
+            # bulk writes skip the post_save signal that bumps it
+            CatalogVersion.bump()
+        return self.report
+
+    def parse(self, batch):
+        rooms = []
+        for n, raw in batch:
+            self.listed.add(raw_room_number(raw))
+            try:
+                room = parse_room(raw)
+            except ValidationError as e:
+                self.invalid(n, e.messages)
+                continue
+            if room['room_number'] in self.seen:
+                self.invalid(n, [f"Duplicate room_number '{room['room_number']}'"])
+                continue
+            self.seen.add(room['room_number'])
+            rooms.append(room)
+        return rooms
+
+    def invalid(self, n, errors):
+        self.report['invalid'] += 1
+        self.on_change('invalid', f'Row {n}', errors)
+
+    def apply(self, rooms):
+        """Upsert the new and changed rooms of one batch in one transaction"""
+        current = {
+            row['room_number']: row
+            for row in Room.objects.filter(room_number__in=[room['room_number'] for room in rooms]).values(
+                'room_number', 'block__name', *UPDATE_FIELDS[1:]
+            )
+        }
+        writes, retag = [], []
+        for room in rooms:
+            kind, changed = classify(room, current.get(room['room_number']))
+            self.report[kind] += 1
+            if kind == 'unchanged':
+                continue
+            self.on_change(kind, room['room_number'], changed)
+            writes.append(room)
+            if kind == 'added' or {'features', 'equipment'} & set(changed):
+                retag.append(room['room_number'])
+
+        new_blocks = sorted({room['block'] for room in writes} - self.blocks.keys())
+        self.report['blocks_added'] += len(new_blocks)
+        if self.dry_run or not writes:
+            self.blocks.update(dict.fromkeys(new_blocks))
+            return
+
+        with transaction.atomic():
+            if new_blocks:
+                Block.objects.bulk_create([Block(name=name) for name in new_blocks], ignore_conflicts=True)
+                self.blocks.update(Block.objects.filter(name__in=new_blocks).values_list('name', 'id'))
+            Room.objects.bulk_create(
+                [
+                    Room(block_id=self.blocks[room['block']], **{k: v for k, v in room.items() if k != 'block'})
+                    for room in writes
+                ],
+                update_conflicts=True,
+                unique_fields=['room_number'],
+                update_fields=UPDATE_FIELDS,
+            )
+            if retag:
+                RoomTag.sync(Room.objects.filter(room_number__in=retag))
+
+    def deactivate_missing(self):
+        """Deactivate the active rooms no row of the file named"""
+        active = Room.objects.filter(is_active=True).values_list('id', 'room_number').order_by('id')
+        # Collected before updating: SQLite cursors see writes to the table they read
+        missing = [(pk, number) for pk, number in active.iterator(chunk_size=5000) if number not in self.listed]
+        for i in range(0, len(missing), self.batch_size):
+            batch = missing[i:i + self.batch_size]
+            for _, number in batch:
+                self.on_change('deactivated', number, ['not in file'])
+            self.report['deactivated'] += len(batch)
+            if not self.dry_run:
+                Room.objects.filter(id__in=[pk for pk, _ in batch]).update(is_active=False)
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from rooms.catalog import CatalogImport, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Upserts blocks and rooms from a CSV, JSON, JSON Lines or XLSX file (e.g. rooms/data/rooms.json)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='File with room_number,block,room_type,capacity[,features,equipment,is_active] columns; '
+                 'features/equipment are ;-separated in CSV and XLSX',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows upserted per transaction')
+        parser.add_argument('--deactivate-missing', action='store_true',
+                            help='Deactivate active rooms that are not in the file')
+        parser.add_argument('--dry-run', action='store_true', help='Show what would change without writing anything')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        dry_run = options['dry_run']
+        show_changes = dry_run or options['verbosity'] > 1
+        markers = {'added': '+', 'changed': '~', 'deactivated': '-'}
+
+        def on_change(kind, label, details):
+            if kind == 'invalid':
+                self.stdout.write(self.style.WARNING(f"{label}: invalid - {'; '.join(details)}"))
+            elif show_changes:
+                self.stdout.write(f"{markers[kind]} {label}" + (f" ({', '.join(details)})" if details else ''))
+
+        try:
+            report = CatalogImport(dry_run, options['batch_size'], on_change).run(
+                read_rows(options['path']), deactivate_missing=options['deactivate_missing']
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+
+        verb = 'Would apply' if dry_run else 'Applied'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb}: {report['added']} added, {report['changed']} changed, {report['deactivated']} deactivated, "
+            f"{report['unchanged']} unchanged, {report['invalid']} invalid, {report['blocks_added']} new blocks"
+        ))
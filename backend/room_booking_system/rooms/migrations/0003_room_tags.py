@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_room_tags(apps, schema_editor):
+    # Same rules as RoomTag.tags_for; the historical model has no methods
+    Room = apps.get_model('rooms', 'Room')
+    RoomTag = apps.get_model('rooms', 'RoomTag')
+    tags = []
+    for room in Room.objects.all():
+        seen = {}
+        for kind, values in (('feature', room.features), ('equipment', room.equipment)):
+            for value in values or []:
+                value = str(value).strip()[:100]
+                if value:
+                    seen.setdefault((kind, value.casefold()), value)
+        tags += [RoomTag(room=room, kind=kind, key=key, value=value) for (kind, key), value in seen.items()]
+    RoomTag.objects.bulk_create(tags)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0002_room_equipment_room_features_room_is_active_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('feature', 'Feature'), ('equipment', 'Equipment')], max_length=20)),
+                ('value', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=100)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='rooms.room')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'key', 'room'], name='roomtag_kind_key_idx')],
+                'unique_together': {('room', 'kind', 'key')},
+            },
+        ),
+        migrations.RunPython(fill_room_tags, migrations.RunPython.noop),
+    ]
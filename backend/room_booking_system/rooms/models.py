@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 class Block(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -40,4 +41,83 @@ class Room(models.Model):
 
     class Meta:
         unique_together = ('room_number', 'block')  # ✅ prevents duplicates
-        ordering = ['room_number']  # ✅ ascending order
\ No newline at end of file
+        ordering = ['room_number']  # ✅ ascending order
+
+
+class RoomTag(models.Model):
+    """One entry of a room's features/equipment list, kept in sync on save.
+
+    Feature searches and facet counts on every database go through this
+    table's indexed ``key``: the entry as written, stripped and cut to 100
+    characters (``value``), and case-folded, so "projector" finds rooms
+    listing "Projector" as the dashboard's filter always did.
+    """
+    KIND_CHOICES = [
+        ('feature', 'Feature'),
+        ('equipment', 'Equipment'),
+    ]
+
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='tags')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    value = models.CharField(max_length=100)
+    key = models.CharField(max_length=100)
+
+    class Meta:
+        unique_together = ('room', 'kind', 'key')
+        indexes = [
+            models.Index(fields=['kind', 'key', 'room'], name='roomtag_kind_key_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.room.room_number}: {self.value} ({self.kind})"
+
+    @staticmethod
+    def clean_value(value):
+        return str(value).strip()[:100]
+
+    @classmethod
+    def key_for(cls, value):
+        """The search key of a feature/equipment entry or a query value"""
+        return cls.clean_value(value).casefold()
+
+    @classmethod
+    def tags_for(cls, room):
+        """Unsaved tags of one room; the first spelling of each key wins"""
+        tags = {}
+        for kind, values in (('feature', room.features), ('equipment', room.equipment)):
+            for value in values or []:
+                value = cls.clean_value(value)
+                if value:
+                    tags.setdefault((kind, cls.key_for(value)), value)
+        return [cls(room=room, kind=kind, key=key, value=value) for (kind, key), value in tags.items()]
+
+    @classmethod
+    def sync(cls, rooms):
+        """Rewrite the tags of ``rooms`` from their features/equipment lists"""
+        rooms = list(rooms)
+        cls.objects.filter(room__in=rooms).delete()
+        cls.objects.bulk_create([tag for room in rooms for tag in cls.tags_for(room)])
+
+
+class CatalogVersion(models.Model):
+    """A single counter bumped whenever any Room or Block changes.
+
+    Cached room/block responses are keyed by it, so a bump invalidates
+    them in every process without a shared cache server.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def current(cls):
+        """(version, updated_at) of the catalog"""
+        row = cls.objects.filter(pk=1).values_list('version', 'updated_at').first()
+        if row is None:
+            row = (0, None)
+        return row
+
+    @classmethod
+    def bump(cls):
+        updated = cls.objects.filter(pk=1).update(version=models.F('version') + 1, updated_at=timezone.now())
+        if not updated:
+            cls.objects.get_or_create(pk=1, defaults={'version': 1})
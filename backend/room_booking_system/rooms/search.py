@@ -0,0 +1,55 @@
+from django.db.models import Count, Min
+
+from .models import RoomTag
+
+
+TAG_FIELDS = {'feature': 'features', 'equipment': 'equipment'}
+
+
+def parse_list(value):
+    """Split a "Projector,Whiteboard" query param into a list of values"""
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+def filter_by_tags(queryset, kind, values, match='all'):
+    """Rooms whose features/equipment contain all (or any) of ``values``.
+
+    Values are matched case-insensitively on the RoomTag side table.
+    """
+    keys = {RoomTag.key_for(value) for value in values}
+    if not keys:
+        return queryset
+
+    tags = RoomTag.objects.filter(kind=kind, key__in=keys)
+    if match == 'any':
+        return queryset.filter(id__in=tags.values('room_id'))
+    matching = tags.values('room_id').annotate(n=Count('id')).filter(n=len(keys))
+    return queryset.filter(id__in=matching.values('room_id'))
+
+
+def filter_rooms(queryset, params):
+    """Apply the ?features=&equipment=&match=all|any params of a request"""
+    match = 'any' if params.get('match') == 'any' else 'all'
+    queryset = filter_by_tags(queryset, 'feature', parse_list(params.get('features')), match)
+    return filter_by_tags(queryset, 'equipment', parse_list(params.get('equipment')), match)
+
+
+def facets(queryset):
+    """Counts per feature, equipment, room type and block for ``queryset``"""
+    result = {'total': queryset.count(), 'features': {}, 'equipment': {}, 'types': {}, 'blocks': {}}
+
+    # Spellings that differ only in case are counted together
+    tags = (
+        RoomTag.objects.filter(room__in=queryset.values('id'))
+        .values_list('kind', 'key')
+        .annotate(label=Min('value'), count=Count('id'))
+        .order_by('kind', 'key')
+    )
+    for kind, _, label, count in tags:
+        result[TAG_FIELDS[kind]][label] = count
+
+    for room_type, count in queryset.values_list('room_type').annotate(count=Count('id')).order_by('room_type'):
+        result['types'][room_type] = count
+    for block, count in queryset.values_list('block__name').annotate(count=Count('id')).order_by('block__name'):
+        result['blocks'][block] = count
+    return result
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from room_booking_system.serializers import DynamicFieldsMixin
 from .models import Room, Block
 
 
@@ -8,7 +9,7 @@ class BlockSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
 
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     block_name = serializers.CharField(source='block.name', read_only=True)
     
     class Meta:
@@ -25,8 +26,10 @@ class RoomSerializer(serializers.ModelSerializer):
             'is_active'
         ]
 
+    field_sources = {'block_name': ['block__name']}
 
-class RoomListSerializer(serializers.ModelSerializer):
+
+class RoomListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for list views"""
     block = serializers.CharField(source='block.name', read_only=True)
     
@@ -42,3 +45,5 @@ class RoomListSerializer(serializers.ModelSerializer):
             'equipment',
             'is_active'
         ]
+
+    field_sources = {'block': ['block__name']}
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Block, CatalogVersion, Room, RoomTag
+
+
+@receiver(post_save, sender=Room)
+def sync_room_tags(sender, instance, update_fields=None, **kwargs):
+    # Also runs for fixtures (raw saves) so loaded rooms are searchable
+    if update_fields is not None and not {'features', 'equipment'} & set(update_fields):
+        return
+    RoomTag.sync([instance])
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+@receiver(post_save, sender=Block)
+@receiver(post_delete, sender=Block)
+def bump_catalog_version(sender, **kwargs):
+    CatalogVersion.bump()
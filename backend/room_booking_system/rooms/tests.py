@@ -1,3 +1,255 @@
-from django.test import TestCase
+import io
+import tempfile
+import warnings
+import zipfile
+from pathlib import Path
 
-# Create your tests here.
+from django.core.cache import CacheKeyWarning, cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from room_booking_system.testing import QueryBudgetMixin, seed_campus
+from .models import Block, CatalogVersion, Room, RoomTag
+
+
+class RoomQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Every rooms route runs a fixed number of queries, whatever the row count"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.admin = cls.campus['admin']
+        cls.room = cls.campus['rooms'][0]
+        cls.block = cls.campus['blocks'][0]
+
+    def test_room_list(self):
+        response = self.assertQueryBudget(2, '/api/rooms/')
+        self.assertEqual(len(response.json()), 12)
+        self.assertQueryBudget(4, '/api/rooms/', user=self.admin)
+        self.assertQueryBudget(2, '/api/rooms/?features=Projector,AC&type=Lab')
+
+    def test_room_detail(self):
+        self.assertQueryBudget(1, f'/api/rooms/{self.room.pk}/')
+
+    def test_by_block(self):
+        response = self.assertQueryBudget(3, '/api/rooms/by_block/')
+        self.assertEqual(sorted(response.json()), ['Library', 'Main', 'Science'])
+
+    def test_types(self):
+        self.assertQueryBudget(2, '/api/rooms/types/')
+
+    def test_free_slots(self):
+        self.assertQueryBudget(2, '/api/rooms/free-slots/?duration=60&limit=20')
+        response = self.assertQueryBudget(2, '/api/rooms/free-slots/?min_capacity=60&limit=20')
+        self.assertEqual({slot['capacity'] for slot in response.json()['results']}, {60})
+        for params in ('min_capacity=big', 'duration=1h', 'from=tomorrow', 'window=late'):
+            with self.subTest(params=params):
+                self.assertQueryBudget(0, f'/api/rooms/free-slots/?{params}', status=400)
+
+    def test_facets(self):
+        self.assertQueryBudget(4, '/api/rooms/facets/')
+
+    def test_room_writes(self):
+        data = {'block': self.block.pk, 'room_number': 'N-001', 'room_type': 'Lab', 'capacity': 10}
+        response = self.assertQueryBudget(8, '/api/rooms/', 'post', self.admin, data, status=201)
+        room_id = response.json()['id']
+        self.assertQueryBudget(6, f'/api/rooms/{room_id}/', 'patch', self.admin, {'capacity': 12})
+        self.assertQueryBudget(11, f'/api/rooms/{room_id}/', 'delete', self.admin, status=204)
+
+    def test_block_list_and_detail(self):
+        self.assertQueryBudget(2, '/api/rooms/blocks/')
+        self.assertQueryBudget(1, f'/api/rooms/blocks/{self.block.pk}/')
+
+    def test_block_writes(self):
+        response = self.assertQueryBudget(5, '/api/rooms/blocks/', 'post', self.admin, {'name': 'Annex'}, status=201)
+        block_id = response.json()['id']
+        self.assertQueryBudget(6, f'/api/rooms/blocks/{block_id}/', 'put', self.admin, {'name': 'Annex 2'})
+        self.assertQueryBudget(6, f'/api/rooms/blocks/{block_id}/', 'delete', self.admin, status=204)
+
+
+class RoomSearchTests(TestCase):
+    """Feature/equipment filters ignore case and surrounding whitespace"""
+
+    @classmethod
+    def setUpTestData(cls):
+        block = Block.objects.create(name='Main')
+        for number, features in (('A-1', ['Projector', ' AC ']), ('A-2', ['projector']), ('A-3', ['Whiteboard'])):
+            Room.objects.create(
+                block=block, room_number=number, room_type='Lab', capacity=30,
+                features=features, equipment=['Speakers'] if number == 'A-3' else [],
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def rooms(self, query):
+        return [room['room_number'] for room in self.client.get(f'/api/rooms/?{query}').json()]
+
+    def free_rooms(self, query):
+        response = self.client.get(f'/api/rooms/free-slots/?window=&limit=100&{query}')
+        return sorted({slot['room_number'] for slot in response.json()['results']})
+
+    def test_tags_are_normalized_once(self):
+        room = Room.objects.get(room_number='A-1')
+        room.features = ['AC', 'ac', '  Projector', 'x' * 150, ' ']
+        room.save()
+        self.assertEqual(
+            sorted(room.tags.values_list('key', 'value')),
+            [('ac', 'AC'), ('projector', 'Projector'), ('x' * 100, 'x' * 100)],
+        )
+
+    def test_list_and_free_slots_match_the_same_rooms(self):
+        cases = [
+            ('features=PROJECTOR', ['A-1', 'A-2']),
+            ('features= projector ,ac', ['A-1']),
+            ('features=ac,whiteboard&match=any', ['A-1', 'A-3']),
+            ('equipment=speakers', ['A-3']),
+            ('features=Projector&equipment=Speakers', []),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertEqual(self.rooms(query), expected)
+                self.assertEqual(self.free_rooms(query), expected)
+
+    def test_list_cache_key_is_a_digest(self):
+        long_query = 'features=' + ','.join(f'Feature {n}' for n in range(100))
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            self.assertEqual(self.rooms(long_query), [])
+            self.rooms('type=Lab&features=AC')
+        with self.assertNumQueries(1):  # only the catalog version
+            self.assertEqual(self.rooms('features=AC&type=Lab'), ['A-1'])
+
+    def test_list_is_304_until_the_catalog_changes(self):
+        first = self.client.get('/api/rooms/?features=AC')
+        self.assertEqual(self.client.get('/api/rooms/?features=AC', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        room = Room.objects.get(room_number='A-2')
+        room.features = ['ac']
+        room.save()
+        changed = self.client.get('/api/rooms/?features=AC', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+        self.assertEqual([room['room_number'] for room in changed.json()], ['A-1', 'A-2'])
+
+    def test_facets_count_spellings_together(self):
+        facets = self.client.get('/api/rooms/facets/').json()
+        self.assertEqual(facets['features'], {'AC': 1, 'Projector': 2, 'Whiteboard': 1})
+        self.assertEqual(facets['equipment'], {'Speakers': 1})
+
+
+class QueryCountHeaderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(QUERY_COUNT_HEADERS=True)
+    def test_headers_when_enabled(self):
+        response = self.client.get('/api/rooms/types/')
+        self.assertEqual(response['X-Query-Count'], '2')
+        self.assertIn('X-DB-Time-Ms', response)
+
+    @override_settings(QUERY_COUNT_HEADERS=False)
+    def test_no_headers_when_disabled(self):
+        response = self.client.get('/api/rooms/types/')
+        self.assertNotIn('X-Query-Count', response)
+
+
+class RoomImportTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, content):
+        path = Path(self.tmp.name) / name
+        path.write_bytes(content) if isinstance(content, bytes) else path.write_text(content)
+        return str(path)
+
+    def run_import(self, path, *args):
+        out = io.StringIO()
+        call_command('import_rooms', path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_bundled_catalog(self):
+        path = Path(__file__).parent / 'data' / 'rooms.json'
+        self.assertIn('44 added', self.run_import(str(path), '--batch-size', '10'))
+        self.assertEqual(Room.objects.count(), 44)
+        self.assertEqual(sorted(Block.objects.values_list('name', flat=True)), ['X', 'Y'])
+        self.assertTrue(RoomTag.objects.filter(room__room_number='X-001', value='Projector').exists())
+        version = CatalogVersion.current()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIn('0 added, 0 changed, 0 deactivated, 44 unchanged', self.run_import(str(path)))
+        self.assertLessEqual(len(queries), 3)
+        self.assertEqual(CatalogVersion.current(), version)
+
+    def test_csv_diff_and_apply(self):
+        block = Block.objects.create(name='X')
+        Room.objects.create(block=block, room_number='X-001', room_type='Classroom', capacity=40, features=['AC'])
+        Room.objects.create(block=block, room_number='X-002', room_type='Lab', capacity=20)
+        Room.objects.create(block=block, room_number='X-003', room_type='Lab', capacity=20)
+        Room.objects.create(block=block, room_number='X-004', room_type='Lab', capacity=20)
+        path = self.write('rooms.csv', (
+            'room_number,block,room_type,capacity,features,is_active\n'
+            'X-001,X,Classroom,45,AC;Projector,true\n'
+            'X-002,X,Lab,20,,false\n'
+            'Y-001,Y,Seminar Hall,60,Stage,\n'
+            'Y-002,Y,Spaceship,abc,,\n'
+            'X-003,X,Lab,many,,\n'
+        ))
+
+        output = self.run_import(path, '--dry-run', '--deactivate-missing')
+        self.assertIn('~ X-001 (capacity, features)', output)
+        self.assertIn('- X-002 (is_active)', output)
+        self.assertIn('- X-004 (not in file)', output)
+        self.assertIn('+ Y-001', output)
+        self.assertIn("Row 4: invalid - Unknown room_type 'Spaceship'; capacity must be a whole number", output)
+        # A row that fails validation still lists its room: it is left alone
+        self.assertIn('Row 5: invalid', output)
+        self.assertNotIn('X-003 (not in file)', output)
+        self.assertIn('Would apply: 1 added, 1 changed, 2 deactivated, 0 unchanged, 2 invalid, 1 new blocks', output)
+        self.assertEqual(Room.objects.count(), 4)
+        self.assertFalse(Block.objects.filter(name='Y').exists())
+
+        self.run_import(path, '--deactivate-missing')
+        rooms = {room.room_number: room for room in Room.objects.select_related('block')}
+        self.assertEqual((rooms['X-001'].capacity, rooms['X-001'].features), (45, ['AC', 'Projector']))
+        self.assertFalse(rooms['X-002'].is_active)
+        self.assertEqual((rooms['X-003'].is_active, rooms['X-003'].capacity), (True, 20))
+        self.assertFalse(rooms['X-004'].is_active)
+        self.assertEqual((rooms['Y-001'].block.name, rooms['Y-001'].is_active), ('Y', True))
+        self.assertEqual(
+            sorted(RoomTag.objects.filter(room__room_number='X-001').values_list('value', flat=True)),
+            ['AC', 'Projector'],
+        )
+
+    def test_xlsx_and_jsonl(self):
+        ns = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as workbook:
+            workbook.writestr('xl/sharedStrings.xml', (
+                f'<sst xmlns="{ns}"><si><t>room_number</t></si><si><t>block</t></si>'
+                '<si><t>room_type</t></si><si><t>capacity</t></si><si><t>Lab</t></si></sst>'
+            ))
+            workbook.writestr('xl/worksheets/sheet1.xml', (
+                f'<worksheet xmlns="{ns}"><sheetData>'
+                '<row><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c>'
+                '<c r="C1" t="s"><v>2</v></c><c r="D1" t="s"><v>3</v></c></row>'
+                '<row><c r="A2" t="inlineStr"><is><t>Z-001</t></is></c><c r="B2" t="inlineStr"><is><t>Z</t></is></c>'
+                '<c r="C2" t="s"><v>4</v></c><c r="D2"><v>30</v></c></row>'
+                '</sheetData></worksheet>'
+            ))
+        self.assertIn('1 added', self.run_import(self.write('rooms.xlsx', buffer.getvalue())))
+        self.assertEqual(Room.objects.get(room_number='Z-001').capacity, 30)
+
+        path = self.write('rooms.jsonl', (
+            '{"name": "Z-001", "block": "Z", "type": "Lab", "capacity": 32, "isActive": true}\n'
+            '{"name": "Z-001", "block": "Z", "type": "Lab", "capacity": 32}\n'
+        ))
+        output = self.run_import(path)
+        self.assertIn("Row 2: invalid - Duplicate room_number 'Z-001'", output)
+        self.assertEqual(Room.objects.get(room_number='Z-001').capacity, 32)
+
+        with self.assertRaises(CommandError):
+            self.run_import(self.write('rooms.txt', 'nope'))
@@ -2,7 +2,14 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from .models import Room, Block
+from django.utils import timezone
+from datetime import datetime, time, timedelta
+from bookings import availability
+from room_booking_system.conditional import conditional_response, make_etag
+from room_booking_system.serializers import sparse_fields
+from .models import CatalogVersion, Room, Block
+from . import search
+from .cache import cached_catalog, params_key
 from .serializers import RoomSerializer, RoomListSerializer, BlockSerializer
 
 
@@ -17,6 +24,11 @@ class BlockViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated()]
         return [AllowAny()]
 
+    def list(self, request, *args, **kwargs):
+        version, updated_at = CatalogVersion.current()
+        etag = make_etag('blocks', version, updated_at, request.get_full_path())
+        return conditional_response(request, etag, updated_at, lambda: super(BlockViewSet, self).list(request, *args, **kwargs))
+
     def create(self, request, *args, **kwargs):
         if not request.user.is_authenticated or request.user.role != 'admin':
              return Response({'error': 'Only admins can manage blocks'}, status=status.HTTP_403_FORBIDDEN)
@@ -47,14 +59,19 @@ class RoomViewSet(viewsets.ModelViewSet):
         if self.action == 'list':
             return RoomListSerializer
         return RoomSerializer
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ['list', 'retrieve']:
+            kwargs.update(sparse_fields(self.request))
+        return super().get_serializer(*args, **kwargs)
     
     def get_queryset(self):
         # Admins see all rooms, others see active only
         user = self.request.user
         if user.is_authenticated and (user.role == 'admin' or user.is_superuser):
-            queryset = Room.objects.all()
+            queryset = Room.objects.select_related('block')
         else:
-            queryset = Room.objects.filter(is_active=True)
+            queryset = Room.objects.filter(is_active=True).select_related('block')
             
         # Filter by block
         block = self.request.query_params.get('block', None)
@@ -70,6 +87,13 @@ class RoomViewSet(viewsets.ModelViewSet):
         min_capacity = self.request.query_params.get('min_capacity', None)
         if min_capacity:
             queryset = queryset.filter(capacity__gte=min_capacity)
+
+        # Filter by features/equipment (?features=A,B&equipment=C&match=all|any)
+        queryset = search.filter_rooms(queryset, self.request.query_params)
+
+        # ?fields= / ?omit= narrow both the payload and the query
+        if self.action in ['list', 'retrieve']:
+            queryset = self.get_serializer_class().optimize_queryset(queryset, **sparse_fields(self.request))
         
         return queryset.order_by('room_number')
 
@@ -88,20 +112,88 @@ class RoomViewSet(viewsets.ModelViewSet):
              return Response({'error': 'Only admins can delete rooms'}, status=status.HTTP_403_FORBIDDEN)
         return super().destroy(request, *args, **kwargs)
     
+    def list(self, request, *args, **kwargs):
+        # Everyone but admins sees the same active rooms, so the response
+        # only depends on the query string and the catalog version
+        user = request.user
+        is_admin = user.is_authenticated and (user.role == 'admin' or user.is_superuser)
+        version, updated_at = CatalogVersion.current()
+        etag = make_etag('rooms', version, updated_at, is_admin, request.get_full_path())
+
+        def build():
+            if is_admin:
+                return super(RoomViewSet, self).list(request, *args, **kwargs)
+            return Response(cached_catalog(
+                f'list:{params_key(request.query_params)}',
+                lambda: list(self.get_serializer(self.get_queryset(), many=True).data),
+                (version, updated_at),
+            ))
+
+        return conditional_response(request, etag, updated_at, build)
+
     @action(detail=False, methods=['get'])
     def by_block(self, request):
         """Get rooms grouped by block"""
-        blocks = Block.objects.all()
-        result = {}
-        
-        for block in blocks:
-            rooms = Room.objects.filter(block=block, is_active=True)
-            result[block.name] = RoomListSerializer(rooms, many=True).data
-        
-        return Response(result)
+        def build():
+            result = {name: [] for name in Block.objects.values_list('name', flat=True)}
+            rooms = Room.objects.filter(is_active=True).select_related('block').order_by('room_number')
+            for room in RoomListSerializer(rooms, many=True).data:
+                result[room['block']].append(room)
+            return result
+
+        return Response(cached_catalog('by_block', build))
     
     @action(detail=False, methods=['get'])
     def types(self, request):
         """Get list of unique room types"""
-        types = Room.objects.filter(is_active=True).values_list('room_type', flat=True).distinct()
-        return Response(list(types))
+        return Response(cached_catalog('types', lambda: list(
+            Room.objects.filter(is_active=True).order_by('room_type').values_list('room_type', flat=True).distinct()
+        )))
+
+    @action(detail=False, methods=['get'], url_path='free-slots')
+    def free_slots(self, request):
+        """Earliest free slots of a given length across all matching rooms.
+
+        Query params: duration (minutes), min_capacity, features/equipment
+        (comma separated, see match), block, type, from/to (YYYY-MM-DD),
+        window (HH:MM-HH:MM) and limit.
+        """
+        params = request.query_params
+        today = timezone.localdate()
+        try:
+            duration = int(params.get('duration', 60))
+            limit = min(int(params.get('limit', 10)), 100)
+            min_capacity = int(params['min_capacity']) if params.get('min_capacity') else None
+            start_date = datetime.strptime(params['from'], '%Y-%m-%d').date() if params.get('from') else today
+            end_date = datetime.strptime(params['to'], '%Y-%m-%d').date() if params.get('to') else start_date + timedelta(days=13)
+        except ValueError:
+            return Response(
+                {'error': 'duration/limit/min_capacity must be integers and from/to dates in YYYY-MM-DD format'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            window = availability.parse_slot(params.get('window', '09:00-17:00')) or (time(0, 0), time(23, 59))
+        except ValueError as e:
+            return Response({'error': f'window: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if duration <= 0 or limit <= 0:
+            return Response({'error': 'duration and limit must be positive'}, status=status.HTTP_400_BAD_REQUEST)
+        if start_date > end_date or (end_date - start_date).days > 62:
+            return Response({'error': 'to must be on or after from, at most 62 days later'}, status=status.HTTP_400_BAD_REQUEST)
+
+        rooms = Room.objects.filter(is_active=True)
+        if params.get('block'):
+            rooms = rooms.filter(block__name=params['block'])
+        if params.get('type'):
+            rooms = rooms.filter(room_type=params['type'])
+        if min_capacity is not None:
+            rooms = rooms.filter(capacity__gte=min_capacity)
+        rooms = list(search.filter_rooms(rooms, params).values('id', 'room_number', 'capacity', 'block__name'))
+
+        slots = availability.free_slots(rooms, start_date, end_date, duration, window, limit, now=timezone.localtime())
+        return Response({'duration': duration, 'results': slots})
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Counts per feature, equipment, type and block for the current filters"""
+        return Response(search.facets(self.get_queryset().order_by()))
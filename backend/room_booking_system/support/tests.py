@@ -0,0 +1,30 @@
+from django.test import TestCase
+
+from room_booking_system.testing import QueryBudgetMixin, seed_campus
+from .models import SupportMessage
+
+
+class SupportQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Every support route runs a fixed number of queries, whatever the row count"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.admin = cls.campus['admin']
+        cls.message = SupportMessage.objects.first()
+
+    def test_list_and_detail(self):
+        response = self.assertQueryBudget(3, '/api/support/messages/', user=self.admin)
+        self.assertEqual(len(response.json()), 15)
+        self.assertQueryBudget(3, f'/api/support/messages/{self.message.pk}/', user=self.admin)
+        self.assertQueryBudget(2, '/api/support/messages/', user=self.campus['faculty'][0])
+
+    def test_create(self):
+        data = {'name': 'Guest', 'email': 'guest@example.com', 'message': 'Projector broken'}
+        self.assertQueryBudget(1, '/api/support/messages/', 'post', data=data, status=201)
+        self.assertQueryBudget(3, '/api/support/messages/', 'post', self.campus['faculty'][1], data, status=201)
+
+    def test_update_and_delete(self):
+        path = f'/api/support/messages/{self.message.pk}/'
+        self.assertQueryBudget(4, path, 'patch', self.admin, {'message': 'Fixed'})
+        self.assertQueryBudget(4, path, 'delete', self.admin, status=204)
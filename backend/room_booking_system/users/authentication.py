@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from rest_framework import authentication, exceptions
+from rest_framework.permissions import SAFE_METHODS
+
+from .tokens import ACCESS, InvalidToken, claims_user, decode
+
+
+class SignedTokenAuthentication(authentication.BaseAuthentication):
+    """``Authorization: Bearer <access token>`` from ``users.tokens``.
+
+    Safe requests get a user built from the token's claims and never
+    touch the database; anything that writes loads the user, so writes
+    see its current role and a deactivated account is refused at once.
+    No CSRF check is needed: browsers do not send the header on their own.
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        header = authentication.get_authorization_header(request).split()
+        if not header or header[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(header) != 2:
+            raise exceptions.AuthenticationFailed('Invalid Authorization header.')
+
+        try:
+            claims = decode(header[1].decode('latin-1'), ACCESS)
+        except InvalidToken as e:
+            raise exceptions.AuthenticationFailed(str(e))
+
+        if request.method in SAFE_METHODS:
+            return claims_user(claims), claims
+        user = get_user_model().objects.filter(pk=claims['user']['id'], is_active=True).first()
+        if user is None:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        return user, claims
+
+    def authenticate_header(self, request):
+        return f'{self.keyword} realm="api"'
@@ -0,0 +1,81 @@
+"""Authentication middleware that keeps logged-in users in the session cache.
+
+Django's AuthenticationMiddleware loads ``request.user`` with one query
+per request. Here the loaded user's fields, minus the password hash, are
+cached (in SESSION_CACHE_ALIAS, next to the sessions themselves) together
+with its session auth hash, and only reused for sessions carrying the
+same hash, so password changes still log other sessions out. Saves and deletes of a user drop the
+entry (see users.signals); AUTH_USER_CACHE_SECONDS bounds how long a
+change made behind the ORM's back (QuerySet.update) can go unseen.
+"""
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def user_cache():
+    return caches[settings.SESSION_CACHE_ALIAS]
+
+
+def cached_fields(user):
+    """The user's field values worth caching: all but the password hash"""
+    return {
+        field.attname: field.get_prep_value(field.value_from_object(user))
+        for field in user._meta.concrete_fields if field.attname != 'password'
+    }
+
+
+def cached_user(values):
+    """A User rebuilt from ``cached_fields``; reading the password loads it"""
+    User = get_user_model()
+    fields = [field.attname for field in User._meta.concrete_fields if field.attname in values]
+    return User.from_db(DEFAULT_DB_ALIAS, fields, [values[field] for field in fields])
+
+
+def load_user(request):
+    """The session's user, from the cache when its auth hash still matches"""
+    user_id = request.session.get(auth.SESSION_KEY)
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if not settings.AUTH_USER_CACHE_SECONDS or user_id is None or not session_hash:
+        return auth.get_user(request)
+
+    key = user_cache_key(user_id)
+    entry = user_cache().get(key)
+    if entry is not None and constant_time_compare(entry[0], session_hash):
+        return cached_user(entry[1])
+
+    # Verifies the hash (flushing the session on a mismatch) as usual
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        user_cache().set(key, (user.get_session_auth_hash(), cached_fields(user)), settings.AUTH_USER_CACHE_SECONDS)
+    return user
+
+
+def get_user(request):
+    """``load_user`` memoized on the request, like Django's own get_user"""
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = load_user(request)
+    return request._cached_user
+
+
+async def aget_user(request):
+    return await sync_to_async(get_user)(request)
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
+        request.auser = partial(aget_user, request)
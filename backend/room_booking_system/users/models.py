@@ -6,6 +6,48 @@ class User(AbstractUser):
         ('admin', 'Admin'),
         ('faculty', 'Faculty'),
     )
+    # Fields copied elsewhere (booking payloads, access tokens), whose
+    # changes receivers of post_save look up in ``changed_fields``
+    TRACKED_FIELDS = ('username', 'first_name', 'last_name', 'email', 'role', 'avatar', 'is_active', 'password')
+
     role = models.CharField(max_length=20, choices=ROLE_CHOICES)
     email = models.EmailField(unique=True)
     avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
+    # Part of every .ics feed token the user hands out; bumping it revokes them
+    feed_token_version = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked_values()
+        return instance
+
+    def _tracked_value(self, name):
+        value = self.__dict__[name]
+        # An avatar is a FieldFile once read; compare the stored file name,
+        # which is '' for no avatar even when the attribute was set to None
+        if name == 'avatar':
+            return getattr(value, 'name', value) or ''
+        return value
+
+    def _remember_tracked_values(self):
+        # Deferred fields are left out: a save only writes them once set
+        self._loaded_values = {
+            name: self._tracked_value(name) for name in self.TRACKED_FIELDS if name in self.__dict__
+        }
+
+    def _tracked_changes(self, update_fields):
+        loaded = getattr(self, '_loaded_values', None)
+        names = set(self.TRACKED_FIELDS) if update_fields is None else set(self.TRACKED_FIELDS) & set(update_fields)
+        if self._state.adding or loaded is None:
+            return names
+        return {
+            name for name in names
+            if name in self.__dict__ and (name not in loaded or self._tracked_value(name) != loaded[name])
+        }
+
+    def save(self, *args, **kwargs):
+        # The TRACKED_FIELDS this save writes with a new value
+        self.changed_fields = self._tracked_changes(kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
+        self._remember_tracked_values()
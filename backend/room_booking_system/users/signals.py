@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .middleware import user_cache, user_cache_key
+from .models import User
+from .tokens import CLAIM_FIELDS, revoke_access_tokens
+
+# What an access token vouches for: the claims it carries, and that the
+# account is active with the password it was issued against
+TOKEN_FIELDS = set(CLAIM_FIELDS[1:]) | {'is_active', 'password'}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    user_cache().delete(user_cache_key(instance.pk))
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_change(sender, instance, created, raw=False, **kwargs):
+    # Saves that leave TOKEN_FIELDS alone (last_login on every login,
+    # feed_token_version when feed URLs are rotated) keep tokens valid
+    if not created and not raw and TOKEN_FIELDS & instance.changed_fields:
+        revoke_access_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    revoke_access_tokens(instance.pk)
@@ -1,3 +1,218 @@
-from django.test import TestCase
+import pickle
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from room_booking_system.testing import QueryBudgetMixin, seed_campus
+from . import tokens
+from .middleware import user_cache, user_cache_key
+from .models import User
+
+
+class UserQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Every auth and user management route runs a fixed number of queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = seed_campus()
+        cls.admin = cls.campus['admin']
+        cls.faculty = cls.campus['faculty'][0]
+
+    def test_check_and_current_user(self):
+        self.assertQueryBudget(0, '/api/auth/check/')
+        # The session comes from the session cache; logging in saves
+        # last_login, so the first request loads the user once
+        self.assertQueryBudget(1, '/api/auth/check/', user=self.faculty)
+        self.assertQueryBudget(1, '/api/auth/check/?lite=1', user=self.faculty)
+        self.assertQueryBudget(1, '/api/auth/user/', user=self.faculty)
+
+    def test_register_login_logout(self):
+        data = {'username': 'newbie', 'email': 'newbie@example.com', 'password': 'a-Long-pass-123',
+                'password_confirm': 'a-Long-pass-123', 'role': 'faculty'}
+        self.assertQueryBudget(11, '/api/auth/register/', 'post', data=data, status=201)
+        self.assertQueryBudget(9, '/api/auth/login/', 'post', data={'username': 'newbie', 'password': 'a-Long-pass-123'})
+        self.assertQueryBudget(4, '/api/auth/logout/', 'post', user=self.faculty)
+
+    def test_update_profile(self):
+        # A new name also touches the user's live and archived bookings
+        self.assertQueryBudget(4, '/api/auth/profile/', 'put', self.faculty, {'first_name': 'Grace'})
+
+    def test_user_list(self):
+        response = self.assertQueryBudget(3, '/api/users/manage/', user=self.admin)
+        self.assertEqual(len(response.json()), 5)
+        self.assertQueryBudget(3, '/api/users/manage/?fields=id,username,role', user=self.admin)
+
+    def test_manage_users(self):
+        data = {'username': 'made', 'email': 'made@example.com', 'password': 'a-Long-pass-123',
+                'password_confirm': 'a-Long-pass-123', 'role': 'faculty'}
+        response = self.assertQueryBudget(5, '/api/users/manage/create/', 'post', self.admin, data, status=201)
+        user_id = response.json()['user']['id']
+        self.assertQueryBudget(4, f'/api/users/manage/{user_id}/', 'put', self.admin, {'role': 'admin'})
+        self.assertQueryBudget(13, f'/api/users/manage/{user_id}/', 'delete', self.admin)
+        self.assertFalse(User.objects.filter(pk=user_id).exists())
+
+
+class CachedUserTests(QueryBudgetMixin, TestCase):
+    """The cached request user follows changes to the user"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('cached', 'cached@example.com', 'a-Long-pass-123', role='faculty')
+
+    def check(self, lite=False):
+        return self.client.get('/api/auth/check/', {'lite': 1} if lite else {}).json()
+
+    def test_lite_check(self):
+        self.assertEqual(self.check(lite=True), {'authenticated': False, 'user': None})
+        self.client.force_login(self.user)
+        self.assertEqual(
+            self.check(lite=True),
+            {'authenticated': True, 'user': {'id': self.user.id, 'username': 'cached', 'role': 'faculty'}},
+        )
+        self.assertIn('csrf_token', self.check())
+
+    def test_user_is_loaded_once(self):
+        self.client.force_login(self.user)
+        with self.assertNumQueries(1):
+            self.check()
+        with self.assertNumQueries(0):
+            self.check()
+            self.client.get('/api/auth/user/')
+
+    def test_cache_holds_no_password_hash(self):
+        self.client.force_login(self.user)
+        self.check()
+        session_hash, values = user_cache().get(user_cache_key(self.user.pk))
+        self.assertNotIn('password', values)
+        self.assertNotIn(self.user.password.encode(), pickle.dumps(values))
+        self.assertEqual(values['username'], 'cached')
+
+        # A profile update through the cached user keeps the password
+        response = self.client.put('/api/auth/profile/', {'first_name': 'Cached'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('a-Long-pass-123'))
+        self.assertEqual(self.check()['user']['first_name'], 'Cached')
+
+    def test_role_change_is_seen(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.check()['user']['role'], 'faculty')
+        self.user.role = 'admin'
+        self.user.save()
+        self.assertEqual(self.check()['user']['role'], 'admin')
+
+    def test_password_change_logs_other_sessions_out(self):
+        self.client.force_login(self.user)
+        self.assertTrue(self.check()['authenticated'])
+        self.user.set_password('another-Long-pass-456')
+        self.user.save()
+        self.assertFalse(self.check()['authenticated'])
+
+    def test_deleted_user_is_logged_out(self):
+        self.client.force_login(self.user)
+        self.assertTrue(self.check()['authenticated'])
+        self.user.delete()
+        self.assertFalse(self.check()['authenticated'])
+
+
+class TokenAuthTests(QueryBudgetMixin, TestCase):
+    """Signed access tokens, their refresh flow and revocation.
+
+    Rejected tokens get a 403 like a missing session does: DRF takes the
+    status from the first authentication class, SessionAuthentication.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('kiosk', 'kiosk@example.com', 'a-Long-pass-123', role='faculty')
+
+    def login(self):
+        response = self.client.post('/api/auth/login/', {
+            'username': 'kiosk', 'password': 'a-Long-pass-123', 'tokens': True,
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('sessionid', response.cookies)
+        return response.json()
+
+    def get(self, path, token):
+        return self.client.get(path, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_reads_need_no_queries(self):
+        access = self.login()['access_token']
+        with self.assertNumQueries(0):
+            response = self.get('/api/auth/user/', access)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['username'], 'kiosk')
+
+    def test_writes_load_the_user_without_csrf(self):
+        access = self.login()['access_token']
+        response = self.client.put(
+            '/api/auth/profile/', {'first_name': 'Kiosk'}, content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {access}',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Kiosk')
+
+    def test_bad_and_expired_tokens(self):
+        access = self.login()['access_token']
+        self.assertEqual(self.get('/api/auth/user/', access[:-2] + 'xx').status_code, 403)
+        with override_settings(ACCESS_TOKEN_SECONDS=-1):
+            response = self.get('/api/auth/user/', access)
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('expired', response.json()['detail'])
+
+    def test_refresh_rotates_the_pair(self):
+        refresh_token = self.login()['refresh_token']
+        response = self.client.post('/api/auth/token/refresh/', {'refresh_token': refresh_token})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get('/api/auth/user/', response.json()['access_token']).status_code, 200)
+        # A refresh token is good for one exchange
+        response = self.client.post('/api/auth/token/refresh/', {'refresh_token': refresh_token})
+        self.assertEqual(response.status_code, 401)
+
+    def test_revoke_and_logout(self):
+        pair = self.login()
+        self.assertEqual(self.client.post('/api/auth/token/revoke/', {'token': pair['access_token']}).status_code, 200)
+        self.assertEqual(self.get('/api/auth/user/', pair['access_token']).status_code, 403)
+
+        pair = self.login()
+        response = self.client.post(
+            '/api/auth/logout/', {'refresh_token': pair['refresh_token']},
+            HTTP_AUTHORIZATION=f"Bearer {pair['access_token']}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get('/api/auth/user/', pair['access_token']).status_code, 403)
+        response = self.client.post('/api/auth/token/refresh/', {'refresh_token': pair['refresh_token']})
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_leaves_other_users_tokens(self):
+        other = User.objects.create_user('other', 'other@example.com', 'a-Long-pass-123', role='faculty')
+        other_refresh = tokens.issue(other)['refresh_token']
+        access = self.login()['access_token']
+        self.client.post('/api/auth/logout/', {'refresh_token': other_refresh}, HTTP_AUTHORIZATION=f'Bearer {access}')
+        response = self.client.post('/api/auth/token/refresh/', {'refresh_token': other_refresh})
+        self.assertEqual(response.status_code, 200)
+
+    def test_account_changes_revoke_tokens(self):
+        pair = self.login()
+        self.user.role = 'admin'
+        self.user.save()
+        self.assertEqual(self.get('/api/auth/user/', pair['access_token']).status_code, 403)
+        # The refresh token still works and picks up the new role
+        response = self.client.post('/api/auth/token/refresh/', {'refresh_token': pair['refresh_token']})
+        self.assertEqual(self.get('/api/auth/user/', response.json()['access_token']).json()['role'], 'admin')
+
+        refresh_token = response.json()['refresh_token']
+        self.user.set_password('another-Long-pass-456')
+        self.user.save()
+        response = self.client.post('/api/auth/token/refresh/', {'refresh_token': refresh_token})
+        self.assertEqual(response.status_code, 401)
+
+    def test_other_changes_keep_tokens(self):
+        access = self.login()['access_token']
+        # Rotating the calendar feed URLs saves the user too
+        response = self.client.post('/api/bookings/calendar/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.feed_token_version, 1)
+        self.user.save()
+        self.assertEqual(self.get('/api/auth/user/', access).status_code, 200)
@@ -0,0 +1,131 @@
+"""Signed, expiring access and refresh tokens for API and kiosk clients.
+
+Tokens are ``django.core.signing`` payloads: HMAC-SHA256 signed with
+SECRET_KEY and timestamped, so checking one needs no database. They are
+signed, not encrypted; the claims are readable by whoever holds them.
+
+* Access tokens (ACCESS_TOKEN_SECONDS) carry the user's id, name, email
+  and role, enough to build the request user for reads without a query.
+* Refresh tokens (REFRESH_TOKEN_SECONDS) are exchanged for a new pair by
+  ``refresh``, which loads the user and checks it is still active and
+  has the password the token was issued for. Each one is used only once.
+
+Revocation is a deny-list in the sessions cache: one entry per revoked
+token, and one cutoff per user whose account changed, that revokes every
+access token issued before it. Entries expire with the tokens they
+cover, so the list stays small. Refresh tokens are also rechecked against
+the database, so a lost cache entry re-admits a revoked access token only
+until that token expires.
+"""
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .middleware import user_cache
+
+ACCESS = 'access'
+REFRESH = 'refresh'
+SALT = 'users.tokens'
+CLAIM_FIELDS = ['id', 'username', 'email', 'role', 'first_name', 'last_name', 'avatar']
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def lifetime(kind):
+    return settings.ACCESS_TOKEN_SECONDS if kind == ACCESS else settings.REFRESH_TOKEN_SECONDS
+
+
+def password_tag(user):
+    """Changes whenever the user's password does"""
+    return salted_hmac(SALT, user.get_session_auth_hash()).hexdigest()[:16]
+
+
+def sign(kind, user):
+    claims = {'typ': kind, 'jti': uuid.uuid4().hex, 'iat': round(time.time(), 3)}
+    if kind == ACCESS:
+        claims['user'] = {'id': user.id, **{field: str(getattr(user, field) or '') for field in CLAIM_FIELDS[1:]}}
+    else:
+        claims['uid'] = user.id
+        claims['pwd'] = password_tag(user)
+    return signing.dumps(claims, salt=f'{SALT}.{kind}', compress=True)
+
+
+def issue(user):
+    """A new access/refresh token pair for ``user``, as returned to clients"""
+    return {
+        'access_token': sign(ACCESS, user),
+        'refresh_token': sign(REFRESH, user),
+        'token_type': 'Bearer',
+        'expires_in': settings.ACCESS_TOKEN_SECONDS,
+    }
+
+
+def revoked_key(jti):
+    return f'auth:revoked:{jti}'
+
+
+def revoked_before_key(user_id):
+    return f'auth:revoked-before:{user_id}'
+
+
+def decode(token, kind):
+    """The claims of a valid, unexpired, unrevoked ``kind`` token, or InvalidToken"""
+    try:
+        claims = signing.loads(token, salt=f'{SALT}.{kind}', max_age=lifetime(kind))
+    except signing.SignatureExpired:
+        raise InvalidToken('Token has expired.')
+    except signing.BadSignature:
+        raise InvalidToken('Invalid token.')
+
+    token_key = revoked_key(claims['jti'])
+    # Refresh tokens are checked against the user in the database instead
+    user_key = revoked_before_key(claims['user']['id']) if kind == ACCESS else None
+    denied = user_cache().get_many([key for key in (token_key, user_key) if key])  # one cache round trip
+    if token_key in denied or claims['iat'] < denied.get(user_key, 0):
+        raise InvalidToken('Token has been revoked.')
+    return claims
+
+
+def revoke(claims):
+    """Deny-list one decoded token until it would have expired anyway.
+
+    Returns False if it already was.
+    """
+    remaining = claims['iat'] + lifetime(claims['typ']) - time.time()
+    return user_cache().add(revoked_key(claims['jti']), True, max(int(remaining), 0) + 1)
+
+
+def revoke_access_tokens(user_id):
+    """Revoke every access token issued to the user so far"""
+    user_cache().set(revoked_before_key(user_id), time.time(), settings.ACCESS_TOKEN_SECONDS + 1)
+
+
+def claims_user(claims):
+    """An unsaved-looking User built from access token claims, without a query.
+
+    Fields not in the token are deferred, so reading one loads it. It is
+    for reads only: never save it.
+    """
+    values = {**claims['user'], 'is_active': True}
+    User = get_user_model()
+    # from_db wants the loaded fields in model order
+    fields = [field.attname for field in User._meta.concrete_fields if field.attname in values]
+    return User.from_db(DEFAULT_DB_ALIAS, fields, [values[field] for field in fields])
+
+
+def refresh(token):
+    """Exchange a refresh token for a new pair; the old token is revoked"""
+    claims = decode(token, REFRESH)
+    user = get_user_model().objects.filter(pk=claims['uid'], is_active=True).first()
+    if user is None or not constant_time_compare(claims['pwd'], password_tag(user)):
+        raise InvalidToken('Invalid token.')
+    if not revoke(claims):
+        raise InvalidToken('Token has been revoked.')
+    return issue(user)
@@ -5,6 +5,8 @@ urlpatterns = [
     path('register/', views.register_view, name='register'),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
+    path('token/refresh/', views.token_refresh_view, name='token-refresh'),
+    path('token/revoke/', views.token_revoke_view, name='token-revoke'),
     path('user/', views.current_user_view, name='current-user'),
     path('profile/', views.update_profile_view, name='update-profile'),
     path('check/', views.check_auth_view, name='check-auth'),
@@ -5,6 +5,8 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import login, logout
 from django.middleware.csrf import get_token
 from .models import User
+from . import tokens
+from room_booking_system.serializers import sparse_fields
 from .serializers import UserSerializer, UserRegistrationSerializer, LoginSerializer
 
 
@@ -29,11 +31,21 @@ def register_view(request):
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def login_view(request):
-    """Login user"""
+    """Login user.
+
+    With ``"tokens": true`` no session is started; the response carries
+    an access/refresh token pair for the Authorization header instead.
+    """
     serializer = LoginSerializer(data=request.data)
     
     if serializer.is_valid():
         user = serializer.validated_data['user']
+        if str(request.data.get('tokens', '')).lower() in ('1', 'true'):
+            return Response({
+                'message': 'Login successful',
+                'user': UserSerializer(user).data,
+                **tokens.issue(user),
+            })
         login(request, user)
         return Response({
             'message': 'Login successful',
@@ -47,11 +59,50 @@ def login_view(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def logout_view(request):
-    """Logout user"""
+    """Logout user; a token client's access token is revoked.
+
+    Token clients send their ``refresh_token`` in the body too, so it
+    cannot mint new access tokens afterwards.
+    """
+    if isinstance(request.auth, dict):
+        tokens.revoke(request.auth)
+    refresh_token = request.data.get('refresh_token', None)
+    if refresh_token:
+        try:
+            claims = tokens.decode(str(refresh_token), tokens.REFRESH)
+        except tokens.InvalidToken:
+            claims = None
+        # Only the logged-out user's own token
+        if claims and claims['uid'] == request.user.pk:
+            tokens.revoke(claims)
     logout(request)
     return Response({'message': 'Logged out successfully'})
 
 
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def token_refresh_view(request):
+    """Exchange a refresh token for a new access/refresh token pair"""
+    try:
+        return Response(tokens.refresh(str(request.data.get('refresh_token', ''))))
+    except tokens.InvalidToken as e:
+        return Response({'error': str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def token_revoke_view(request):
+    """Revoke an access or refresh token before it expires"""
+    token = str(request.data.get('token', ''))
+    for kind in (tokens.ACCESS, tokens.REFRESH):
+        try:
+            tokens.revoke(tokens.decode(token, kind))
+        except tokens.InvalidToken:
+            continue
+        return Response({'message': 'Token revoked'})
+    return Response({'error': 'Invalid or expired token.'}, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def current_user_view(request):
@@ -63,7 +114,17 @@ def current_user_view(request):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def check_auth_view(request):
-    """Check if user is authenticated"""
+    """Check if user is authenticated.
+
+    ``?lite=1`` answers pollers that only need to know who is logged in:
+    no serializer and no CSRF token (which the full response sets).
+    """
+    if request.query_params.get('lite') in ('1', 'true'):
+        user = request.user
+        return Response({
+            'authenticated': user.is_authenticated,
+            'user': {'id': user.id, 'username': user.username, 'role': user.role} if user.is_authenticated else None,
+        })
     if request.user.is_authenticated:
         return Response({
             'authenticated': True,
@@ -87,8 +148,9 @@ def get_users_view(request):
         if request.user.role != 'admin':
             return Response({'error': 'Only admins can view users'}, status=status.HTTP_403_FORBIDDEN)
         
-        users = User.objects.all().order_by('username')
-        serializer = UserSerializer(users, many=True)
+        sparse = sparse_fields(request)
+        users = UserSerializer.optimize_queryset(User.objects.all().order_by('username'), **sparse)
+        serializer = UserSerializer(users, many=True, **sparse)
         return Response(serializer.data)
     except Exception as e:
         import traceback
@@ -14,6 +14,18 @@ import RoomDetailsModal from './RoomDetailsModal';
 import BookingDetailsModal from './BookingDetailsModal';
 
 // Interfaces match backend
+// Past History loads this many days at a time, newest first; the booking
+// list only returns a window around today unless asked for dates
+const HISTORY_WINDOW_DAYS = 90;
+
+const isoDate = (day: Date) => day.toISOString().split('T')[0];
+
+const addDays = (date: string, days: number) => {
+    const day = new Date(`${date}T00:00:00Z`);
+    day.setUTCDate(day.getUTCDate() + days);
+    return isoDate(day);
+};
+
 interface Booking {
     id: number;
     room_details: {
@@ -102,10 +114,35 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ activeView = 'availabil
 
     // Filter Logic
     const [bookingFilter, setBookingFilter] = useState<'upcoming' | 'past'>('upcoming');
+    const [history, setHistory] = useState<Booking[]>([]);
+    const [historyFrom, setHistoryFrom] = useState<string | null>(null);
+    const [loadingHistory, setLoadingHistory] = useState(false);
+
+    // Loads the HISTORY_WINDOW_DAYS before the oldest day loaded so far
+    const loadOlderHistory = async () => {
+        const endDate = historyFrom ? addDays(historyFrom, -1) : isoDate(new Date());
+        const startDate = addDays(endDate, 1 - HISTORY_WINDOW_DAYS);
+        setLoadingHistory(true);
+        try {
+            const data = await bookingAPI.getAll({ start_date: startDate, end_date: endDate });
+            setHistory(prev => [...prev, ...data]);
+            setHistoryFrom(startDate);
+        } catch (error: any) {
+            internalShowNotification('Failed to load booking history', 'error');
+        } finally {
+            setLoadingHistory(false);
+        }
+    };
+
+    useEffect(() => {
+        if (bookingFilter === 'past' && historyFrom === null) {
+            loadOlderHistory();
+        }
+    }, [bookingFilter]);
 
     const getFilteredBookings = () => {
         const now = new Date();
-        return bookings.filter(booking => {
+        return (bookingFilter === 'upcoming' ? bookings : history).filter(booking => {
             const bookingDateTime = new Date(`${booking.date}T${booking.start_time}`);
             if (bookingFilter === 'upcoming') {
                 return bookingDateTime >= now;
@@ -120,28 +157,13 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ activeView = 'availabil
     };
 
     const handleExportCSV = () => {
-        const filtered = getFilteredBookings();
-        const headers = ['Room Number', 'Block', 'Date', 'Start Time', 'End Time', 'User Name', 'User Email', 'Purpose', 'Status'];
-        const csvContent = [
-            headers.join(','),
-            ...filtered.map(b => [
-                b.room_details?.room_number,
-                b.room_details?.block,
-                b.date,
-                b.start_time,
-                b.end_time,
-                b.user_name,
-                b.user_email,
-                `"${b.purpose.replace(/"/g, '""')}"`,
-                b.status
-            ].join(','))
-        ].join('\n');
-
-        const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
+        // The server streams the whole range, however many bookings it holds
+        const today = new Date().toISOString().split('T')[0];
         const link = document.createElement('a');
-        const url = URL.createObjectURL(blob);
-        link.setAttribute('href', url);
-        link.setAttribute('download', `bookings_export_${new Date().toISOString().split('T')[0]}.csv`);
+        link.setAttribute('href', bookingAPI.exportUrl(
+            bookingFilter === 'upcoming' ? { from: today, format: 'xlsx' } : { to: today, format: 'xlsx' }
+        ));
+        link.setAttribute('download', `bookings_export_${today}.xlsx`);
         link.style.visibility = 'hidden';
         document.body.appendChild(link);
         link.click();
@@ -315,7 +337,7 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ activeView = 'availabil
 
         // Optimistic UI update: Remove immediately from view
         const previousBookings = [...bookings];
-        const bookingToDelete = bookings.find(b => b.id === id);
+        const bookingToDelete = bookings.find(b => b.id === id) || history.find(b => b.id === id);
 
         let successMessage = 'Booking record deleted'; // Default for past
         if (bookingToDelete) {
@@ -326,7 +348,9 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ activeView = 'availabil
             }
         }
 
+        const previousHistory = [...history];
         setBookings(prev => prev.filter(b => b.id !== id));
+        setHistory(prev => prev.filter(b => b.id !== id));
 
         try {
             await bookingAPI.delete(id);
@@ -336,6 +360,7 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ activeView = 'availabil
         } catch (error: any) {
             // Revert on error
             setBookings(previousBookings);
+            setHistory(previousHistory);
             internalShowNotification(error.message || 'Failed to delete booking', 'error');
         }
     };
@@ -579,6 +604,19 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ activeView = 'availabil
                                     </div>
                                 )}
                             </div>
+
+                            {bookingFilter === 'past' && historyFrom && (
+                                <div className="flex flex-col items-center gap-3 text-sm text-[var(--text-tertiary)]">
+                                    <p>Showing bookings since {new Date(historyFrom).toLocaleDateString('en-US', { month: 'short', day: 'numeric', year: 'numeric' })}</p>
+                                    <button
+                                        onClick={loadOlderHistory}
+                                        disabled={loadingHistory}
+                                        className="px-4 py-2 rounded-lg bg-indigo-600 hover:bg-indigo-700 text-white font-medium transition-all disabled:opacity-50"
+                                    >
+                                        {loadingHistory ? 'Loading...' : 'Load older bookings'}
+                                    </button>
+                                </div>
+                            )}
                         </div>
                     )}
 
@@ -96,7 +96,7 @@ const RoomSync = () => {
     fetchRooms();
   }, []);
 
-  // Fetch bookings on mount and when date changes, with polling
+  // Fetch bookings on mount and when date changes, then refresh on live booking events
   useEffect(() => {
     const fetchBookings = async () => {
       try {
@@ -109,10 +109,10 @@ const RoomSync = () => {
 
     fetchBookings(); // Initial fetch
 
-    // Poll for updates every 30 seconds
-    const interval = setInterval(fetchBookings, 30000);
+    // The server pushes booking changes, so no polling is needed
+    const unsubscribe = bookingAPI.subscribe(() => fetchBookings());
 
-    return () => clearInterval(interval);
+    return () => unsubscribe();
   }, [selectedDate]);
 
   const showNotification = (message: string, type: 'success' | 'error' = 'success') => {
@@ -59,10 +59,31 @@ const apiCall = async (url: string, options: RequestInit = {}) => {
     return data;
 };
 
+// Booking list endpoints are cursor-paginated: follow `next` links and
+// concatenate the pages so callers keep receiving a plain array
+const apiCallAllPages = async (url: string) => {
+    let results: any[] = [];
+    let next: string | null = url;
+    while (next) {
+        const page: any = await apiCall(next);
+        results = results.concat(page.results);
+        next = page.next;
+    }
+    return results;
+};
+
 // Room API
+type RoomFilters = { block?: string; type?: string; min_capacity?: string; features?: string; equipment?: string; match?: 'all' | 'any' };
+
 export const roomAPI = {
-    getAll: async () => {
-        return apiCall(`${API_BASE}/rooms/`);
+    getAll: async (params?: RoomFilters) => {
+        const queryParams = new URLSearchParams(params as any).toString();
+        return apiCall(`${API_BASE}/rooms/${queryParams ? `?${queryParams}` : ''}`);
+    },
+
+    getFacets: async (params?: RoomFilters) => {
+        const queryParams = new URLSearchParams(params as any).toString();
+        return apiCall(`${API_BASE}/rooms/facets/${queryParams ? `?${queryParams}` : ''}`);
     },
 
     getById: async (id: string) => {
@@ -118,10 +139,10 @@ export const roomAPI = {
 
 // Booking API
 export const bookingAPI = {
-    getAll: async (params?: { room?: string; date?: string; status?: string }) => {
+    getAll: async (params?: { room?: string; date?: string; status?: string; start_date?: string; end_date?: string }) => {
         const queryParams = new URLSearchParams(params as any).toString();
         const url = `${API_BASE}/bookings/${queryParams ? `?${queryParams}` : ''}`;
-        return apiCall(url);
+        return apiCallAllPages(url);
     },
 
     getById: async (id: number) => {
@@ -158,23 +179,28 @@ export const bookingAPI = {
     getByRoom: async (roomId: string, date?: string) => {
         const params = new URLSearchParams({ room_id: roomId });
         if (date) params.append('date', date);
-        return apiCall(`${API_BASE}/bookings/by_room/?${params.toString()}`);
+        return apiCallAllPages(`${API_BASE}/bookings/by_room/?${params.toString()}`);
     },
 
     getByDate: async (date: string) => {
-        return apiCall(`${API_BASE}/bookings/by_date/?date=${date}`);
+        return apiCallAllPages(`${API_BASE}/bookings/by_date/?date=${date}`);
+    },
+
+    getAvailability: async (date: string, params?: { block?: string; slot?: string }) => {
+        const query = new URLSearchParams({ date, ...(params as any) });
+        return apiCall(`${API_BASE}/bookings/availability/?${query.toString()}`);
     },
 
     getMyBookings: async () => {
-        return apiCall(`${API_BASE}/bookings/my_bookings/`);
+        return apiCallAllPages(`${API_BASE}/bookings/my_bookings/`);
     },
 
     getPending: async () => {
-        return apiCall(`${API_BASE}/bookings/pending/`);
+        return apiCallAllPages(`${API_BASE}/bookings/pending/`);
     },
 
     getByStatus: async (status: string) => {
-        return apiCall(`${API_BASE}/bookings/?status=${status}`);
+        return apiCallAllPages(`${API_BASE}/bookings/?status=${status}`);
     },
 
     approve: async (id: number) => {
@@ -195,6 +221,27 @@ export const bookingAPI = {
             method: 'POST',
         });
     },
+
+    // Signed .ics feed URLs for calendar apps: { user, room? }
+    getCalendarLinks: async (roomId?: number) => {
+        return apiCall(`${API_BASE}/bookings/calendar/${roomId ? `?room=${roomId}` : ''}`);
+    },
+
+    // Streaming CSV/XLSX download; the browser fetches it directly with the session cookie
+    exportUrl: (params?: { from?: string; to?: string; status?: string; block?: string; format?: 'csv' | 'xlsx' }) => {
+        const query = new URLSearchParams(params as any).toString();
+        return `${API_BASE}/bookings/export/${query ? `?${query}` : ''}`;
+    },
+
+    // Live booking changes over server-sent events; returns an unsubscribe function
+    subscribe: (onChange: (event: MessageEvent) => void, params?: { room?: string; date?: string }) => {
+        const query = new URLSearchParams(params as any).toString();
+        const source = new EventSource(`${API_BASE}/bookings/stream/${query ? `?${query}` : ''}`, { withCredentials: true });
+        ['created', 'updated', 'approved', 'rejected', 'cancelled', 'deleted'].forEach((type) =>
+            source.addEventListener(type, onChange as EventListener)
+        );
+        return () => source.close();
+    },
 };
 
 // Users API
@@ -297,10 +344,19 @@ export const supportAPI = {
     },
 };
 
+// Reports API (admin only)
+export const reportsAPI = {
+    getUtilization: async (params?: { from?: string; to?: string; group?: 'room' | 'block' | 'type' | 'day'; block?: string; type?: string; room?: string }) => {
+        const queryParams = new URLSearchParams(params as any).toString();
+        return apiCall(`${API_BASE}/reports/utilization/${queryParams ? `?${queryParams}` : ''}`);
+    },
+};
+
 export default {
     room: roomAPI,
     booking: bookingAPI,
     auth: authAPI,
     users: usersAPI,
     support: supportAPI,
+    reports: reportsAPI,
 };